@@ -0,0 +1,224 @@
+"""Offline benchmarks for Ghosty's own start/stop overhead.
+
+Every scenario runs ``Orchestrator.start``/``stop`` in a fresh interpreter
+with stub system binaries first on ``PATH`` (see ``stubs.py``), so nothing
+touches the network or the host. For each scenario the first cycle is
+reported as the cold start (preflight probes, empty caches) and the median
+of the rest as the warm start. Results are written as JSON and can be
+compared against a stored baseline::
+
+    python benchmarks/run.py                                # all scenarios
+    python benchmarks/run.py --latency ip=0.01 --fail openvpn
+    python benchmarks/run.py --output out.json --baseline benchmarks/baseline.json
+    python benchmarks/run.py --save-baseline                # rewrite the baseline
+
+Exits 1 if a scenario fails to run or a metric regressed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import stubs
+
+_HERE = Path(__file__).resolve().parent
+BASELINE = _HERE / "baseline.json"
+
+# name -> (mode, VPN provider)
+SCENARIOS = {
+    "normal": ("Normal", "openvpn"),
+    "standard": ("Standard", "openvpn"),
+    "standard-wireguard": ("Standard", "wireguard"),
+    "enhanced": ("Enhanced", "openvpn"),
+}
+
+# Compared against the baseline: counts may not grow beyond their slack,
+# timings and peak RSS may grow by the --tolerance fraction.
+_TIMINGS = ("cold_start_ms", "warm_start_ms", "stop_ms")
+_COUNTS = {
+    "start_subprocesses": 0,
+    "stop_subprocesses": 0,
+    "threads_peak": 1,  # Sampled, so short-lived threads are sometimes missed
+    "threads_leaked": 0,
+}
+_TIMING_SLACK_MS = 5.0  # Scheduler noise on near-zero timings
+
+
+def run_scenario(
+    name: str,
+    iterations: int,
+    latency: dict[str, float],
+    fail: tuple[str, ...],
+) -> dict[str, Any]:
+    """Run one scenario in a child interpreter and return its raw result.
+
+    Raises:
+        RuntimeError: If the child fails or prints no result.
+    """
+    mode, provider = SCENARIOS[name]
+    with tempfile.TemporaryDirectory(prefix="ghosty-bench-") as tmp:
+        root = Path(tmp)
+        stubs.install(root)
+        env = stubs.environment(root, latency=latency, fail=fail)
+        proc = subprocess.run(
+            [sys.executable, str(_HERE / "scenario.py"), "--mode", mode,
+             "--provider", provider, "--iterations", str(iterations)],
+            env=env, capture_output=True, text=True, timeout=120 + 30 * iterations,
+        )
+    if proc.returncode != 0 or not proc.stdout:
+        raise RuntimeError(f"{name} failed ({proc.returncode}):\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout)
+
+
+def summarize(raw: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a scenario's cycles to the compared metrics."""
+    cycles = raw["cycles"]
+    warm = cycles[1:] or cycles
+    last = cycles[-1]
+    return {
+        "ok": all(cycle["ok"] for cycle in cycles),
+        "message": last["message"],
+        "cold_start_ms": cycles[0]["start_ms"],
+        "warm_start_ms": round(statistics.median(c["start_ms"] for c in warm), 3),
+        "stop_ms": round(statistics.median(c["stop_ms"] for c in warm), 3),
+        # Warm counts: the cold cycle adds one-off preflight probes
+        "start_subprocesses": last["start_subprocesses"],
+        "stop_subprocesses": last["stop_subprocesses"],
+        "commands": last["commands"],
+        "threads_peak": max(cycle["threads_peak"] for cycle in cycles),
+        "threads_leaked": raw["threads_leaked"],
+        "peak_rss_mib": raw["peak_rss_mib"],
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Regressions of ``results`` against ``baseline``, one message each."""
+    regressions: list[str] = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        if base.get("ok") and not current["ok"]:
+            regressions.append(f"{name}: now fails ({current['message']})")
+        for metric in _TIMINGS:
+            limit = base[metric] * (1 + tolerance) + _TIMING_SLACK_MS
+            if current[metric] > limit:
+                regressions.append(f"{name}: {metric} {current[metric]:.1f} > "
+                                   f"{limit:.1f} (baseline {base[metric]:.1f})")
+        for metric, slack in _COUNTS.items():
+            if current[metric] > base[metric] + slack:
+                regressions.append(f"{name}: {metric} {current[metric]} > "
+                                   f"baseline {base[metric]}")
+        limit = base["peak_rss_mib"] * (1 + tolerance)
+        if current["peak_rss_mib"] > limit:
+            regressions.append(f"{name}: peak_rss_mib {current['peak_rss_mib']} > "
+                               f"{limit:.1f} (baseline {base['peak_rss_mib']})")
+    return regressions
+
+
+def _print_table(results: dict[str, Any]) -> None:
+    print(f"{'SCENARIO':<20} {'COLD ms':>9} {'WARM ms':>9} {'STOP ms':>8} "
+          f"{'PROCS':>9} {'THREADS':>7} {'LEAKED':>6} {'RSS MiB':>7}", file=sys.stderr)
+    for name, row in results["scenarios"].items():
+        procs = f"{row['start_subprocesses']}+{row['stop_subprocesses']}"
+        status = "" if row["ok"] else f"  FAILED: {row['message']}"
+        print(f"{name:<20} {row['cold_start_ms']:>9.1f} {row['warm_start_ms']:>9.1f} "
+              f"{row['stop_ms']:>8.1f} {procs:>9} {row['threads_peak']:>7} "
+              f"{row['threads_leaked']:>6} {row['peak_rss_mib']:>7.1f}{status}",
+              file=sys.stderr)
+
+
+def _parse_latency(values: list[str]) -> dict[str, float]:
+    latency: dict[str, float] = {}
+    for value in values:
+        name, sep, seconds = value.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"--latency expects NAME=SECONDS, got {value!r}")
+        latency[name] = float(seconds)
+    return latency
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        epilog=f"Stubs: {', '.join(stubs.BINARIES)}, tornet (IP change)",
+    )
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="comma-separated scenarios (default: all)")
+    parser.add_argument("--iterations", type=int, default=3,
+                        help="start/stop cycles per scenario (default: 3)")
+    parser.add_argument("--latency", action="append", default=[], metavar="NAME=SECONDS",
+                        help="delay a stub's every call (repeatable)")
+    parser.add_argument("--fail", action="append", default=[], metavar="NAME",
+                        help="make a stub exit 1 (repeatable)")
+    parser.add_argument("--output", type=Path, help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE,
+                        help="baseline to compare against (default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown and RSS growth (default: 0.25)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results to --baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s) {', '.join(unknown)} "
+                     f"(choose from {', '.join(SCENARIOS)})")
+    try:
+        latency = _parse_latency(args.latency)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    results: dict[str, Any] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "iterations": args.iterations,
+        "latency": latency,
+        "fail": args.fail,
+        "scenarios": {},
+    }
+    for name in names:
+        try:
+            raw = run_scenario(name, args.iterations, latency, tuple(args.fail))
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(e, file=sys.stderr)
+            return 1
+        results["scenarios"][name] = summarize(raw)
+
+    _print_table(results)
+    text = json.dumps(results, indent=2) + "\n"
+    if args.save_baseline:
+        args.baseline.write_text(text)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if args.output:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+
+    if not args.baseline.exists():
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if (baseline.get("latency"), baseline.get("fail")) != (latency, args.fail):
+        print("Baseline was recorded with different stub latencies/failures; "
+              "not comparing", file=sys.stderr)
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
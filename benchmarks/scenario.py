@@ -0,0 +1,147 @@
+"""One benchmark scenario: repeated Orchestrator start/stop against the stubs.
+
+Run by ``run.py`` in a fresh interpreter with the environment from
+``stubs.environment``, so module caches, threads and peak RSS belong to
+this scenario alone. Prints one JSON object to stdout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import stubs
+
+_OPENVPN = "client\ndev tun\nproto udp\nremote 127.0.0.1 1194\nnobind\n"
+_WIREGUARD = """\
+[Interface]
+PrivateKey = aGVsbG8gd29ybGQgaGVsbG8gd29ybGQgaGVsbG8gd28=
+Address = 10.2.0.2/32
+
+[Peer]
+PublicKey = d29ybGQgaGVsbG8gd29ybGQgaGVsbG8gd29ybGQgaGU=
+AllowedIPs = 0.0.0.0/0
+Endpoint = 127.0.0.1:51820
+"""
+
+
+class ThreadPeak:
+    """Highest ``threading.active_count()`` seen while the block runs."""
+
+    INTERVAL = 0.002
+
+    def __init__(self) -> None:
+        self.peak = 0
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._done.is_set():
+            self.peak = max(self.peak, threading.active_count() - 1)  # Minus the sampler
+            self._done.wait(self.INTERVAL)
+
+    def __enter__(self) -> ThreadPeak:
+        self.peak = threading.active_count()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._done.set()
+        self._thread.join()
+
+
+def _vpn_config(provider: str, home: Path) -> str:
+    if provider == "wireguard":
+        path = home / "wg-bench.conf"
+        path.write_text(_WIREGUARD)
+    else:
+        path = home / "bench.ovpn"
+        path.write_text(_OPENVPN)
+    return str(path)
+
+
+def _spawned(calls: list[str]) -> list[str]:
+    """Stub calls that were new processes (``sudo`` execs its command in place)."""
+    return [call.split(" ", 1)[0] for call in calls if not call.startswith("sudo ")]
+
+
+def run(mode_name: str, provider: str, iterations: int, interface: str) -> dict[str, Any]:
+    from ghosty.core.orchestrator import Orchestrator, parse_mode
+
+    mode = parse_mode(mode_name)
+    state = Path(os.environ["GHOSTY_STUB_STATE"])
+    vpn_config = _vpn_config(provider, Path.home()) if "vpn" in mode.layers else ""
+
+    orchestrator = Orchestrator()
+    orchestrator.vpn.provider = provider
+    threads_before = threading.active_count()
+    cycles: list[dict[str, Any]] = []
+
+    for _ in range(iterations):
+        seen = len(stubs.calls(state))
+        with ThreadPeak() as threads:
+            started = time.perf_counter()
+            ok, message = orchestrator.start(mode, interface, vpn_config=vpn_config)
+            start_ms = (time.perf_counter() - started) * 1000
+            start_calls = stubs.calls(state)[seen:]
+
+            stop_ms, stop_calls = 0.0, []
+            if ok:
+                seen += len(start_calls)
+                stopped = time.perf_counter()
+                ok, message = orchestrator.stop()
+                stop_ms = (time.perf_counter() - stopped) * 1000
+                stop_calls = stubs.calls(state)[seen:]
+
+        cycles.append({
+            "ok": ok,
+            "message": message,
+            "start_ms": round(start_ms, 3),
+            "stop_ms": round(stop_ms, 3),
+            "start_subprocesses": len(_spawned(start_calls)),
+            "stop_subprocesses": len(_spawned(stop_calls)),
+            "commands": dict(Counter(_spawned(start_calls + stop_calls))),
+            "threads_peak": threads.peak,
+        })
+
+    # Give daemon threads that were told to stop a moment to exit
+    deadline = time.monotonic() + 2
+    while threading.active_count() > threads_before and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    return {
+        "mode": mode.value,
+        "provider": provider,
+        "cycles": cycles,
+        "threads_leaked": max(0, threading.active_count() - threads_before),
+        # Linux reports KiB
+        "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", required=True)
+    parser.add_argument("--provider", default="openvpn", choices=["openvpn", "wireguard"])
+    parser.add_argument("--iterations", type=int, default=3)
+    # Loopback always exists and has a MAC to restore; the stubs never touch it
+    parser.add_argument("--interface", default="lo")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR, stream=sys.stderr)
+    result = run(args.mode, args.provider, args.iterations, args.interface)
+    json.dump(result, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Fake system binaries and services for offline benchmarks.
+
+``install(root)`` writes a ``bin/`` directory of POSIX shell stubs for
+every command Ghosty runs (``ip``, ``macchanger``, ``systemctl``,
+``openvpn``, ``wg-quick``, ``sudo`` and the rest) and a ``python/``
+directory with stand-ins for the ``stem`` and ``tornet_mp`` modules, so a
+full start/stop touches neither the network nor the host. Put ``bin`` first
+on ``PATH`` and ``python`` on ``PYTHONPATH``.
+
+Behaviour is driven by environment variables, read on every call:
+
+``GHOSTY_STUB_STATE``
+    Directory for service state and ``calls.log`` (one line per call).
+``GHOSTY_STUB_LATENCY_<NAME>``
+    Seconds the stub sleeps before answering (``WG_QUICK`` for ``wg-quick``;
+    ``TORNET`` for one tornet-mp IP change).
+``GHOSTY_STUB_FAIL``
+    Comma-separated stub names that exit 1.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+_HEADER = """\
+#!/bin/sh
+# Ghosty benchmark stub: {name}
+echo "{name} $*" >> "${{GHOSTY_STUB_STATE:-/tmp}}/calls.log"
+if [ -n "${{GHOSTY_STUB_LATENCY_{var}:-}}" ]; then sleep "$GHOSTY_STUB_LATENCY_{var}"; fi
+case ",${{GHOSTY_STUB_FAIL:-}}," in
+  *",{name},"*) echo "{name}: simulated failure" >&2; exit 1 ;;
+esac
+"""
+
+_STATE = '"${GHOSTY_STUB_STATE:-/tmp}"'
+
+# Body run after the header; the default is to succeed silently.
+_BODIES = {
+    "sudo": 'exec "$@"\n',
+    "macchanger": """\
+mac="$2"
+echo "Current MAC:   02:00:00:00:00:01 (unknown)"
+echo "Permanent MAC: 02:00:00:00:00:01 (unknown)"
+echo "New MAC:       $mac (unknown)"
+""",
+    "systemctl": f"""\
+case "$1" in
+  is-enabled) if [ -e {_STATE}/$2.enabled ]; then echo enabled; else echo disabled; exit 1; fi ;;
+  is-active) if [ -e {_STATE}/$2.active ]; then echo active; else echo inactive; exit 3; fi ;;
+  enable) touch {_STATE}/$2.enabled ;;
+  start) touch {_STATE}/$2.active ;;
+  stop) rm -f {_STATE}/$2.active ;;
+  list-unit-files) echo "tor.service enabled enabled" ;;
+esac
+""",
+    "service": f"""\
+case "$2" in
+  start) touch {_STATE}/$1.active ;;
+  stop) rm -f {_STATE}/$1.active ;;
+esac
+""",
+    "openvpn": """\
+if [ "$1" = "--version" ]; then
+  echo "OpenVPN 2.6.8 x86_64-pc-linux-gnu [SSL (OpenSSL)] [LZO] [LZ4] [EPOLL] [DCO]"
+  echo "library versions: OpenSSL 3.0.13 30 Jan 2024, LZO 2.10"
+  exit 0
+fi
+echo "TUN/TAP device tun-bench opened"
+echo "Initialization Sequence Completed"
+exec sleep 86400
+""",
+    "ping": 'echo "64 bytes from 127.0.0.1: icmp_seq=1 ttl=64 time=0.05 ms"\n',
+}
+
+BINARIES = (
+    "sudo", "ip", "macchanger", "systemctl", "service", "openvpn", "wg", "wg-quick",
+    "tor", "nft", "ping", "modprobe", "resolvconf",
+)
+
+_STEM = {
+    "__init__.py": """\
+class Signal:
+    NEWNYM = "NEWNYM"
+""",
+    "control.py": """\
+class Controller:
+    @classmethod
+    def from_port(cls, port=9051):
+        return cls()
+
+    def authenticate(self, *args, **kwargs):
+        pass
+
+    def signal(self, signal):
+        pass
+
+    def close(self):
+        pass
+""",
+}
+
+_TORNET = """\
+import itertools
+import os
+import time
+
+_counter = itertools.count(1)
+
+
+def initialize_environment():
+    pass
+
+
+def ma_ip():
+    return "203.0.113.1"
+
+
+def change_ip():
+    latency = os.environ.get("GHOSTY_STUB_LATENCY_TORNET")
+    if latency:
+        time.sleep(float(latency))
+    return f"203.0.113.{next(_counter) % 250 + 2}"
+"""
+
+
+def latency_variable(name: str) -> str:
+    """Environment variable holding the latency of stub ``name``."""
+    return "GHOSTY_STUB_LATENCY_" + name.upper().replace("-", "_")
+
+
+def install(root: Path) -> tuple[Path, Path]:
+    """Write the stubs under ``root``.
+
+    Returns:
+        (bin directory, Python module directory).
+    """
+    bin_dir = root / "bin"
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for name in BINARIES:
+        var = latency_variable(name).removeprefix("GHOSTY_STUB_LATENCY_")
+        path = bin_dir / name
+        path.write_text(_HEADER.format(name=name, var=var) + _BODIES.get(name, ""))
+        path.chmod(0o755)
+
+    python_dir = root / "python"
+    (python_dir / "stem").mkdir(parents=True, exist_ok=True)
+    for name, source in _STEM.items():
+        (python_dir / "stem" / name).write_text(source)
+    (python_dir / "tornet_mp.py").write_text(_TORNET)
+    return bin_dir, python_dir
+
+
+def environment(
+    root: Path,
+    *,
+    latency: dict[str, float] | None = None,
+    fail: tuple[str, ...] = (),
+) -> dict[str, str]:
+    """Environment for a child process that runs against the stubs in ``root``.
+
+    ``HOME`` points into ``root`` too, so config, preflight and MTU caches
+    start empty and never touch the real ones.
+    """
+    bin_dir, python_dir = root / "bin", root / "python"
+    state = root / "state"
+    state.mkdir(exist_ok=True)
+    home = root / "home"
+    home.mkdir(exist_ok=True)
+    source = Path(__file__).resolve().parent.parent / "src"
+
+    env = {key: value for key, value in os.environ.items()
+           if not key.startswith("GHOSTY_")}
+    env.update({
+        "PATH": f"{bin_dir}{os.pathsep}{env.get('PATH', '')}",
+        "PYTHONPATH": os.pathsep.join([str(source), str(python_dir)]),
+        "HOME": str(home),
+        "GHOSTY_STUB_STATE": str(state),
+        "GHOSTY_STUB_FAIL": ",".join(fail),
+    })
+    for name, seconds in (latency or {}).items():
+        env[latency_variable(name)] = f"{seconds:g}"
+    return env
+
+
+def calls(state: Path) -> list[str]:
+    """Every stub invocation logged so far, oldest first."""
+    try:
+        return (state / "calls.log").read_text().splitlines()
+    except FileNotFoundError:
+        return []
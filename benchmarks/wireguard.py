@@ -0,0 +1,72 @@
+"""Native WireGuard backend against wg-quick: tunnel up/down latency.
+
+Runs ``benchmark_against_wg_quick`` in a fresh interpreter against the
+stubs, so both backends pay only for the processes they spawn. Give
+``wg-quick`` a latency to stand in for the script's own forks, or pass
+``--host`` (as root, with a real config) to time the real binaries::
+
+    python benchmarks/wireguard.py --latency wg-quick=0.2
+    sudo python benchmarks/wireguard.py --host --config /etc/wireguard/wg0.conf
+
+Prints the median latencies in milliseconds as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import stubs
+from run import _parse_latency
+from scenario import _vpn_config
+
+_CHILD = """\
+import json, sys
+from ghosty.core.wireguard import benchmark_against_wg_quick
+json.dump(benchmark_against_wg_quick(sys.argv[1], int(sys.argv[2])), sys.stdout)
+"""
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="up/down cycles per backend (default: 5)")
+    parser.add_argument("--latency", action="append", default=[], metavar="NAME=SECONDS",
+                        help="delay a stub's every call (repeatable)")
+    parser.add_argument("--host", action="store_true",
+                        help="use the real binaries instead of the stubs")
+    parser.add_argument("--config", help="WireGuard config (required with --host)")
+    args = parser.parse_args(argv)
+    if args.host and not args.config:
+        parser.error("--host needs --config")
+    try:
+        latency = _parse_latency(args.latency)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    with tempfile.TemporaryDirectory(prefix="ghosty-bench-") as tmp:
+        root = Path(tmp)
+        env = None
+        config = args.config
+        if not args.host:
+            stubs.install(root)
+            env = stubs.environment(root, latency=latency)
+            config = config or _vpn_config("wireguard", root / "home")
+        proc = subprocess.run(
+            [sys.executable, "-c", _CHILD, config, str(args.rounds)],
+            env=env, capture_output=True, text=True, timeout=60 * args.rounds,
+        )
+    if proc.returncode != 0 or not proc.stdout:
+        print(f"wireguard benchmark failed ({proc.returncode}):\n{proc.stderr.strip()}",
+              file=sys.stderr)
+        return 1
+    print(json.dumps(json.loads(proc.stdout), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,53 @@
-"""Entry point for `python -m ghosty`."""
+"""Entry point for `python -m ghosty` and the `ghosty` script.
+
+Usage:
+    ghosty               Launch the GUI
+    ghosty daemon        Run headless, controlled over a Unix socket
+    ghosty ctl ...       Talk to a running daemon
+    ghosty start ...     Shorthand for `ghosty ctl start` (e.g. --profile work)
+    ghosty exec ...      Run a command inside an identity's namespace
+
+Only the standard library is imported at module level so a sudo re-exec
+happens before any GUI or networking dependency is loaded.
+"""
 
 import os
 import sys
 
 
-def _ensure_root() -> None:
+def _ensure_root(args: list[str]) -> None:
     """Re-launch with sudo if not running as root."""
     if os.geteuid() != 0:
         print("[*] Ghosty requires root privileges. Requesting sudo...")
-        os.execvp("sudo", ["sudo", sys.executable, "-m", "ghosty", *sys.argv[1:]])
+        os.execvp("sudo", ["sudo", sys.executable, "-m", "ghosty", *args])
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    command = args[0] if args else ""
+
+    # The client only needs access to the socket, not root
+    if command in ("ctl", "start"):
+        from ghosty.ctl import main as ctl_main
+
+        return ctl_main(args[1:] if command == "ctl" else args)
+
+    _ensure_root(args)
+
+    if command == "daemon":
+        from ghosty.daemon import main as daemon_main
+
+        return daemon_main(args[1:])
+
+    if command == "exec":
+        from ghosty.execute import main as exec_main
+
+        return exec_main(args[1:])
 
+    from ghosty.app import main as app_main
 
-_ensure_root()
+    return app_main()
 
-from ghosty.app import main
 
-sys.exit(main())
+if __name__ == "__main__":
+    sys.exit(main())
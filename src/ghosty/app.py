@@ -1,21 +1,16 @@
-"""Ghosty application launcher."""
+"""Ghosty application launcher.
+
+Privilege elevation happens once, in ``ghosty.__main__``, before anything
+heavy is imported; this module only builds the GUI.
+"""
 
 from __future__ import annotations
 
-import os
 import sys
 
 
-def _ensure_root() -> None:
-    """Re-launch with sudo if not running as root."""
-    if os.geteuid() != 0:
-        print("[*] Ghosty requires root privileges. Requesting sudo...")
-        os.execvp("sudo", ["sudo", sys.executable, "-m", "ghosty", *sys.argv[1:]])
-
-
 def main() -> int:
     """Launch the Ghosty GUI."""
-    _ensure_root()
     try:
         from ghosty.gui import MainWindow
 
@@ -31,4 +26,6 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    from ghosty.__main__ import main as cli_main
+
+    sys.exit(cli_main())
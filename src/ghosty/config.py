@@ -21,6 +21,11 @@ class VPNConfig:
     provider: str = "openvpn"  # "openvpn" or "wireguard"
     config_path: str = ""
     auth_path: str = ""
+    wireguard_backend: str = "native"  # "native" or "wg-quick"
+    fallback_configs: list[str] = field(default_factory=list)
+    auto_mtu: bool = True
+    tune_data_channel: bool = True
+    benchmark_ciphers: bool = False
 
 
 @dataclass
@@ -37,6 +42,56 @@ class LogConfig:
 
     level: str = "INFO"
     file: str = str(_CONFIG_DIR / "ghosty.log")
+    max_size: int = 10 * 1024 * 1024  # Rotate at this many bytes (0 disables)
+    backup_count: int = 5  # Rotated files kept (0 disables rotation)
+    rotate_hours: int = 0  # Also rotate after this many hours (0 disables)
+    compress: bool = False  # Gzip rotated files
+    format: str = "text"  # "text" or "jsonl"
+
+
+@dataclass
+class TraceConfig:
+    """Timing trace configuration (also enabled by GHOSTY_TRACE=<path>)."""
+
+    enabled: bool = False
+    path: str = str(_CONFIG_DIR / "trace.json")
+    format: str = "chrome"  # "chrome" or "jsonl"
+
+
+@dataclass
+class DaemonConfig:
+    """Headless daemon configuration."""
+
+    socket: str = "/run/ghosty/ghosty.sock"
+    socket_mode: int = 0o660
+
+
+@dataclass
+class IdentityConfig:
+    """One isolated identity, stored as ``[identities.<name>]``."""
+
+    provider: str = "openvpn"  # "openvpn" or "wireguard"
+    vpn_config: str = ""  # Empty for TOR-only identities
+    vpn_auth: str = ""
+    tor: bool = False
+    dns: list[str] = field(default_factory=lambda: ["1.1.1.1"])
+
+
+@dataclass
+class ProfileConfig:
+    """One named launch setup, stored as ``[profiles.<name>]``.
+
+    Empty (or zero) fields fall back to the top-level settings.
+    """
+
+    mode: str = ""  # "Normal", "Standard" or "Enhanced"; "" uses general.default_mode
+    interface: str = ""
+    provider: str = ""  # "openvpn" or "wireguard"
+    wireguard_backend: str = ""  # "native" or "wg-quick"
+    vpn_config: str = ""
+    vpn_auth: str = ""
+    fallback_configs: list[str] = field(default_factory=list)
+    rotation_interval: int = 0  # Seconds
 
 
 @dataclass
@@ -46,6 +101,7 @@ class GeneralConfig:
     theme: str = "dark"
     default_mode: str = "Normal"
     default_interface: str = ""
+    log_lines: int = 100_000  # Activity log records kept in memory by the GUI
 
 
 @dataclass
@@ -56,6 +112,10 @@ class GhostyConfig:
     vpn: VPNConfig = field(default_factory=VPNConfig)
     tor: TORConfig = field(default_factory=TORConfig)
     log: LogConfig = field(default_factory=LogConfig)
+    trace: TraceConfig = field(default_factory=TraceConfig)
+    daemon: DaemonConfig = field(default_factory=DaemonConfig)
+    identities: dict[str, IdentityConfig] = field(default_factory=dict)
+    profiles: dict[str, ProfileConfig] = field(default_factory=dict)
 
     def save(self, path: Path | None = None) -> None:
         """Save config to TOML file."""
@@ -65,11 +125,14 @@ class GhostyConfig:
         data = asdict(self)
         lines = [_toml_header()]
 
+        identities = data.pop("identities")
+        profiles = data.pop("profiles")
         for section, values in data.items():
-            lines.append(f"[{section}]")
-            for key, value in values.items():
-                lines.append(f'{key} = {_toml_value(value)}')
-            lines.append("")
+            _toml_table(lines, section, values)
+        for name, values in identities.items():
+            _toml_table(lines, f"identities.{name}", values)
+        for name, values in profiles.items():
+            _toml_table(lines, f"profiles.{name}", values)
 
         target.write_text("\n".join(lines))
         logger.info("Config saved to %s", target)
@@ -90,6 +153,61 @@ class GhostyConfig:
             logger.exception("Failed to load config from %s, using defaults", target)
             return cls()
 
+    @classmethod
+    def parse(cls, path: Path | None = None) -> GhostyConfig:
+        """Load config from TOML file strictly, for callers that must not fall back.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If it is not valid TOML, has unknown keys, or fails
+                ``validate``.
+        """
+        with open(path or _CONFIG_FILE, "rb") as f:
+            data = tomllib.load(f)
+        try:
+            config = cls._from_dict(data)
+            errors = config.validate()
+        except (AttributeError, TypeError) as e:  # Wrong shape or value types
+            raise ValueError(f"Invalid config: {e}") from e
+        if errors:
+            raise ValueError("Invalid config: " + "; ".join(errors))
+        return config
+
+    def validate(self) -> list[str]:
+        """Problems with values that would fail later, one message each."""
+        errors: list[str] = []
+
+        def _check(ok: bool, message: str) -> None:
+            if not ok:
+                errors.append(message)
+
+        _check(self.general.theme in ("dark", "light", "system"),
+               f"general.theme: unknown theme {self.general.theme!r}")
+        _check(self.general.log_lines > 0, "general.log_lines must be positive")
+        _check(self.vpn.provider in ("openvpn", "wireguard"),
+               f"vpn.provider: unknown provider {self.vpn.provider!r}")
+        _check(self.vpn.wireguard_backend in ("native", "wg-quick"),
+               f"vpn.wireguard_backend: unknown backend {self.vpn.wireguard_backend!r}")
+        _check(self.tor.rotation_interval >= 1, "tor.rotation_interval must be at least 1")
+        _check(0 < self.tor.controller_port < 65536, "tor.controller_port out of range")
+        _check(self.log.level.upper() in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"),
+               f"log.level: unknown level {self.log.level!r}")
+        _check(self.log.format in ("text", "jsonl"),
+               f"log.format: unknown format {self.log.format!r}")
+        _check(min(self.log.max_size, self.log.backup_count, self.log.rotate_hours) >= 0,
+               "log sizes and counts must not be negative")
+        _check(self.trace.format in ("chrome", "jsonl"),
+               f"trace.format: unknown format {self.trace.format!r}")
+        for name, profile in self.profiles.items():
+            _check(profile.provider in ("", "openvpn", "wireguard"),
+                   f"profiles.{name}.provider: unknown provider {profile.provider!r}")
+            _check(profile.wireguard_backend in ("", "native", "wg-quick"),
+                   f"profiles.{name}.wireguard_backend: unknown backend "
+                   f"{profile.wireguard_backend!r}")
+            _check(profile.rotation_interval >= 0,
+                   f"profiles.{name}.rotation_interval must not be negative")
+        return errors
+
     @classmethod
     def _from_dict(cls, data: dict[str, Any]) -> GhostyConfig:
         """Construct config from parsed TOML dict."""
@@ -97,7 +215,23 @@ class GhostyConfig:
         vpn = VPNConfig(**data.get("vpn", {}))
         tor = TORConfig(**data.get("tor", {}))
         log = LogConfig(**data.get("log", {}))
-        return cls(general=general, vpn=vpn, tor=tor, log=log)
+        trace = TraceConfig(**data.get("trace", {}))
+        daemon = DaemonConfig(**data.get("daemon", {}))
+        identities = {
+            name: IdentityConfig(**values)
+            for name, values in data.get("identities", {}).items()
+        }
+        profiles = {
+            name: ProfileConfig(**values)
+            for name, values in data.get("profiles", {}).items()
+        }
+        return cls(general=general, vpn=vpn, tor=tor, log=log, trace=trace, daemon=daemon,
+                   identities=identities, profiles=profiles)
+
+
+def config_path() -> Path:
+    """Where ``load_config`` and ``save_config`` read and write by default."""
+    return _CONFIG_FILE
 
 
 def load_config(path: Path | None = None) -> GhostyConfig:
@@ -114,6 +248,13 @@ def _toml_header() -> str:
     return "# Ghosty Configuration — https://github.com/TheBinaryGhost/Ghosty\n"
 
 
+def _toml_table(lines: list[str], name: str, values: dict[str, Any]) -> None:
+    lines.append(f"[{name}]")
+    for key, value in values.items():
+        lines.append(f'{key} = {_toml_value(value)}')
+    lines.append("")
+
+
 def _toml_value(value: Any) -> str:
     """Format a Python value as TOML."""
     if isinstance(value, bool):
@@ -122,4 +263,6 @@ def _toml_value(value: Any) -> str:
         return str(value)
     if isinstance(value, str):
         return f'"{value}"'
+    if isinstance(value, list):
+        return "[" + ", ".join(_toml_value(item) for item in value) + "]"
     return f'"{value}"'
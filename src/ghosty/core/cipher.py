@@ -0,0 +1,207 @@
+"""OpenVPN data-channel tuning — cipher ordering and DCO offload detection."""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ghosty.core import preflight
+from ghosty.utils.process import run_command
+
+logger = logging.getLogger(__name__)
+
+# AEAD ciphers supported by both userspace OpenVPN >= 2.5 and ovpn-dco
+AEAD_CIPHERS = ("AES-128-GCM", "AES-256-GCM", "CHACHA20-POLY1305")
+
+_DCO_MODULE = "ovpn_dco_v2"
+_VERSION_RE = re.compile(r"OpenVPN (\d+)\.(\d+)")
+_SPEED_RE = re.compile(r"^(\S+)\s+([\d.]+)k\s*$", re.MULTILINE)
+
+
+def cpu_crypto_features(cpuinfo: str | None = None) -> set[str]:
+    """Return crypto-relevant CPU flags (aes, pclmulqdq, avx2, vaes, pmull, ...)."""
+    if cpuinfo is None:
+        try:
+            cpuinfo = Path("/proc/cpuinfo").read_text()
+        except OSError:
+            return set()
+
+    flags: set[str] = set()
+    for line in cpuinfo.splitlines():
+        key, _, value = line.partition(":")
+        # x86 reports "flags", ARM reports "Features"
+        if key.strip() in ("flags", "Features"):
+            flags.update(value.split())
+            break
+    return flags & {"aes", "pclmulqdq", "avx", "avx2", "vaes", "vpclmulqdq", "pmull", "sha2"}
+
+
+def has_aes_acceleration(features: set[str]) -> bool:
+    return "aes" in features
+
+
+def openvpn_version() -> tuple[int, int] | None:
+    """Return the installed OpenVPN (major, minor) version."""
+    result = run_command(["openvpn", "--version"], timeout=5)
+    # openvpn --version exits 1 on some builds, so only look at the output
+    match = _VERSION_RE.search(result.stdout)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def dco_available(*, load: bool = True) -> bool:
+    """Check whether the ovpn-dco kernel module is loaded or loadable.
+
+    Args:
+        load: Try to load the module if it is installed but not loaded.
+    """
+    if Path(f"/sys/module/{_DCO_MODULE}").exists():
+        return True
+    if not load:
+        return run_command(["modprobe", "-n", _DCO_MODULE], timeout=5).success
+    result = run_command(["modprobe", _DCO_MODULE], timeout=10)
+    return result.success and Path(f"/sys/module/{_DCO_MODULE}").exists()
+
+
+def benchmark_ciphers(
+    ciphers: tuple[str, ...] | list[str] = AEAD_CIPHERS,
+    *,
+    packet_size: int = 1408,
+    seconds: int = 1,
+) -> dict[str, float]:
+    """Measure single-core AEAD throughput with ``openssl speed``.
+
+    Packets are sized like full tunnel packets so the result reflects the
+    data channel rather than small-buffer overhead.
+
+    Returns:
+        Mapping of cipher name to throughput in bytes per second.
+    """
+    results: dict[str, float] = {}
+    for cipher in ciphers:
+        result = run_command(
+            ["openssl", "speed", "-evp", cipher.lower(), "-bytes", str(packet_size),
+             "-seconds", str(seconds)],
+            timeout=seconds * 5 + 10,
+        )
+        matches = list(_SPEED_RE.finditer(result.stdout))
+        match = matches[-1] if matches else None  # The summary table is the last match
+        if not result.success or match is None:
+            logger.warning("Cipher benchmark failed for %s", cipher)
+            continue
+        results[cipher] = float(match.group(2)) * 1000
+        logger.info("Cipher %s: %.1f MB/s", cipher, results[cipher] / 1e6)
+    return results
+
+
+def order_ciphers(
+    features: set[str], throughput: dict[str, float] | None = None
+) -> list[str]:
+    """Order AEAD ciphers fastest first.
+
+    Measured throughput wins; otherwise AES-GCM leads when the CPU has AES
+    instructions and ChaCha20-Poly1305 leads when it does not.
+    """
+    if throughput:
+        measured = sorted(throughput, key=throughput.__getitem__, reverse=True)
+        return measured + [c for c in AEAD_CIPHERS if c not in throughput]
+    if has_aes_acceleration(features):
+        return ["AES-128-GCM", "AES-256-GCM", "CHACHA20-POLY1305"]
+    return ["CHACHA20-POLY1305", "AES-128-GCM", "AES-256-GCM"]
+
+
+def _config_ciphers(config_file: str) -> tuple[list[str], str]:
+    """Return the ``data-ciphers`` list and legacy ``cipher`` of an OpenVPN config."""
+    data_ciphers: list[str] = []
+    legacy = ""
+    try:
+        for line in Path(config_file).read_text().splitlines():
+            parts = line.split("#", 1)[0].split(";", 1)[0].split()
+            if len(parts) < 2:
+                continue
+            if parts[0] in ("data-ciphers", "ncp-ciphers"):
+                data_ciphers = [c.upper() for c in parts[1].split(":") if c]
+            elif parts[0] == "cipher":
+                legacy = parts[1].upper()
+    except OSError:
+        pass
+    return data_ciphers, legacy
+
+
+def cached_throughput() -> dict[str, float]:
+    """``benchmark_ciphers`` for the AEAD ciphers, measured once per openssl build."""
+    return dict(preflight.measured("cipher_throughput", ("bin:openssl", "kernel"),
+                                   benchmark_ciphers))
+
+
+@dataclass
+class DataChannelPlan:
+    """Chosen OpenVPN data-channel settings."""
+
+    data_ciphers: list[str]
+    dco: bool
+    features: set[str] = field(default_factory=set)
+    throughput: dict[str, float] = field(default_factory=dict)
+    version: tuple[int, int] | None = None
+
+    def openvpn_args(self) -> list[str]:
+        """Command-line options implementing the plan."""
+        if self.version is None or self.version < (2, 5):
+            return []  # --data-ciphers is unknown before 2.5
+        args = ["--data-ciphers", ":".join(self.data_ciphers)]
+        if self.version >= (2, 6) and not self.dco:
+            # Skip OpenVPN's own DCO probing when we know it is unavailable
+            args.append("--disable-dco")
+        return args
+
+    def describe(self) -> str:
+        offload = "DCO" if self.dco else "userspace"
+        return f"{self.data_ciphers[0]} ({offload})"
+
+
+def plan_data_channel(
+    config_file: str,
+    *,
+    benchmark: bool = False,
+    capabilities: preflight.Capabilities | None = None,
+) -> DataChannelPlan:
+    """Pick the data-ciphers list and DCO mode for an OpenVPN config.
+
+    Args:
+        config_file: OpenVPN config. Its own ``data-ciphers`` list is only
+            reordered, never extended; a legacy ``cipher`` stays negotiable.
+        benchmark: Rank ciphers by measured throughput (cached per openssl
+            build) instead of inferring it from CPU flags.
+        capabilities: Cached preflight facts; skips the version and module probes.
+    """
+    features = cpu_crypto_features()
+    throughput = cached_throughput() if benchmark else {}
+    ciphers = order_ciphers(features, throughput)
+
+    configured, legacy = _config_ciphers(config_file)
+    if configured:
+        # Preferred order for the AEAD ciphers it lists, the rest (CBC
+        # fallbacks for old servers) after them in the config's order
+        ciphers = ([c for c in ciphers if c in configured]
+                   + [c for c in configured if c not in ciphers])
+    if legacy and legacy not in ciphers:
+        ciphers.append(legacy)
+
+    if capabilities is not None:
+        version = capabilities.openvpn_version
+        dco_installed = capabilities.dco_module
+    else:
+        version = openvpn_version()
+        dco_installed = True
+    dco = version is not None and version >= (2, 6) and dco_installed and dco_available()
+
+    plan = DataChannelPlan(
+        data_ciphers=ciphers, dco=dco, features=features,
+        throughput=throughput, version=version,
+    )
+    logger.info(
+        "Data channel: ciphers=%s dco=%s aes-ni=%s",
+        ":".join(ciphers), dco, has_aes_acceleration(features),
+    )
+    return plan
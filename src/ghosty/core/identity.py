@@ -0,0 +1,276 @@
+"""Identities — several isolated anonymization stacks on one host.
+
+The Orchestrator anonymizes the whole host with one mode. An identity
+instead lives in its own network namespace with its own VPN tunnel and/or
+TOR instance, so any number of them can run side by side and be started
+and stopped independently. Workloads join one with ``ghosty exec``.
+
+Egress per identity:
+
+* WireGuard: the interface is created in the host namespace and moved in,
+  so the namespace sees only the tunnel and has no other route out.
+* OpenVPN / TOR: a veth pair with NAT gives the client a way out; a
+  firewall inside the namespace keeps workloads off it. Only root (the
+  tunnel and TOR clients) may use the veth; other traffic must leave
+  through the tunnel, or for TOR identities is redirected to TOR's
+  transparent and DNS ports.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ghosty.config import IdentityConfig
+from ghosty.core.netns import Namespace, ResourceUsage, netns_name
+from ghosty.core.pipeline import Step, run_pipeline
+from ghosty.core.tor import TORInstance
+from ghosty.core.vpn import VPNManager
+from ghosty.core.wireguard import parse_config
+from ghosty.events import EventBus, IdentityChanged
+from ghosty.utils.process import run_command
+
+logger = logging.getLogger(__name__)
+
+_NAME_RE = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+_DATA_DIR = Path("/var/lib/ghosty/identities")
+_NFT_TABLE = "ghosty_identity"
+MAX_IDENTITIES = 250  # One 10.200.<n>.0/30 transfer network each
+
+
+def validate_name(name: str) -> str:
+    """Return ``name`` if it is usable as an identity name.
+
+    Raises:
+        ValueError: If it contains anything but letters, digits, - and _.
+    """
+    if not _NAME_RE.match(name):
+        raise ValueError(f"Invalid identity name {name!r} (use letters, digits, - and _)")
+    return name
+
+
+def firewall_ruleset(namespace: Namespace, *, uplink: bool, tor: TORInstance | None) -> str:
+    """nftables rules applied inside an identity's namespace."""
+    exempt = "0"
+    if tor is not None and tor.user is not None:
+        exempt = f"{{ 0, {tor.user.pw_uid} }}"
+
+    lines = [
+        f"table inet {_NFT_TABLE}",
+        f"delete table inet {_NFT_TABLE}",
+        f"table inet {_NFT_TABLE} {{",
+        "  chain output {",
+        "    type filter hook output priority filter; policy accept;",
+        '    oifname "lo" accept',
+        f"    meta skuid {exempt} accept",
+    ]
+    if tor is not None:
+        lines.append("    drop")
+    elif uplink:
+        lines.append(f'    oifname "{namespace.ns_veth}" drop')
+    lines.append("  }")
+
+    if tor is not None:
+        lines += [
+            "  chain redirect {",
+            "    type nat hook output priority dstnat; policy accept;",
+            f"    meta skuid {exempt} return",
+            "    ip daddr 127.0.0.0/8 return",
+            f"    udp dport 53 redirect to :{tor.dns_port}",
+            f"    meta l4proto tcp redirect to :{tor.trans_port}",
+            "  }",
+        ]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+@dataclass
+class IdentitySession:
+    """One running identity: its namespace and the clients inside it."""
+
+    name: str
+    config: IdentityConfig
+    namespace: Namespace
+    vpn: VPNManager | None = None
+    tor: TORInstance | None = None
+    started_at: float = 0.0
+    setup_seconds: float = 0.0
+
+    @property
+    def uplink(self) -> bool:
+        """Whether the namespace needs a veth route to the host."""
+        if self.vpn is None:
+            return self.tor is not None
+        return self.vpn.provider != "wireguard"
+
+    def _steps(self) -> list[Step]:
+        steps = [
+            Step("namespace", lambda: self.namespace.create(uplink=self.uplink),
+                 rollback=self.namespace.delete, description="Create namespace"),
+            # Before any client starts, so nothing leaks while they connect
+            Step("firewall", self._apply_firewall, requires=("namespace",),
+                 description="Apply namespace firewall"),
+        ]
+        if self.vpn is not None:
+            steps.append(Step("vpn", self.vpn.connect, requires=("firewall",),
+                              rollback=self.vpn.disconnect, description="Connect VPN"))
+        if self.tor is not None:
+            after = ("vpn",) if self.vpn is not None else ("firewall",)
+            steps.append(Step("tor", self.tor.start, requires=after,
+                              rollback=self.tor.stop, description="Bootstrap TOR"))
+        return steps
+
+    def _apply_firewall(self) -> tuple[bool, str]:
+        ruleset = firewall_ruleset(self.namespace, uplink=self.uplink, tor=self.tor)
+        result = run_command(self.namespace.exec_args(["nft", "-f", "-"]), timeout=10,
+                             input=ruleset)
+        if not result.success:
+            return False, f"Namespace firewall failed: {result.stderr}"
+        return True, "Namespace firewall applied"
+
+    def start(self) -> tuple[bool, str]:
+        """Bring the identity up, rolling back on failure.
+
+        Returns:
+            (success, message) tuple.
+        """
+        start = time.monotonic()
+        result = run_pipeline(self._steps())
+        if not result.success:
+            return False, result.message
+        self.started_at = time.time()
+        self.setup_seconds = time.monotonic() - start
+        return True, f"Identity {self.name} up in {self.setup_seconds:.1f}s"
+
+    def stop(self) -> tuple[bool, str]:
+        """Stop the clients and delete the namespace.
+
+        Returns:
+            (success, message) tuple.
+        """
+        if self.tor is not None:
+            self.tor.stop()
+        if self.vpn is not None and self.vpn.is_connected:
+            self.vpn.disconnect()
+        return self.namespace.delete()
+
+    def usage(self) -> ResourceUsage:
+        return self.namespace.usage()
+
+    def describe(self) -> dict[str, Any]:
+        """Status and resource cost, for ``ctl identity list``."""
+        return {
+            "name": self.name,
+            "netns": self.namespace.name,
+            "vpn": self.vpn.get_status() if self.vpn is not None else None,
+            "tor": self.tor.is_running if self.tor is not None else None,
+            "uptime": round(time.time() - self.started_at, 1) if self.started_at else 0.0,
+            "setup_seconds": round(self.setup_seconds, 2),
+            **self.usage().to_dict(),
+        }
+
+
+@dataclass
+class IdentityManager:
+    """Starts and stops identities independently of each other."""
+
+    events: EventBus | None = None
+    data_dir: Path = _DATA_DIR
+
+    _sessions: dict[str, IdentitySession] = field(default_factory=dict, repr=False)
+    _starting: set[str] = field(default_factory=set, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _free_index(self) -> int:
+        used = {session.namespace.index for session in self._sessions.values()}
+        for index in range(1, MAX_IDENTITIES + 1):
+            if index not in used:
+                return index
+        raise RuntimeError(f"At most {MAX_IDENTITIES} identities can run at once")
+
+    def session(self, name: str, config: IdentityConfig, index: int) -> IdentitySession:
+        """Assemble (but do not start) the session for an identity."""
+        if not config.vpn_config and not config.tor:
+            raise ValueError(f"Identity {name} has neither a VPN config nor TOR")
+
+        dns = tuple(config.dns)
+        vpn = None
+        if config.vpn_config:
+            vpn = VPNManager(provider=config.provider, config_file=config.vpn_config,
+                             auth_file=config.vpn_auth, auto_mtu=False,
+                             netns=netns_name(name))
+            if config.provider == "wireguard":
+                dns = tuple(parse_config(config.vpn_config).dns) or dns
+        tor = None
+        if config.tor:
+            tor = TORInstance(self.data_dir / name / "tor", netns=netns_name(name))
+            dns = ("127.0.0.1",)  # TOR's DNSPort
+
+        return IdentitySession(name, config, Namespace(netns_name(name), index, dns),
+                               vpn=vpn, tor=tor)
+
+    def start(self, name: str, config: IdentityConfig) -> tuple[bool, str]:
+        """Start one identity; others keep running untouched.
+
+        Returns:
+            (success, message) tuple.
+        """
+        validate_name(name)
+        with self._lock:
+            if name in self._sessions or name in self._starting:
+                return False, f"Identity {name} is already running"
+            session = self.session(name, config, self._free_index())
+            # Hold the index while the (slow) start runs unlocked
+            self._sessions[name] = session
+            self._starting.add(name)
+
+        try:
+            success, message = session.start()
+        except Exception as e:
+            logger.exception("Identity %s failed to start", name)
+            success, message = False, str(e)
+        with self._lock:
+            self._starting.discard(name)
+            if not success:
+                del self._sessions[name]
+
+        logger.info("%s", message)
+        if success:
+            self._publish(name, True, message)
+        return success, message
+
+    def stop(self, name: str) -> tuple[bool, str]:
+        """Stop one identity.
+
+        Returns:
+            (success, message) tuple.
+        """
+        with self._lock:
+            if name in self._starting:
+                return False, f"Identity {name} is still starting"
+            session = self._sessions.pop(name, None)
+        if session is None:
+            return False, f"Identity {name} is not running"
+
+        success, message = session.stop()
+        self._publish(name, False, message)
+        return success, f"Identity {name} stopped" if success else message
+
+    def stop_all(self) -> None:
+        for name in list(self._sessions):
+            self.stop(name)
+
+    def running(self) -> list[dict[str, Any]]:
+        """Running identities with their resource cost."""
+        with self._lock:
+            sessions = [s for n, s in self._sessions.items() if n not in self._starting]
+        return [session.describe() for session in sessions]
+
+    def _publish(self, name: str, active: bool, message: str) -> None:
+        if self.events is not None:
+            self.events.publish(IdentityChanged(name, active, message))
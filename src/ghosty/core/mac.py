@@ -7,6 +7,10 @@ import random
 import re
 from dataclasses import dataclass, field
 
+from ghosty.events import EventBus, MACChanged
+from ghosty.tracing import traced
+from ghosty.utils import interfaces
+from ghosty.utils.network import get_interface_mac
 from ghosty.utils.process import run_command, is_available
 
 logger = logging.getLogger(__name__)
@@ -24,6 +28,7 @@ class MACChanger:
     """Manages MAC address changes with original MAC tracking."""
 
     _original_macs: dict[str, str] = field(default_factory=dict, repr=False)
+    events: EventBus | None = field(default=None, repr=False)
 
     def is_available(self) -> bool:
         """Check if macchanger is installed."""
@@ -31,21 +36,9 @@ class MACChanger:
 
     def get_current_mac(self, interface: str) -> str:
         """Get the current MAC address of an interface."""
-        try:
-            from pathlib import Path
-            return Path(f"/sys/class/net/{interface}/address").read_text().strip()
-        except (OSError, FileNotFoundError):
-            pass
-
-        result = run_command(["ip", "link", "show", interface], timeout=5)
-        if result.success:
-            for line in result.stdout.splitlines():
-                if "link/ether" in line:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        return parts[1]
-        return "Unknown"
+        return get_interface_mac(interface)
 
+    @traced("mac.change_mac")
     def change_mac(self, interface: str, new_mac: str | None = None) -> tuple[bool, str]:
         """Change MAC address of an interface.
 
@@ -71,13 +64,8 @@ class MACChanger:
             return False, f"Failed to bring {interface} down: {result.stderr}"
 
         # Change MAC
-        if new_mac:
-            cmd = ["macchanger", "-m", new_mac, interface]
-        else:
-            new_mac = _random_mac()
-            cmd = ["macchanger", "-m", new_mac, interface]
-
-        result = run_command(cmd, timeout=10)
+        mac = new_mac or _random_mac()
+        result = run_command(["macchanger", "-m", mac, interface], timeout=10)
         if not result.success:
             # Bring interface back up even on failure
             run_command(["ip", "link", "set", interface, "up"], timeout=10)
@@ -85,6 +73,7 @@ class MACChanger:
 
         # Bring interface back up
         result_up = run_command(["ip", "link", "set", interface, "up"], timeout=10)
+        interfaces.invalidate()
         if not result_up.success:
             return False, f"Failed to bring {interface} up: {result_up.stderr}"
 
@@ -95,8 +84,11 @@ class MACChanger:
         mac_display = match.group(1) if match else "changed"
 
         logger.info("MAC changed for %s: %s", interface, mac_display)
+        if self.events is not None:
+            self.events.publish(MACChanged(interface, match.group(1) if match else mac))
         return True, f"MAC address changed to {mac_display}"
 
+    @traced("mac.restore_mac")
     def restore_mac(self, interface: str) -> tuple[bool, str]:
         """Restore the original MAC address for an interface.
 
@@ -118,10 +110,13 @@ class MACChanger:
             return False, f"Failed to restore MAC: {result.stderr}"
 
         result_up = run_command(["ip", "link", "set", interface, "up"], timeout=10)
+        interfaces.invalidate()
         if not result_up.success:
             return False, f"Failed to bring {interface} up: {result_up.stderr}"
 
         logger.info("MAC restored for %s: %s", interface, original)
+        if self.events is not None:
+            self.events.publish(MACChanged(interface, original, restored=True))
         return True, f"MAC restored to {original}"
 
     def restore_all(self) -> list[tuple[str, bool, str]]:
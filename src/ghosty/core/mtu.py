@@ -0,0 +1,180 @@
+"""Path-MTU discovery and MSS clamping for VPN tunnels."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ghosty.utils.process import run_command
+
+logger = logging.getLogger(__name__)
+
+_CACHE_FILE = Path.home() / ".config" / "ghosty" / "mtu_cache.json"
+_NFT_TABLE = "ghosty_mss"
+
+# Outer IPv4 + UDP + protocol framing added to every tunnelled packet
+_TUNNEL_OVERHEAD = {
+    "wireguard": 60,  # 20 IP + 8 UDP + 32 WireGuard
+    "openvpn": 69,    # 20 IP + 8 UDP + AEAD opcode/peer-id/packet-id/tag, with slack
+}
+_IPV6_EXTRA = 20
+_ICMP_HEADERS = 28  # 20 IP + 8 ICMP
+_TCP_HEADERS = 40   # 20 IP + 20 TCP
+
+
+def _probe(host: str, size: int, mark: int | None) -> bool:
+    """Send one DF-flagged ping whose IP packet is ``size`` bytes."""
+    ipv6 = ":" in host
+    payload = size - _ICMP_HEADERS - (_IPV6_EXTRA if ipv6 else 0)
+    cmd = ["ping", "-6" if ipv6 else "-4", "-M", "do", "-c", "1", "-W", "1", "-s", str(payload)]
+    if mark:
+        # Marked like the tunnel's own packets so policy routing sends it outside
+        cmd.extend(["-m", str(mark)])
+    cmd.append(host)
+    return run_command(cmd, timeout=3).success
+
+
+def discover_path_mtu(
+    host: str, *, low: int = 1280, high: int = 1500, mark: int | None = None
+) -> int | None:
+    """Binary-search the largest packet that reaches ``host`` unfragmented.
+
+    Returns:
+        Path MTU in bytes, or None if even ``low`` does not get through
+        (host unreachable or ICMP filtered).
+    """
+    if not _probe(host, low, mark):
+        return None
+    if _probe(host, high, mark):
+        return high
+
+    # Invariant: low passes, high fails
+    while high - low > 1:
+        mid = (low + high) // 2
+        if _probe(host, mid, mark):
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+@dataclass
+class MTUTuner:
+    """Sizes a tunnel to the measured path MTU and clamps TCP MSS to match.
+
+    Measurements are cached per endpoint so reconnects skip the probe.
+    """
+
+    cache_file: Path = _CACHE_FILE
+    max_age: float = 7 * 24 * 3600
+
+    _cache: dict[str, dict[str, float]] | None = field(default=None, repr=False)
+    _clamped: bool = field(default=False, repr=False)
+
+    def _load_cache(self) -> dict[str, dict[str, float]]:
+        if self._cache is None:
+            try:
+                self._cache = json.loads(self.cache_file.read_text())
+            except (OSError, ValueError):
+                self._cache = {}
+        return self._cache
+
+    def _save_cache(self) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.write_text(json.dumps(self._load_cache(), indent=2))
+        except OSError:
+            logger.warning("Could not write MTU cache to %s", self.cache_file)
+
+    def path_mtu(self, host: str, port: int, mark: int | None = None) -> int | None:
+        """Return the cached or freshly measured path MTU to an endpoint."""
+        key = f"{host}:{port}"
+        entry = self._load_cache().get(key)
+        if entry and time.time() - entry["measured"] < self.max_age:
+            logger.info("Using cached path MTU %d for %s", entry["path_mtu"], key)
+            return int(entry["path_mtu"])
+
+        start = time.monotonic()
+        mtu = discover_path_mtu(host, mark=mark)
+        if mtu is None:
+            logger.warning("Path MTU probe to %s failed", key)
+            return None
+
+        logger.info("Path MTU to %s is %d (%.1fs)", key, mtu, time.monotonic() - start)
+        self._load_cache()[key] = {"path_mtu": mtu, "measured": time.time()}
+        self._save_cache()
+        return mtu
+
+    def tune(
+        self,
+        interface: str,
+        endpoint: tuple[str, int],
+        provider: str,
+        *,
+        mark: int | None = None,
+    ) -> tuple[bool, str]:
+        """Set the tunnel MTU and MSS clamp from the endpoint's path MTU.
+
+        Args:
+            interface: Tunnel device to resize.
+            endpoint: VPN server (host, port) whose path is probed.
+            provider: "openvpn" or "wireguard", selects the encapsulation overhead.
+            mark: Firewall mark that routes probes outside the tunnel.
+
+        Returns:
+            (success, message) tuple.
+        """
+        host, port = endpoint
+        path_mtu = self.path_mtu(host, port, mark)
+        if path_mtu is None:
+            return False, f"Could not measure path MTU to {host}"
+
+        overhead = _TUNNEL_OVERHEAD.get(provider, _TUNNEL_OVERHEAD["openvpn"])
+        if ":" in host:
+            overhead += _IPV6_EXTRA
+        tunnel_mtu = path_mtu - overhead
+        mss = tunnel_mtu - _TCP_HEADERS
+
+        result = run_command(["ip", "link", "set", "dev", interface, "mtu", str(tunnel_mtu)],
+                             timeout=10)
+        if not result.success:
+            return False, f"Failed to set MTU on {interface}: {result.stderr}"
+
+        success, message = self._clamp_mss(interface, mss)
+        if not success:
+            return False, message
+
+        return True, f"{interface} MTU {tunnel_mtu}, MSS {mss} (path MTU {path_mtu})"
+
+    def _clamp_mss(self, interface: str, mss: int) -> tuple[bool, str]:
+        """Install (or replace) the nftables MSS clamp for the tunnel."""
+        rule = f"tcp flags & (syn | rst) == syn tcp option maxseg size set {mss}"
+        ruleset = (
+            f"table inet {_NFT_TABLE}\n"
+            f"delete table inet {_NFT_TABLE}\n"
+            f"table inet {_NFT_TABLE} {{\n"
+            "  chain output {\n"
+            "    type filter hook output priority mangle; policy accept;\n"
+            f'    oifname "{interface}" {rule}\n'
+            "  }\n"
+            "  chain forward {\n"
+            "    type filter hook forward priority mangle; policy accept;\n"
+            f'    oifname "{interface}" {rule}\n'
+            f'    iifname "{interface}" {rule}\n'
+            "  }\n"
+            "}\n"
+        )
+        result = run_command(["nft", "-f", "-"], timeout=10, input=ruleset)
+        if not result.success:
+            return False, f"MSS clamp failed: {result.stderr}"
+        self._clamped = True
+        return True, f"MSS clamped to {mss}"
+
+    def remove_clamp(self) -> None:
+        """Remove the MSS clamp table if we installed it."""
+        if self._clamped:
+            run_command(["nft", "delete", "table", "inet", _NFT_TABLE], timeout=10)
+            self._clamped = False
@@ -0,0 +1,229 @@
+"""Network namespaces — isolated network stacks for concurrent identities.
+
+Each namespace gets a loopback device, its own ``resolv.conf`` (bind-mounted
+by ``ip netns exec`` from ``/etc/netns/<name>/``) and, when it needs direct
+egress, a veth pair to the host with a /30 transfer network that the host
+masquerades out of its default route.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import shutil
+import signal
+from dataclasses import dataclass
+from pathlib import Path
+
+from ghosty.utils.process import CommandResult, run_command
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "ghosty-"
+_NETNS_DIR = Path("/run/netns")
+_ETC_NETNS = Path("/etc/netns")
+_TRANSFER_NET = "10.200"  # 10.200.<index>.0/30 per namespace
+
+
+def netns_name(identity: str) -> str:
+    """Namespace name for an identity."""
+    return f"{PREFIX}{identity}"
+
+
+def exists(name: str) -> bool:
+    """Check whether a named namespace is mounted."""
+    return (_NETNS_DIR / name).exists()
+
+
+def in_netns(netns: str, cmd: list[str]) -> list[str]:
+    """Prefix ``cmd`` so it runs inside ``netns``; unchanged when empty."""
+    return ["ip", "netns", "exec", netns, *cmd] if netns else cmd
+
+
+@dataclass(frozen=True)
+class ResourceUsage:
+    """What one namespace's processes cost the host."""
+
+    processes: int
+    threads: int
+    rss_bytes: int
+    cpu_seconds: float
+    open_files: int
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "processes": self.processes,
+            "threads": self.threads,
+            "rss_bytes": self.rss_bytes,
+            "cpu_seconds": round(self.cpu_seconds, 2),
+            "open_files": self.open_files,
+        }
+
+
+def _proc_usage(pid: int) -> tuple[int, int, float, int] | None:
+    """(threads, rss bytes, cpu seconds, open fds) of one process."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        open_files = len(os.listdir(f"/proc/{pid}/fd"))
+    except (OSError, IndexError):
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    # Fields after the command name start at state (field 3 of proc(5))
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    threads = int(fields[17])
+    rss = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+    return threads, rss, cpu, open_files
+
+
+@dataclass
+class Namespace:
+    """A named network namespace, optionally wired to the host's uplink.
+
+    ``index`` (1-250) selects the veth names and transfer network, so
+    concurrent namespaces never collide.
+    """
+
+    name: str
+    index: int
+    dns: tuple[str, ...] = ("1.1.1.1",)
+
+    @property
+    def host_veth(self) -> str:
+        return f"ghv{self.index}h"
+
+    @property
+    def ns_veth(self) -> str:
+        return f"ghv{self.index}n"
+
+    @property
+    def host_address(self) -> str:
+        return f"{_TRANSFER_NET}.{self.index}.1"
+
+    @property
+    def ns_address(self) -> str:
+        return f"{_TRANSFER_NET}.{self.index}.2"
+
+    @property
+    def _nft_table(self) -> str:
+        return f"ghosty_ns{self.index}"
+
+    def exec_args(self, cmd: list[str]) -> list[str]:
+        return in_netns(self.name, cmd)
+
+    def create(self, *, uplink: bool) -> tuple[bool, str]:
+        """Create the namespace, its resolver config and optional uplink.
+
+        Args:
+            uplink: Attach a veth pair and NAT so processes inside reach the
+                internet directly (needed by OpenVPN and TOR; WireGuard
+                keeps its socket in the host namespace and needs none).
+
+        Returns:
+            (success, message) tuple.
+        """
+        if exists(self.name):
+            return False, f"Namespace {self.name} already exists"
+
+        result = run_command(["ip", "netns", "add", self.name], timeout=10)
+        if not result.success:
+            return False, f"Failed to create namespace {self.name}: {result.stderr}"
+
+        try:
+            resolv = _ETC_NETNS / self.name / "resolv.conf"
+            resolv.parent.mkdir(parents=True, exist_ok=True)
+            resolv.write_text("".join(f"nameserver {server}\n" for server in self.dns))
+        except OSError as e:
+            self.delete()
+            return False, f"Failed to write resolver config: {e}"
+
+        result = run_command(["ip", "-n", self.name, "link", "set", "lo", "up"], timeout=10)
+        if result.success and uplink:
+            result = self._attach_uplink()
+        if not result.success:
+            self.delete()
+            return False, f"Failed to configure namespace {self.name}: {result.stderr}"
+
+        logger.info("Namespace %s created (uplink: %s)", self.name, uplink)
+        return True, f"Namespace {self.name} created"
+
+    def _attach_uplink(self) -> CommandResult:
+        """veth pair into the namespace plus host-side forwarding and NAT."""
+        host, peer = self.host_veth, self.ns_veth
+        batch = (
+            f"link add {host} type veth peer name {peer} netns {self.name}\n"
+            f"address add {self.host_address}/30 dev {host}\n"
+            f"link set {host} up\n"
+        )
+        result = run_command(["ip", "-batch", "-"], timeout=10, input=batch)
+        if not result.success:
+            return result
+        batch = (
+            f"address add {self.ns_address}/30 dev {peer}\n"
+            f"link set {peer} up\n"
+            f"route add default via {self.host_address}\n"
+        )
+        result = run_command(["ip", "-n", self.name, "-batch", "-"], timeout=10, input=batch)
+        if not result.success:
+            return result
+
+        try:
+            Path("/proc/sys/net/ipv4/ip_forward").write_text("1")
+        except OSError:
+            logger.warning("Could not enable IPv4 forwarding")
+        ruleset = (
+            f"table ip {self._nft_table}\n"
+            f"delete table ip {self._nft_table}\n"  # Replace leftovers from a crash
+            f"table ip {self._nft_table} {{\n"
+            "  chain postrouting {\n"
+            "    type nat hook postrouting priority srcnat; policy accept;\n"
+            f'    ip saddr {_TRANSFER_NET}.{self.index}.0/30 oifname != "{host}" masquerade\n'
+            "  }\n"
+            "  chain forward {\n"
+            "    type filter hook forward priority filter; policy accept;\n"
+            f'    iifname "{host}" accept\n'
+            f'    oifname "{host}" ct state established,related accept\n'
+            "  }\n"
+            "}\n"
+        )
+        return run_command(["nft", "-f", "-"], timeout=10, input=ruleset)
+
+    def pids(self) -> list[int]:
+        """Processes currently inside the namespace."""
+        result = run_command(["ip", "netns", "pids", self.name], timeout=5)
+        return [int(pid) for pid in result.stdout.split() if pid.isdigit()]
+
+    def usage(self) -> ResourceUsage:
+        """Sum the resource use of every process in the namespace."""
+        processes = threads = rss = files = 0
+        cpu = 0.0
+        for pid in self.pids():
+            sample = _proc_usage(pid)
+            if sample is None:
+                continue  # Exited between listing and reading
+            processes += 1
+            threads += sample[0]
+            rss += sample[1]
+            cpu += sample[2]
+            files += sample[3]
+        return ResourceUsage(processes, threads, rss, cpu, files)
+
+    def delete(self) -> tuple[bool, str]:
+        """Kill leftover processes and remove the namespace and its NAT.
+
+        Deleting the namespace destroys the veth pair with it.
+
+        Returns:
+            (success, message) tuple.
+        """
+        for pid in self.pids():
+            with contextlib.suppress(OSError):
+                os.kill(pid, signal.SIGTERM)
+        run_command(["nft", "delete", "table", "ip", self._nft_table], timeout=10)
+        shutil.rmtree(_ETC_NETNS / self.name, ignore_errors=True)
+
+        result = run_command(["ip", "netns", "del", self.name], timeout=10)
+        if not result.success and exists(self.name):
+            return False, f"Failed to delete namespace {self.name}: {result.stderr}"
+        logger.info("Namespace %s deleted", self.name)
+        return True, f"Namespace {self.name} deleted"
@@ -12,9 +12,22 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Callable
 
+from ghosty.config import GhostyConfig
 from ghosty.core.mac import MACChanger
-from ghosty.core.vpn import VPNManager
+from ghosty.core.pipeline import Step, TeardownReport, run_pipeline, run_teardown
+from ghosty.core.provision import provision, requirements_for
+from ghosty.core.vpn import ParsedVPNConfig, VPNManager, VPNSupervisor
 from ghosty.core.tor import TORManager
+from ghosty.events import (
+    EventBus,
+    EventsDropped,
+    LogMessage,
+    ModeChanged,
+    StepProgress,
+    Subscription,
+    VPNStateChanged,
+)
+from ghosty.tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -26,34 +39,98 @@ class AnonymizationMode(Enum):
     STANDARD = "Standard"    # MAC + VPN
     ENHANCED = "Enhanced"    # MAC + VPN + TOR
 
+    @property
+    def layers(self) -> frozenset[str]:
+        """Layers this mode stacks: "mac", "vpn" and/or "tor"."""
+        return _MODE_LAYERS[self]
+
+
+_MODE_LAYERS = {
+    AnonymizationMode.NORMAL: frozenset({"mac"}),
+    AnonymizationMode.STANDARD: frozenset({"mac", "vpn"}),
+    AnonymizationMode.ENHANCED: frozenset({"mac", "vpn", "tor"}),
+}
+
+
+def parse_mode(value: str) -> AnonymizationMode:
+    """Resolve a mode from its name or value, case-insensitively.
+
+    Raises:
+        ValueError: If no mode matches.
+    """
+    for mode in AnonymizationMode:
+        if value.lower() in (mode.name.lower(), mode.value.lower()):
+            return mode
+    choices = ", ".join(mode.value for mode in AnonymizationMode)
+    raise ValueError(f"Unknown mode {value!r} (choose from {choices})")
+
 
 @dataclass
 class Orchestrator:
     """Coordinates MAC, VPN, and TOR operations with crash-safe cleanup.
 
     Installs atexit and signal handlers to restore state if the process
-    is killed unexpectedly.
+    is killed unexpectedly. Progress and state changes are published on
+    ``events``, which the managers share.
     """
 
     mac: MACChanger = field(default_factory=MACChanger)
     vpn: VPNManager = field(default_factory=VPNManager)
     tor: TORManager = field(default_factory=TORManager)
+    supervisor: VPNSupervisor | None = field(default=None, repr=False)
 
     _is_active: bool = field(default=False, repr=False)
     _current_mode: AnonymizationMode | None = field(default=None, repr=False)
     _current_interface: str = ""
+    stop_deadline: float = 8.0  # Seconds allowed for the whole teardown
     _cleanup_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
-    _log_callback: Callable[[str], None] | None = field(default=None, repr=False)
+    events: EventBus = field(default_factory=EventBus, repr=False)
+    _log_subscription: Subscription | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        for manager in (self.mac, self.vpn, self.tor):
+            manager.events = self.events
+
+    def apply_config(self, config: GhostyConfig) -> None:
+        """Copy VPN and TOR preferences from the user config onto the managers.
+
+        Call only while inactive: ``disconnect`` picks its teardown from
+        the provider and backend, so changing them under a live tunnel
+        would leave it up. While active, set just the rotation interval
+        (``tor.set_rotation_interval``), which retimes a running rotation.
+        """
+        self.vpn.provider = config.vpn.provider
+        self.vpn.wireguard_backend = config.vpn.wireguard_backend
+        self.vpn.auto_mtu = config.vpn.auto_mtu
+        self.vpn.tune_data_channel = config.vpn.tune_data_channel
+        self.vpn.benchmark_ciphers = config.vpn.benchmark_ciphers
+        self.tor.set_rotation_interval(config.tor.rotation_interval)
+        self.tor.controller_port = config.tor.controller_port
 
     def set_log_callback(self, callback: Callable[[str], None]) -> None:
-        """Set callback for log messages (used by GUI)."""
-        self._log_callback = callback
+        """Deliver activity messages to ``callback``, replacing any previous one.
+
+        Kept for simple consumers; the callback runs on a delivery thread.
+        Subscribe to ``events`` directly for structured events.
+        """
+        if self._log_subscription is not None:
+            self._log_subscription.close()
+
+        def _deliver(batch: list) -> None:
+            for event in batch:
+                if isinstance(event, LogMessage):
+                    callback(event.message)
+                elif isinstance(event, EventsDropped):
+                    callback(f"({event.count} log messages dropped)")
+
+        self._log_subscription = self.events.subscribe(
+            _deliver, types=(LogMessage,), name="log-callback"
+        )
 
     def _log(self, message: str) -> None:
-        """Log to both logger and GUI callback."""
+        """Log to the logger and publish for subscribers."""
         logger.info(message)
-        if self._log_callback:
-            self._log_callback(message)
+        self.events.publish(LogMessage(message))
 
     @property
     def is_active(self) -> bool:
@@ -63,6 +140,23 @@ class Orchestrator:
     def current_mode(self) -> AnonymizationMode | None:
         return self._current_mode
 
+    @property
+    def current_interface(self) -> str:
+        return self._current_interface
+
+    @property
+    def vpn_state(self) -> str:
+        """VPN supervisor state: healthy, reconnecting, failed or stopped."""
+        return self.supervisor.state if self.supervisor else "stopped"
+
+    def _on_vpn_state(self, state: str, message: str) -> None:
+        """Surface supervisor transitions in the activity log."""
+        self.events.publish(VPNStateChanged(state, message))
+        if state == "failed":
+            self._log(f"VPN lost: {message}. Stop and restart to recover.")
+        else:
+            self._log(message)
+
     def start(
         self,
         mode: AnonymizationMode,
@@ -70,6 +164,9 @@ class Orchestrator:
         *,
         vpn_config: str = "",
         vpn_auth: str | None = None,
+        vpn_fallbacks: list[str] | None = None,
+        vpn_parsed: ParsedVPNConfig | None = None,
+        cancel: threading.Event | None = None,
     ) -> tuple[bool, str]:
         """Start anonymization with the specified mode.
 
@@ -78,12 +175,19 @@ class Orchestrator:
             interface: Network interface to modify.
             vpn_config: Path to VPN config file.
             vpn_auth: Path to VPN auth file (optional).
+            vpn_fallbacks: Alternative VPN configs the supervisor may fail over to.
+            vpn_parsed: ``vpn_config`` already parsed, so it is not read again.
+            cancel: Optional event that aborts the start; completed steps
+                are rolled back.
 
         Returns:
             (success, message) tuple.
         """
         if self._is_active:
             return False, "Anonymization is already active"
+        cancel = cancel or threading.Event()
+        if cancel.is_set():
+            return False, "Cancelled"
 
         self._current_mode = mode
         self._current_interface = interface
@@ -91,47 +195,201 @@ class Orchestrator:
         # Install crash handlers
         self._install_handlers()
 
+        if "vpn" in mode.layers:
+            success, message = self._configure_vpn(vpn_config, vpn_auth, vpn_parsed)
+            if not success:
+                return False, message
+
         self._log(f"Starting {mode.value} mode...")
 
-        # Step 1: MAC change (all modes)
-        self._log("Changing MAC address...")
-        success, message = self.mac.change_mac(interface)
-        if not success:
-            self._log(f"MAC change failed: {message}")
-            return False, f"MAC change failed: {message}"
-        self._log(f"MAC changed: {message}")
-
-        # Step 2: VPN (Standard and Enhanced)
-        if mode in (AnonymizationMode.STANDARD, AnonymizationMode.ENHANCED):
-            if not vpn_config:
-                self._cleanup()
-                return False, "No VPN config file provided"
-
-            self._log("Connecting to VPN...")
-            success, message = self.vpn.set_config(vpn_config, vpn_auth)
-            if not success:
-                self._cleanup()
-                return False, f"VPN config error: {message}"
+        with span("orchestrator.start", mode=mode.value, interface=interface):
+            result = run_pipeline(
+                self._plan_start(mode.layers, interface, cancel),
+                cancel=cancel,
+                on_step=self._on_step,
+            )
+        if not result.success:
+            self._log(result.message)
+            return False, result.message
 
-            success, message = self.vpn.connect()
-            if not success:
-                self._cleanup()
-                return False, f"VPN connection failed: {message}"
-            self._log(f"VPN connected: {message}")
-
-        # Step 3: TOR + IP rotation (Enhanced only)
-        if mode == AnonymizationMode.ENHANCED:
-            self._log("Starting TOR and IP rotation...")
-            success, message = self.tor.start_full()
-            if not success:
-                self._cleanup()
-                return False, f"TOR setup failed: {message}"
-            self._log(f"TOR active: {message}")
+        if "vpn" in mode.layers:
+            self._start_supervisor(vpn_fallbacks)
 
         self._is_active = True
+        self.events.publish(ModeChanged(mode.value, active=True))
         self._log(f"{mode.value} mode anonymization active!")
         return True, f"{mode.value} mode started"
 
+    @traced("orchestrator.transition")
+    def transition(
+        self,
+        target: AnonymizationMode,
+        *,
+        vpn_config: str = "",
+        vpn_auth: str | None = None,
+        vpn_fallbacks: list[str] | None = None,
+        cancel: threading.Event | None = None,
+    ) -> tuple[bool, str]:
+        """Switch an active session to another mode, changing only the delta.
+
+        Layers present in both modes are left untouched: adding TOR keeps
+        the MAC and VPN, dropping the VPN keeps the MAC. If no session is
+        active this is the same as start() on the last interface.
+
+        ``cancel`` aborts bringing up added layers; layers already removed
+        stay down.
+
+        Returns:
+            (success, message) tuple.
+        """
+        if not self._is_active or self._current_mode is None:
+            if not self._current_interface:
+                return False, "Anonymization is not active"
+            return self.start(target, self._current_interface, vpn_config=vpn_config,
+                              vpn_auth=vpn_auth, vpn_fallbacks=vpn_fallbacks, cancel=cancel)
+        cancel = cancel or threading.Event()
+
+        current = self._current_mode
+        if target == current:
+            return True, f"Already in {target.value} mode"
+
+        added = target.layers - current.layers
+        removed = current.layers - target.layers
+        self._log(f"Switching {current.value} -> {target.value}...")
+
+        if removed:
+            with self._cleanup_lock:
+                if "vpn" in removed:
+                    self._stop_supervisor()
+                report = run_teardown(self._plan_stop(removed), deadline=self.stop_deadline,
+                                      on_step=self._on_teardown_step)
+            if not report.success:
+                # Layers that failed to stop are still up; stay in the old mode
+                return False, f"Could not leave {current.value} mode"
+
+        if added:
+            if "vpn" in added:
+                success, message = self._configure_vpn(vpn_config, vpn_auth)
+                if not success:
+                    return False, message
+            result = run_pipeline(
+                self._plan_start(added, self._current_interface, cancel),
+                cancel=cancel,
+                on_step=self._on_step,
+            )
+            if not result.success:
+                self._log(result.message)
+                return False, result.message
+            if "vpn" in added:
+                self._start_supervisor(vpn_fallbacks)
+
+        self._current_mode = target
+        self.events.publish(ModeChanged(target.value, active=True))
+        self._log(f"{target.value} mode anonymization active!")
+        return True, f"Switched to {target.value} mode"
+
+    def _configure_vpn(
+        self, vpn_config: str, vpn_auth: str | None, parsed: ParsedVPNConfig | None = None
+    ) -> tuple[bool, str]:
+        if not vpn_config:
+            return False, "No VPN config file provided"
+        success, message = self.vpn.set_config(vpn_config, vpn_auth, parsed=parsed)
+        if not success:
+            return False, f"VPN config error: {message}"
+        return True, message
+
+    def _start_supervisor(self, fallbacks: list[str] | None) -> None:
+        self.supervisor = VPNSupervisor(
+            self.vpn,
+            fallback_configs=list(fallbacks or []),
+            on_state_change=self._on_vpn_state,
+        )
+        self.supervisor.start()
+
+    def _stop_supervisor(self) -> None:
+        if self.supervisor:
+            self.supervisor.stop(timeout=1.0)
+            self.supervisor = None
+
+    def _plan_start(
+        self, layers: frozenset[str], interface: str, cancel: threading.Event | None = None
+    ) -> list[Step]:
+        """Build the start graph for the layers being added.
+
+        Dependency provisioning (one install transaction for every layer)
+        and endpoint resolution run first and in parallel. The MAC change
+        takes the interface down, so everything that needs the network
+        waits for it. VPN connect and TOR service start are independent of
+        each other; IP rotation needs both so its circuits are built
+        through the tunnel.
+
+        Args:
+            layers: Layers to bring up.
+            interface: Network interface to modify.
+            cancel: Cancellation event handed to steps that wait.
+        """
+        steps = [
+            Step("provision", lambda: self._provision(layers),
+                 description="Dependency provisioning"),
+        ]
+        pre_mac = ["provision"]
+
+        if "vpn" in layers:
+            steps.append(Step("vpn_resolve", self.vpn.resolve_endpoint,
+                              description="VPN endpoint resolution"))
+            pre_mac.append("vpn_resolve")
+
+        # Without a MAC change there is nothing to wait for beyond the checks
+        after_mac: tuple[str, ...] = ("mac",) if "mac" in layers else tuple(pre_mac)
+        if "mac" in layers:
+            steps.append(Step(
+                "mac", lambda: self.mac.change_mac(interface),
+                requires=tuple(pre_mac),
+                rollback=lambda: self.mac.restore_mac(interface),
+                description="MAC change",
+            ))
+
+        if "vpn" in layers:
+            steps += [
+                Step("vpn", lambda: self.vpn.connect(cancel), requires=after_mac,
+                     rollback=self.vpn.disconnect, description="VPN connection"),
+                Step("mtu", self._tune_mtu, requires=("vpn",), description="MTU tuning"),
+            ]
+
+        if "tor" in layers:
+            rotation_requires = ("tor_service", "vpn") if "vpn" in layers else ("tor_service",)
+            steps += [
+                Step("tor_service", lambda: self.tor.start_service(cancel),
+                     requires=after_mac,
+                     rollback=self.tor.stop_service, description="TOR setup"),
+                Step("tor_rotation", self.tor.start_ip_rotation,
+                     requires=rotation_requires,
+                     rollback=self.tor.stop_ip_rotation, description="TOR setup"),
+            ]
+        return steps
+
+    def _provision(self, layers: frozenset[str]) -> tuple[bool, str]:
+        """Install whatever the layers need in one package-manager transaction."""
+        return provision(
+            requirements_for(layers, vpn_provider=self.vpn.provider,
+                             wireguard_backend=self.vpn.wireguard_backend),
+            progress=self._log,
+        )
+
+    def _tune_mtu(self) -> tuple[bool, str]:
+        """MTU tuning is best-effort and never fails the start."""
+        if not self.vpn.auto_mtu:
+            return True, "MTU tuning disabled"
+        success, message = self.vpn.tune_mtu()
+        return True, message if success else f"skipped ({message})"
+
+    def _on_step(self, step: Step, success: bool, message: str) -> None:
+        """Log pipeline progress."""
+        self.events.publish(StepProgress(step.name, step.label, success, message))
+        if success:
+            self._log(f"{step.label}: {message}")
+
+    @traced("orchestrator.stop")
     def stop(self) -> tuple[bool, str]:
         """Stop anonymization and restore original settings.
 
@@ -142,35 +400,67 @@ class Orchestrator:
             return False, "Anonymization is not active"
 
         self._log("Stopping anonymization...")
-        self._cleanup()
+        report = self._cleanup()
         self._is_active = False
         self._current_mode = None
+        self.events.publish(ModeChanged(None, active=False))
+        if not report.success:
+            problems = "; ".join(report.problems)
+            self._log(f"Settings not fully restored: {problems}")
+            return False, f"Anonymization stopped, but not fully restored: {problems}"
         self._log("All settings restored")
         return True, "Anonymization stopped"
 
-    def _cleanup(self) -> None:
-        """Restore all services to original state (thread-safe)."""
-        with self._cleanup_lock:
-            # Stop TOR
-            if self.tor.is_running:
-                self._log("Stopping TOR...")
-                success, message = self.tor.stop_full()
-                if not success:
-                    self._log(f"TOR stop warning: {message}")
+    def _plan_stop(self, layers: frozenset[str] = frozenset({"mac", "vpn", "tor"})) -> list[Step]:
+        """Build the teardown steps for whatever is currently up.
 
-            # Disconnect VPN
-            if self.vpn.is_connected:
-                self._log("Disconnecting VPN...")
-                success, message = self.vpn.disconnect()
-                if not success:
-                    self._log(f"VPN disconnect warning: {message}")
+        MAC restore goes first: it is purely local and is the one change
+        that survives a crash if we run out of time.
 
-            # Restore MAC
-            if self._current_interface:
-                self._log("Restoring MAC...")
-                success, message = self.mac.restore_mac(self._current_interface)
-                if not success:
-                    self._log(f"MAC restore warning: {message}")
+        Args:
+            layers: Layers to tear down; others are left alone.
+        """
+        steps: list[Step] = []
+        if "mac" in layers and self._current_interface:
+            interface = self._current_interface
+            steps.append(Step("mac", lambda: self.mac.restore_mac(interface),
+                              description="MAC restore", budget=3.0))
+        if "tor" in layers and self.tor.is_running:
+            steps.append(Step("tor", self.tor.stop_full, description="TOR stop", budget=4.0))
+        if "vpn" in layers and self.vpn.is_connected:
+            steps.append(Step("vpn", self.vpn.disconnect,
+                              description="VPN disconnect", budget=4.0))
+        return steps
+
+    @traced("orchestrator.cleanup")
+    def _cleanup(self) -> TeardownReport:
+        """Restore all services to original state (thread-safe).
+
+        Independent teardowns run concurrently under ``stop_deadline``
+        seconds, so the worst-case stop time is bounded.
+        """
+        with self._cleanup_lock:
+            # Stop the supervisor so it does not reconnect during teardown
+            self._stop_supervisor()
+
+            steps = self._plan_stop()
+            for step in steps:
+                self._log(f"{step.label}...")
+            report = run_teardown(steps, deadline=self.stop_deadline,
+                                  on_step=self._on_teardown_step)
+
+            for name in report.unfinished:
+                self._log(f"{name} teardown did not finish within {self.stop_deadline:.0f}s")
+            by_name = {step.name: step for step in steps}
+            for name in report.overrun:
+                step = by_name[name]
+                self._log(f"{step.label} exceeded its {step.budget:.0f}s budget")
+            logger.info("Teardown finished in %.2fs", report.elapsed)
+            return report
+
+    def _on_teardown_step(self, step: Step, success: bool, message: str) -> None:
+        if not success:
+            self._log(f"{step.label} warning: {message}")
 
     def _install_handlers(self) -> None:
         """Install atexit and signal handlers for crash recovery."""
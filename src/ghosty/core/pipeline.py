@@ -0,0 +1,257 @@
+"""Dependency-driven step execution for starting and stopping layers."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+from ghosty.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Step:
+    """One unit of work in a pipeline.
+
+    ``action`` returns a (success, message) tuple like the managers do.
+    ``rollback`` undoes a completed step when a later step fails.
+    """
+
+    name: str
+    action: Callable[[], tuple[bool, str]]
+    requires: tuple[str, ...] = ()
+    rollback: Callable[[], object] | None = None
+    description: str = ""
+    budget: float | None = None  # Expected worst-case seconds (teardown reporting)
+
+    @property
+    def label(self) -> str:
+        return self.description or self.name
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run."""
+
+    success: bool
+    message: str
+    completed: list[str] = field(default_factory=list)
+    failed: str | None = None
+    durations: dict[str, float] = field(default_factory=dict)
+
+
+def _validate(steps: list[Step]) -> None:
+    """Reject unknown dependencies and cycles."""
+    by_name = {step.name: step for step in steps}
+    if len(by_name) != len(steps):
+        raise ValueError("Duplicate step names in pipeline")
+    for step in steps:
+        for dep in step.requires:
+            if dep not in by_name:
+                raise ValueError(f"Step {step.name} requires unknown step {dep}")
+
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def _visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through step {name}")
+        visiting.add(name)
+        for dep in by_name[name].requires:
+            _visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for step in steps:
+        _visit(step.name)
+
+
+def run_pipeline(
+    steps: list[Step],
+    *,
+    max_workers: int = 4,
+    cancel: threading.Event | None = None,
+    on_step: Callable[[Step, bool, str], None] | None = None,
+) -> PipelineResult:
+    """Run steps concurrently as soon as their requirements have completed.
+
+    On the first failure ``cancel`` is set, no further steps are started,
+    running steps are awaited and every completed step is rolled back in
+    reverse completion order (dependents before their dependencies).
+
+    Args:
+        steps: Steps to run; ``requires`` names must refer to other steps.
+        max_workers: Upper bound on concurrently running steps.
+        cancel: Event set on failure; long-running actions may watch it.
+            Setting it from outside aborts the run the same way.
+        on_step: Called after each step finishes with (step, success, message).
+
+    Returns:
+        PipelineResult describing what ran and what failed.
+    """
+    _validate(steps)
+    cancel = cancel or threading.Event()
+    pending = {step.name: step for step in steps}
+    running: dict[Future[tuple[bool, str]], Step] = {}
+    started: dict[str, float] = {}
+    result = PipelineResult(success=True, message="")
+
+    def _run(step: Step) -> tuple[bool, str]:
+        with span(f"step:{step.name}") as sp:
+            try:
+                success, message = step.action()
+            except Exception as e:
+                logger.exception("Step %s raised", step.name)
+                success, message = False, str(e)
+            sp.set(success=success, message=message)
+            return success, message
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ghosty-step") as pool:
+        while pending or running:
+            if not cancel.is_set():
+                for name, step in list(pending.items()):
+                    if all(dep in result.completed for dep in step.requires):
+                        del pending[name]
+                        started[name] = time.monotonic()
+                        running[pool.submit(_run, step)] = step
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                success, message = future.result()
+                result.durations[step.name] = time.monotonic() - started[step.name]
+                logger.debug("Step %s finished in %.2fs: %s",
+                             step.name, result.durations[step.name], message)
+                if on_step:
+                    on_step(step, success, message)
+
+                if success:
+                    result.completed.append(step.name)
+                elif result.failed is None:
+                    result.success = False
+                    result.failed = step.name
+                    result.message = f"{step.label} failed: {message}"
+                    cancel.set()
+
+    if result.success and cancel.is_set():
+        result.success = False
+        result.message = "Cancelled"
+
+    if not result.success:
+        _rollback(steps, result.completed)
+    return result
+
+
+def _rollback(steps: list[Step], completed: list[str]) -> None:
+    """Undo completed steps, newest first."""
+    by_name = {step.name: step for step in steps}
+    for name in reversed(completed):
+        step = by_name[name]
+        if step.rollback is None:
+            continue
+        try:
+            logger.info("Rolling back %s", step.label)
+            step.rollback()
+        except Exception:
+            logger.exception("Rollback of %s failed", step.name)
+
+
+@dataclass
+class TeardownReport:
+    """Outcome of a bounded teardown."""
+
+    elapsed: float
+    completed: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    overrun: list[str] = field(default_factory=list)  # Exceeded their own budget
+    unfinished: list[str] = field(default_factory=list)  # Still running at the deadline
+    labels: dict[str, str] = field(default_factory=dict, repr=False)  # Step name -> label
+
+    @property
+    def success(self) -> bool:
+        return not self.failed and not self.unfinished
+
+    @property
+    def problems(self) -> list[str]:
+        """Failed and unfinished steps, by label, for user-facing messages."""
+        return [
+            *(f"{self.labels.get(name, name)} failed: {message}"
+              for name, message in self.failed.items()),
+            *(f"{self.labels.get(name, name)} did not finish" for name in self.unfinished),
+        ]
+
+
+def run_teardown(
+    steps: list[Step],
+    *,
+    deadline: float,
+    on_step: Callable[[Step, bool, str], None] | None = None,
+) -> TeardownReport:
+    """Run teardown steps concurrently under one global deadline.
+
+    Steps are started in list order, so put the most important first. A
+    step waits only for the steps named in its ``requires``. Steps still
+    running when the deadline passes are abandoned (they run on daemon
+    threads) and reported as unfinished, which bounds the worst-case stop
+    time regardless of individual timeouts.
+
+    Returns:
+        TeardownReport with per-step outcomes and budget overruns.
+    """
+    _validate(steps)
+    start = time.monotonic()
+    end = start + deadline
+    done = {step.name: threading.Event() for step in steps}
+    outcomes: dict[str, tuple[bool, str, float]] = {}
+
+    def _run(step: Step) -> None:
+        try:
+            for dep in step.requires:
+                done[dep].wait(max(0.0, end - time.monotonic()))
+            step_start = time.monotonic()
+            with span(f"teardown:{step.name}") as sp:
+                try:
+                    success, message = step.action()
+                except Exception as e:
+                    logger.exception("Teardown step %s raised", step.name)
+                    success, message = False, str(e)
+                sp.set(success=success, message=message)
+            outcomes[step.name] = (success, message, time.monotonic() - step_start)
+            if on_step:
+                on_step(step, success, message)
+        finally:
+            done[step.name].set()
+
+    for step in steps:
+        threading.Thread(target=_run, args=(step,), daemon=True,
+                         name=f"ghosty-stop-{step.name}").start()
+
+    for step in steps:
+        done[step.name].wait(max(0.0, end - time.monotonic()))
+
+    report = TeardownReport(elapsed=time.monotonic() - start,
+                            labels={step.name: step.label for step in steps})
+    for step in steps:
+        if step.name not in outcomes:
+            report.unfinished.append(step.name)
+            if step.budget is not None:
+                report.overrun.append(step.name)
+            continue
+        success, message, duration = outcomes[step.name]
+        if success:
+            report.completed.append(step.name)
+        else:
+            report.failed[step.name] = message
+        if step.budget is not None and duration > step.budget:
+            report.overrun.append(step.name)
+    return report
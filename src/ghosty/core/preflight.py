@@ -0,0 +1,262 @@
+"""Preflight — cached discovery of what this host can do.
+
+Facts that need a subprocess or module lookup (distro, OpenVPN version,
+kernel module availability, whether systemd manages tor) are probed
+concurrently on first run and stored in ``~/.config/ghosty/preflight.json``
+together with a fingerprint of what they depend on: binary paths and
+mtimes, the kernel release, the module index and ``/etc/os-release``. On
+later runs only probes whose inputs changed are repeated; the fingerprint
+itself costs a handful of ``stat`` calls. Expensive, opt-in measurements
+(``measured``) live in the same file but run only when first asked for.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from ghosty.utils.platform import DistroInfo, PackageManager, detect_distro
+from ghosty.utils.process import run_command
+
+logger = logging.getLogger(__name__)
+
+_CACHE_FILE = Path.home() / ".config" / "ghosty" / "preflight.json"
+_CACHE_VERSION = 1
+
+BINARIES = (
+    "ip", "macchanger", "openvpn", "wg", "wg-quick", "tor", "systemctl",
+    "nft", "resolvconf", "modprobe", "ping", "openssl",
+)
+
+
+def _stat_key(path: str | Path) -> str:
+    """Identify a file version by path, size and mtime; empty when missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    return f"{path}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def fingerprint() -> dict[str, str]:
+    """Cheap snapshot of everything the cached probes depend on."""
+    release = os.uname().release
+    prints = {
+        "kernel": release,
+        "os_release": _stat_key("/etc/os-release"),
+        "modules": _stat_key(f"/lib/modules/{release}/modules.dep"),
+    }
+    for name in BINARIES:
+        path = shutil.which(name)
+        prints[f"bin:{name}"] = _stat_key(path) if path else ""
+    return prints
+
+
+def _probe_distro() -> dict[str, str]:
+    info = detect_distro()
+    return {
+        "id": info.id, "name": info.name, "version": info.version,
+        "package_manager": info.package_manager.value,
+    }
+
+
+def _probe_openvpn_version() -> list[int] | None:
+    from ghosty.core.cipher import openvpn_version
+
+    version = openvpn_version() if shutil.which("openvpn") else None
+    return list(version) if version else None
+
+
+def _probe_tor_systemd() -> bool:
+    if not shutil.which("systemctl"):
+        return False
+    result = run_command(["systemctl", "list-unit-files", "tor.service", "--no-legend"],
+                         timeout=5)
+    return result.success and "tor.service" in result.stdout
+
+
+def _module_probe(module: str) -> Callable[[], bool]:
+    def _probe() -> bool:
+        if Path(f"/sys/module/{module}").exists():
+            return True
+        return run_command(["modprobe", "-n", module], timeout=5).success
+    return _probe
+
+
+@dataclass(frozen=True)
+class _Probe:
+    func: Callable[[], Any]
+    depends: tuple[str, ...]  # Fingerprint keys that invalidate the result
+
+
+_PROBES: dict[str, _Probe] = {
+    "distro": _Probe(_probe_distro, ("os_release",)),
+    "openvpn_version": _Probe(_probe_openvpn_version, ("bin:openvpn",)),
+    "tor_systemd": _Probe(_probe_tor_systemd, ("bin:systemctl", "bin:tor")),
+    "dco_module": _Probe(_module_probe("ovpn_dco_v2"), ("kernel", "modules")),
+    "wireguard_module": _Probe(_module_probe("wireguard"), ("kernel", "modules")),
+}
+
+
+@dataclass
+class Capabilities:
+    """Snapshot of host capabilities."""
+
+    binaries: dict[str, str]  # Name -> resolved path ("" when missing)
+    distro: DistroInfo
+    openvpn_version: tuple[int, int] | None
+    tor_systemd: bool
+    dco_module: bool
+    wireguard_module: bool
+    tun_device: bool
+    reprobed: list[str] = field(default_factory=list)  # Probes run for this snapshot
+
+    def has(self, binary: str) -> bool:
+        return bool(self.binaries.get(binary))
+
+
+def _stale(name: str, cached: dict[str, Any], prints: dict[str, str]) -> bool:
+    if name not in cached.get("facts", {}):
+        return True
+    old = cached.get("fingerprint", {})
+    return any(old.get(key) != prints.get(key) for key in _PROBES[name].depends)
+
+
+def collect(cached: dict[str, Any] | None = None) -> tuple[dict[str, Any], list[str]]:
+    """Re-run the probes whose inputs changed since ``cached``.
+
+    Returns:
+        (cache document, names of the probes that ran).
+    """
+    cached = cached if cached and cached.get("version") == _CACHE_VERSION else {}
+    prints = fingerprint()
+    facts = dict(cached.get("facts", {}))
+    stale = [name for name in _PROBES if _stale(name, cached, prints)]
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=len(stale),
+                                thread_name_prefix="ghosty-preflight") as pool:
+            futures = {name: pool.submit(_PROBES[name].func) for name in stale}
+            for name, future in futures.items():
+                try:
+                    facts[name] = future.result()
+                except Exception:
+                    logger.exception("Preflight probe %s failed", name)
+                    facts.pop(name, None)
+
+    document = {"version": _CACHE_VERSION, "fingerprint": prints, "facts": facts}
+    if cached.get("measurements"):
+        document["measurements"] = cached["measurements"]
+    return document, stale
+
+
+def _from_document(document: dict[str, Any], reprobed: list[str]) -> Capabilities:
+    facts = document["facts"]
+    prints = document["fingerprint"]
+    distro = facts.get("distro") or {}
+    version = facts.get("openvpn_version")
+    return Capabilities(
+        binaries={name: prints[f"bin:{name}"].rsplit(":", 2)[0] for name in BINARIES},
+        distro=DistroInfo(
+            id=distro.get("id", "unknown"),
+            name=distro.get("name", "Unknown Linux"),
+            version=distro.get("version", ""),
+            package_manager=PackageManager(distro.get("package_manager", "unknown")),
+        ),
+        openvpn_version=(version[0], version[1]) if version else None,
+        tor_systemd=bool(facts.get("tor_systemd")),
+        dco_module=bool(facts.get("dco_module")),
+        wireguard_module=bool(facts.get("wireguard_module")),
+        tun_device=Path("/dev/net/tun").exists(),
+        reprobed=reprobed,
+    )
+
+
+def _read(cache_file: Path) -> dict[str, Any] | None:
+    try:
+        document = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return None
+    return document if isinstance(document, dict) else None
+
+
+def _write(cache_file: Path, document: dict[str, Any]) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(document, indent=2))
+        tmp.replace(cache_file)
+    except OSError:
+        logger.warning("Could not write preflight cache to %s", cache_file)
+
+
+def load(cache_file: Path = _CACHE_FILE) -> Capabilities:
+    """Load cached capabilities, revalidating and persisting what changed."""
+    start = time.monotonic()
+    with _file_lock:
+        document, reprobed = collect(_read(cache_file))
+        if reprobed:
+            _write(cache_file, document)
+
+    logger.info("Preflight in %.0f ms (probed: %s)", (time.monotonic() - start) * 1000,
+                ", ".join(reprobed) or "none")
+    return _from_document(document, reprobed)
+
+
+def measured(
+    name: str,
+    depends: tuple[str, ...],
+    func: Callable[[], Any],
+    cache_file: Path = _CACHE_FILE,
+) -> Any:
+    """Result of an expensive measurement, cached until ``depends`` change.
+
+    Unlike the probes, ``func`` runs only when a caller asks for ``name``;
+    it is repeated only when one of the fingerprint keys in ``depends``
+    (e.g. ``"bin:openssl"``) changes.
+    """
+    prints = fingerprint()
+    key = {dep: prints.get(dep, "") for dep in depends}
+    with _file_lock:
+        cached = _read(cache_file) or {}
+    entry = cached.get("measurements", {}).get(name)
+    if cached.get("version") == _CACHE_VERSION and entry and entry.get("depends") == key:
+        return entry["value"]
+
+    value = func()
+    with _file_lock:
+        document = _read(cache_file) or {}
+        if document.get("version") != _CACHE_VERSION:
+            document = {"version": _CACHE_VERSION}
+        document.setdefault("measurements", {})[name] = {"depends": key, "value": value}
+        _write(cache_file, document)
+    return value
+
+
+_current: Capabilities | None = None
+_lock = threading.Lock()
+_file_lock = threading.Lock()  # Serializes cache file rewrites
+
+
+def capabilities() -> Capabilities:
+    """Return this process's capabilities, loading them on first use."""
+    global _current  # noqa: PLW0603
+    with _lock:
+        if _current is None:
+            _current = load()
+        return _current
+
+
+def invalidate() -> None:
+    """Forget the in-memory snapshot, e.g. after installing packages."""
+    global _current  # noqa: PLW0603
+    with _lock:
+        _current = None
@@ -0,0 +1,199 @@
+"""Profiles — named launch setups, compiled once into ready-to-run plans.
+
+A ``[profiles.<name>]`` table picks a mode, interface, VPN config and TOR
+rotation rate, inheriting anything it leaves empty from the top-level
+settings. ``compile_profile`` checks a profile and resolves it into a
+``LaunchPlan``: absolute paths, the mode, the chosen backends and the
+parsed VPN config (endpoint and, for WireGuard, the whole file), so
+``launch`` does no parsing or validation. ``PlanCache`` keeps each plan
+until the profile, a setting it inherits, or a file it read changes;
+checking that costs one ``stat`` per file.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from ghosty.config import GhostyConfig
+from ghosty.core.orchestrator import AnonymizationMode, Orchestrator, parse_mode
+from ghosty.core.vpn import ParsedVPNConfig, parse_vpn_config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LaunchPlan:
+    """Everything ``Orchestrator.start`` needs for one profile, pre-resolved."""
+
+    name: str
+    mode: AnonymizationMode
+    interface: str
+    provider: str
+    wireguard_backend: str
+    rotation_interval: int
+    vpn_config: str = ""  # Absolute; empty for modes without VPN
+    vpn_auth: str | None = None
+    vpn_fallbacks: tuple[str, ...] = ()
+    vpn_parsed: ParsedVPNConfig | None = None
+    sources: tuple[tuple[str, int], ...] = ()  # (path, mtime_ns) of every file checked
+
+    @property
+    def stale(self) -> bool:
+        """Whether a file the plan was compiled from has changed since."""
+        return any(_mtime(path) != mtime for path, mtime in self.sources)
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _absolute(path: str) -> str:
+    return str(Path(path).expanduser().resolve()) if path else ""
+
+
+def compile_profile(name: str, config: GhostyConfig) -> LaunchPlan:
+    """Check profile ``name`` and resolve it into a launch plan.
+
+    Raises:
+        ValueError: If there is no such profile, or listing everything
+            wrong with it.
+    """
+    profile = config.profiles.get(name)
+    if profile is None:
+        choices = ", ".join(sorted(config.profiles)) or "none configured"
+        raise ValueError(f"Unknown profile {name!r} ({choices})")
+
+    errors: list[str] = []
+    try:
+        mode = parse_mode(profile.mode or config.general.default_mode)
+    except ValueError as e:
+        errors.append(str(e))
+        mode = AnonymizationMode.NORMAL
+    interface = profile.interface or config.general.default_interface
+    if not interface:
+        errors.append("no interface (set interface or general.default_interface)")
+    provider = profile.provider or config.vpn.provider
+    plan = LaunchPlan(
+        name=name,
+        mode=mode,
+        interface=interface,
+        provider=provider,
+        wireguard_backend=profile.wireguard_backend or config.vpn.wireguard_backend,
+        rotation_interval=profile.rotation_interval or config.tor.rotation_interval,
+    )
+
+    if "vpn" in mode.layers:
+        vpn_config = _absolute(profile.vpn_config or config.vpn.config_path)
+        vpn_auth = _absolute(profile.vpn_auth or config.vpn.auth_path)
+        fallbacks = tuple(_absolute(path) for path in
+                          profile.fallback_configs or config.vpn.fallback_configs)
+        # Taken before reading, so an edit made while compiling marks the plan stale
+        sources = tuple((path, _mtime(path)) for path in (vpn_config, vpn_auth, *fallbacks)
+                        if path)
+
+        parsed = None
+        if not vpn_config:
+            errors.append(f"{mode.value} mode needs a VPN config")
+        else:
+            try:
+                parsed = parse_vpn_config(vpn_config, provider)
+            except (OSError, ValueError) as e:
+                errors.append(f"VPN config {vpn_config}: {e}")
+        mtimes = dict(sources)
+        for path in (vpn_auth, *fallbacks):
+            if path and mtimes[path] < 0:
+                errors.append(f"{path} not found")
+        plan = replace(plan, vpn_config=vpn_config, vpn_auth=vpn_auth or None,
+                       vpn_fallbacks=fallbacks, vpn_parsed=parsed, sources=sources)
+
+    if errors:
+        raise ValueError(f"Profile {name}: " + "; ".join(errors))
+    return plan
+
+
+def _inputs(name: str, config: GhostyConfig) -> tuple[Any, ...]:
+    """The settings a profile's plan is compiled from (deep copies)."""
+    profile = config.profiles.get(name)
+    return (
+        asdict(profile) if profile is not None else None,
+        config.general.default_mode,
+        config.general.default_interface,
+        asdict(config.vpn),
+        config.tor.rotation_interval,
+    )
+
+
+class PlanCache:
+    """Compiled plans, reused until their inputs change. Thread-safe."""
+
+    def __init__(self) -> None:
+        self._plans: dict[str, tuple[tuple[Any, ...], LaunchPlan]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, config: GhostyConfig) -> LaunchPlan:
+        """The plan for profile ``name``, compiled only if not cached or outdated.
+
+        Raises:
+            ValueError: As ``compile_profile``.
+        """
+        inputs = _inputs(name, config)
+        with self._lock:
+            cached = self._plans.get(name)
+        if cached is not None and cached[0] == inputs and not cached[1].stale:
+            return cached[1]
+        plan = compile_profile(name, config)
+        with self._lock:
+            self._plans[name] = (inputs, plan)
+        return plan
+
+    def compile_all(self, config: GhostyConfig) -> dict[str, str]:
+        """Compile every profile now, so the first start of each is warm.
+
+        Returns:
+            Error message per profile that failed to compile.
+        """
+        with self._lock:
+            for name in set(self._plans) - set(config.profiles):
+                del self._plans[name]
+        errors: dict[str, str] = {}
+        for name in config.profiles:
+            try:
+                self.get(name, config)
+            except ValueError as e:
+                logger.warning("%s", e)
+                errors[name] = str(e)
+        return errors
+
+
+def launch(
+    orchestrator: Orchestrator, plan: LaunchPlan, *, cancel: threading.Event | None = None
+) -> tuple[bool, str]:
+    """Start ``plan`` on ``orchestrator``.
+
+    The plan's backends and rotation interval are set on the managers
+    first; they stay in effect until the config is applied again, which
+    the daemon does before every start (this one included, before the
+    plan's own values are set).
+
+    Returns:
+        (success, message) tuple.
+    """
+    if orchestrator.is_active:
+        return False, "Anonymization is already active"
+    orchestrator.vpn.provider = plan.provider
+    orchestrator.vpn.wireguard_backend = plan.wireguard_backend
+    orchestrator.tor.set_rotation_interval(plan.rotation_interval)
+    return orchestrator.start(
+        plan.mode, plan.interface,
+        vpn_config=plan.vpn_config, vpn_auth=plan.vpn_auth,
+        vpn_fallbacks=list(plan.vpn_fallbacks), vpn_parsed=plan.vpn_parsed,
+        cancel=cancel,
+    )
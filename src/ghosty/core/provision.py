@@ -0,0 +1,150 @@
+"""Dependency provisioning — one package-manager transaction per start.
+
+The distro is detected once per process. Everything the chosen layers need
+is checked up front; missing system packages are installed together with
+the detected package manager, and missing Python packages with one pip call.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from ghosty.core import preflight
+from ghosty.utils.platform import DistroInfo, PackageManager, get_install_command
+from ghosty.utils.process import is_available, run_command
+
+logger = logging.getLogger(__name__)
+
+_INSTALL_TIMEOUT = 600
+
+
+@dataclass(frozen=True)
+class Requirement:
+    """Something a layer needs: a binary from a system package or a Python module."""
+
+    name: str
+    binary: str = ""
+    module: str = ""
+    package: str = ""  # System package, or pip distribution for modules
+
+    def present(self) -> bool:
+        if self.module:
+            return importlib.util.find_spec(self.module) is not None
+        return is_available(self.binary)
+
+
+REQUIREMENTS: dict[str, Requirement] = {
+    req.name: req
+    for req in (
+        Requirement("macchanger", binary="macchanger", package="macchanger"),
+        Requirement("openvpn", binary="openvpn", package="openvpn"),
+        Requirement("wg", binary="wg", package="wireguard-tools"),
+        Requirement("wg-quick", binary="wg-quick", package="wireguard-tools"),
+        Requirement("tor", binary="tor", package="tor"),
+        Requirement("stem", module="stem", package="stem"),
+        Requirement("tornet-mp", module="tornet_mp", package="tornet-mp"),
+    )
+}
+
+
+def requirements_for(
+    layers: Iterable[str],
+    *,
+    vpn_provider: str = "openvpn",
+    wireguard_backend: str = "native",
+) -> list[Requirement]:
+    """Return the requirements of the given layers ("mac", "vpn", "tor")."""
+    layers = set(layers)
+    names: list[str] = []
+    if "mac" in layers:
+        names.append("macchanger")
+    if "vpn" in layers:
+        if vpn_provider == "wireguard":
+            names += ["wg", "wg-quick"] if wireguard_backend == "wg-quick" else ["wg"]
+        else:
+            names.append("openvpn")
+    if "tor" in layers:
+        names += ["tor", "stem", "tornet-mp"]
+    return [REQUIREMENTS[name] for name in names]
+
+
+def distro() -> DistroInfo:
+    """The distribution, detected once and cached by preflight."""
+    return preflight.capabilities().distro
+
+
+def provision(
+    requirements: Iterable[Requirement],
+    *,
+    progress: Callable[[str], None] | None = None,
+) -> tuple[bool, str]:
+    """Install every missing requirement in as few transactions as possible.
+
+    Args:
+        requirements: What must be present afterwards.
+        progress: Called with human-readable progress messages.
+
+    Returns:
+        (success, message) tuple.
+    """
+    report = progress or (lambda message: None)
+    start = time.monotonic()
+    missing = [req for req in dict.fromkeys(requirements) if not req.present()]
+    if not missing:
+        return True, "All dependencies present"
+
+    system = [req for req in missing if not req.module]
+    python = [req for req in missing if req.module]
+    report(f"Missing: {', '.join(req.name for req in missing)}")
+
+    if system:
+        success, message = _install_system(system, report)
+        preflight.invalidate()
+        if not success:
+            return False, message
+
+    if python:
+        packages = list(dict.fromkeys(req.package for req in python))
+        report(f"Installing Python packages: {' '.join(packages)}")
+        result = run_command([sys.executable, "-m", "pip", "install", *packages],
+                             timeout=_INSTALL_TIMEOUT)
+        if not result.success:
+            return False, f"pip install failed: {result.stderr}"
+        importlib.invalidate_caches()
+
+    still_missing = [req.name for req in missing if not req.present()]
+    if still_missing:
+        return False, f"Still missing after install: {', '.join(still_missing)}"
+
+    names = ", ".join(req.name for req in missing)
+    message = f"Installed {names} ({time.monotonic() - start:.1f}s)"
+    report(message)
+    return True, message
+
+
+def _install_system(
+    requirements: list[Requirement], report: Callable[[str], None]
+) -> tuple[bool, str]:
+    """Install system packages with one package-manager transaction."""
+    info = distro()
+    pm = info.package_manager
+    packages = list(dict.fromkeys(req.package for req in requirements))
+    cmd = get_install_command(pm, packages)
+    if cmd is None:
+        return False, f"Unknown package manager; install manually: {' '.join(packages)}"
+
+    report(f"Installing {' '.join(packages)} with {pm.value}")
+    result = run_command(cmd, timeout=_INSTALL_TIMEOUT)
+    if not result.success and pm is PackageManager.APT:
+        # Fresh images often ship without package lists
+        report("Refreshing apt package lists")
+        run_command(["sudo", "apt-get", "update"], timeout=_INSTALL_TIMEOUT)
+        result = run_command(cmd, timeout=_INSTALL_TIMEOUT)
+    if not result.success:
+        return False, f"{pm.value} install of {' '.join(packages)} failed: {result.stderr}"
+    return True, f"Installed {' '.join(packages)}"
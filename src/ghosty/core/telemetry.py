@@ -0,0 +1,216 @@
+"""Tunnel telemetry — throughput, errors, handshake age and latency from sysfs."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+
+from ghosty.utils.process import run_command
+from ghosty.utils.ringbuffer import RingBuffer
+
+logger = logging.getLogger(__name__)
+
+_COUNTERS = ("rx_bytes", "tx_bytes", "rx_packets", "tx_packets", "rx_errors", "tx_errors")
+SERIES = ("rx_rate", "tx_rate", "rx_pps", "tx_pps", "errors", "handshake_age", "latency")
+
+
+def tcp_probe(interface: str, host: str, port: int, timeout: float) -> float | None:
+    """Time a TCP connect bound to ``interface``.
+
+    Returns:
+        Connect time in milliseconds, or None if the probe failed.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BINDTODEVICE, interface.encode())
+            sock.settimeout(timeout)
+            start = time.monotonic()
+            sock.connect((host, port))
+            return (time.monotonic() - start) * 1000
+    except OSError:
+        return None
+
+
+def format_rate(bytes_per_second: float | None) -> str:
+    """Format a byte rate for display (e.g. "1.2 MB/s")."""
+    if bytes_per_second is None:
+        return "—"
+    value = float(bytes_per_second)
+    for unit in ("B/s", "kB/s", "MB/s", "GB/s"):
+        if value < 1000 or unit == "GB/s":
+            return f"{value:.0f} {unit}" if unit == "B/s" else f"{value:.1f} {unit}"
+        value /= 1000
+    return f"{value:.1f} GB/s"
+
+
+@dataclass(frozen=True)
+class TelemetrySnapshot:
+    """Point-in-time summary of tunnel telemetry."""
+
+    interface: str
+    samples: int
+    rx_rate: float | None
+    tx_rate: float | None
+    rx_avg: float | None
+    tx_avg: float | None
+    rx_p95: float | None
+    tx_p95: float | None
+    errors: float
+    handshake_age: float | None
+    latency: float | None
+    latency_p95: float | None
+
+
+@dataclass
+class TelemetrySampler:
+    """Samples interface counters at a fixed rate into fixed-size ring buffers.
+
+    Memory use is constant: each series is a preallocated ``RingBuffer`` of
+    ``capacity`` samples. Counter files are kept open and re-read with
+    ``pread`` so a sample costs a handful of syscalls and no allocations
+    beyond the parsed integers.
+    """
+
+    interface: str
+    interval: float = 1.0
+    capacity: int = 3600
+    wireguard: bool = False
+    handshake_every: int = 5  # Samples between `wg show` calls
+    probe_host: str = ""  # TCP latency probe target through the tunnel
+    probe_port: int = 443
+    probe_every: int = 5
+
+    series: dict[str, RingBuffer] = field(init=False, repr=False)
+    _fds: dict[str, int] = field(default_factory=dict, repr=False)
+    _last: dict[str, int] = field(default_factory=dict, repr=False)
+    _last_time: float = field(default=0.0, repr=False)
+    _tick: int = field(default=0, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, repr=False)
+    _thread: threading.Thread | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        self.series = {name: RingBuffer(self.capacity) for name in SERIES}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info("Telemetry sampling %s every %.1fs", self.interface, self.interval)
+
+    def stop(self) -> None:
+        """Stop sampling and release counter file descriptors."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+        self._close()
+
+    def _run(self) -> None:
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception:
+                logger.exception("Telemetry sample failed for %s", self.interface)
+            # Fixed-rate schedule that does not drift with sample cost
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+    def _read_counter(self, name: str) -> int | None:
+        fd = self._fds.get(name)
+        try:
+            if fd is None:
+                path = f"/sys/class/net/{self.interface}/statistics/{name}"
+                fd = self._fds[name] = os.open(path, os.O_RDONLY)
+            return int(os.pread(fd, 32, 0))
+        except (OSError, ValueError):
+            # Interface gone or recreated; reopen on the next sample
+            if name in self._fds:
+                os.close(self._fds.pop(name))
+            return None
+
+    def _close(self) -> None:
+        for fd in self._fds.values():
+            with contextlib.suppress(OSError):
+                os.close(fd)
+        self._fds.clear()
+
+    def _handshake_age(self) -> float | None:
+        result = run_command(["wg", "show", self.interface, "latest-handshakes"], timeout=5)
+        if not result.success:
+            return None
+        stamps = [int(parts[1]) for parts in map(str.split, result.stdout.splitlines())
+                  if len(parts) == 2 and parts[1].isdigit() and parts[1] != "0"]
+        return time.time() - max(stamps) if stamps else None
+
+    def sample(self) -> None:
+        """Take one sample and append derived rates to the series."""
+        now = time.monotonic()
+        counters = {name: self._read_counter(name) for name in _COUNTERS}
+        elapsed = now - self._last_time if self._last_time else 0.0
+
+        if elapsed > 0 and self._last:
+            def _delta(name: str) -> float:
+                current, previous = counters[name], self._last.get(name)
+                if current is None or previous is None or current < previous:
+                    return 0.0
+                return float(current - previous)
+
+            self.series["rx_rate"].append(_delta("rx_bytes") / elapsed)
+            self.series["tx_rate"].append(_delta("tx_bytes") / elapsed)
+            self.series["rx_pps"].append(_delta("rx_packets") / elapsed)
+            self.series["tx_pps"].append(_delta("tx_packets") / elapsed)
+            self.series["errors"].append(_delta("rx_errors") + _delta("tx_errors"))
+
+        if self.wireguard and self._tick % self.handshake_every == 0:
+            age = self._handshake_age()
+            if age is not None:
+                self.series["handshake_age"].append(age)
+
+        if self.probe_host and self._tick % self.probe_every == 0:
+            rtt = tcp_probe(self.interface, self.probe_host, self.probe_port, self.interval)
+            if rtt is not None:
+                self.series["latency"].append(rtt)
+
+        self._last = {name: value for name, value in counters.items() if value is not None}
+        self._last_time = now
+        self._tick += 1
+
+    def values(self, name: str, n: int | None = None) -> list[float]:
+        """Return the newest ``n`` samples of a series, oldest first."""
+        return self.series[name].values(n)
+
+    def snapshot(self, window: int = 60) -> TelemetrySnapshot:
+        """Summarize the last ``window`` samples."""
+        rx, tx = self.series["rx_rate"], self.series["tx_rate"]
+        latency = self.series["latency"]
+        return TelemetrySnapshot(
+            interface=self.interface,
+            samples=len(rx),
+            rx_rate=rx.latest(),
+            tx_rate=tx.latest(),
+            rx_avg=rx.mean(window),
+            tx_avg=tx.mean(window),
+            rx_p95=rx.percentile(95, window),
+            tx_p95=tx.percentile(95, window),
+            errors=sum(self.series["errors"].values(window)),
+            handshake_age=self.series["handshake_age"].latest(),
+            latency=latency.latest(),
+            latency_p95=latency.percentile(95, window),
+        )
@@ -2,85 +2,25 @@
 
 from __future__ import annotations
 
-import importlib
 import logging
 import os
+import pwd
 import subprocess
-import sys
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
+from pathlib import Path
 
+from ghosty.core.netns import in_netns
+from ghosty.core.provision import REQUIREMENTS, provision, requirements_for
+from ghosty.events import EventBus, IPRotated
+from ghosty.tracing import traced
 from ghosty.utils.process import run_command, is_available
 
 logger = logging.getLogger(__name__)
 
-try:
-    from stem import Signal
-    from stem.control import Controller
-
-    STEM_AVAILABLE = True
-except ImportError:
-    STEM_AVAILABLE = False
-
-
-def _ensure_tornet() -> bool:
-    """Install tornet-mp if not available."""
-    try:
-        importlib.import_module("tornet_mp")
-        return True
-    except ImportError:
-        logger.info("tornet-mp not found, installing...")
-        result = run_command(
-            [sys.executable, "-m", "pip", "install", "tornet-mp"],
-            timeout=120,
-        )
-        if result.success:
-            logger.info("tornet-mp installed successfully")
-            return True
-        logger.error("Failed to install tornet-mp: %s", result.stderr)
-        return False
-
-
-def _ensure_stem() -> bool:
-    """Install stem if not available."""
-    global STEM_AVAILABLE  # noqa: PLW0603
-    if STEM_AVAILABLE:
-        return True
-    logger.info("stem not found, installing...")
-    result = run_command(
-        [sys.executable, "-m", "pip", "install", "stem"],
-        timeout=60,
-    )
-    if result.success:
-        try:
-            importlib.import_module("stem")
-            STEM_AVAILABLE = True
-            return True
-        except ImportError:
-            pass
-    logger.error("Failed to install stem")
-    return False
-
-
-def _ensure_tor_service() -> tuple[bool, str]:
-    """Install and start the tor system service if needed."""
-    if not is_available("tor"):
-        logger.info("tor not found, installing...")
-        # Detect package manager
-        for pm_cmd in [
-            ["sudo", "apt-get", "install", "-y", "tor"],
-            ["sudo", "dnf", "install", "-y", "tor"],
-            ["sudo", "pacman", "-S", "--noconfirm", "tor"],
-            ["sudo", "zypper", "install", "-y", "tor"],
-        ]:
-            result = run_command(pm_cmd, timeout=120)
-            if result.success:
-                break
-        else:
-            return False, "Could not install tor. Install manually: sudo apt install tor"
-
-    return True, "tor is available"
+_TOR_USERS = ("debian-tor", "tor", "_tor")  # System accounts created by distro packages
 
 
 @dataclass
@@ -95,6 +35,8 @@ class TORManager:
     _tor_process: subprocess.Popen | None = field(default=None, repr=False)
     _controller: object | None = field(default=None, repr=False)
     _stop_rotation: bool = field(default=False, repr=False)
+    _rotation_wakeup: threading.Event = field(default_factory=threading.Event, repr=False)
+    events: EventBus | None = field(default=None, repr=False)
 
     def is_available(self) -> bool:
         """Check if TOR is installed."""
@@ -116,14 +58,44 @@ class TORManager:
 
         return (is_enabled, is_running), f"Enabled: {is_enabled}, Running: {is_running}"
 
-    def start_service(self) -> tuple[bool, str]:
+    @traced("tor.ensure_installed")
+    def ensure_installed(self) -> tuple[bool, str]:
+        """Install tor if it is missing.
+
+        Returns:
+            (success, message) tuple.
+        """
+        return provision(requirements_for({"tor"}))
+
+    def _wait_until_running(
+        self, timeout: float, cancel: threading.Event | None = None
+    ) -> bool:
+        """Poll the service state instead of sleeping a fixed time."""
+        deadline = time.monotonic() + timeout
+        while True:
+            (_, is_running), _ = self.check_service_status()
+            if is_running:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            if cancel is not None:
+                if cancel.wait(0.5):
+                    return False
+            else:
+                time.sleep(0.5)
+
+    @traced("tor.start_service")
+    def start_service(self, cancel: threading.Event | None = None) -> tuple[bool, str]:
         """Start and enable TOR service.
 
+        Args:
+            cancel: Optional event that aborts waiting for the service.
+
         Returns:
             (success, message) tuple.
         """
         # Ensure tor is installed
-        ok, msg = _ensure_tor_service()
+        ok, msg = self.ensure_installed()
         if not ok:
             return False, msg
 
@@ -146,14 +118,13 @@ class TORManager:
                     return False, f"Failed to start TOR: {result.stderr}"
 
             # Wait and verify
-            time.sleep(3)
-            (_, is_running_now), _ = self.check_service_status()
-            if not is_running_now:
+            if not self._wait_until_running(timeout=10, cancel=cancel):
                 return False, "TOR service failed to start"
 
         logger.info("TOR service started")
         return True, "TOR service started"
 
+    @traced("tor.stop_service")
     def stop_service(self) -> tuple[bool, str]:
         """Stop TOR service.
 
@@ -175,8 +146,9 @@ class TORManager:
         Returns:
             (success, message) tuple.
         """
-        if not _ensure_stem():
-            return False, "stem library not available"
+        ok, msg = provision([REQUIREMENTS["stem"]])
+        if not ok:
+            return False, f"stem library not available: {msg}"
 
         from stem.control import Controller as StemController
 
@@ -189,6 +161,32 @@ class TORManager:
             logger.warning("TOR controller connection failed: %s", e)
             return False, f"Controller connection failed: {e}"
 
+    @traced("tor.rotate_ip")
+    def rotate_ip(self) -> tuple[bool, str]:
+        """Request a new TOR identity (fresh circuits) immediately.
+
+        Returns:
+            (success, message) tuple.
+        """
+        if not self.is_running:
+            return False, "TOR is not running"
+
+        if self._controller is None:
+            success, message = self.connect_controller()
+            if not success:
+                return False, message
+
+        from stem import Signal as StemSignal
+
+        try:
+            self._controller.signal(StemSignal.NEWNYM)  # type: ignore[attr-defined]
+            logger.info("Requested new TOR identity")
+            return True, "New TOR identity requested"
+        except Exception as e:
+            logger.warning("TOR identity rotation failed: %s", e)
+            return False, f"Rotation failed: {e}"
+
+    @traced("tor.start_ip_rotation")
     def start_ip_rotation(self) -> tuple[bool, str]:
         """Start automatic IP rotation using tornet-mp Python API.
 
@@ -200,14 +198,16 @@ class TORManager:
         if not is_running:
             return False, f"TOR is not running: {status}"
 
-        if not _ensure_tornet():
-            return False, "Failed to install tornet-mp"
+        ok, msg = provision([REQUIREMENTS["tornet-mp"]])
+        if not ok:
+            return False, f"Failed to install tornet-mp: {msg}"
 
         if self._tor_process and self._tor_process.poll() is None:
             return False, "IP rotation is already running"
 
         # Use tornet-mp Python API in a thread
         self._stop_rotation = False
+        self._rotation_wakeup.clear()
         self._rotation_thread = threading.Thread(
             target=self._run_tornet_rotation, daemon=True
         )
@@ -229,12 +229,39 @@ class TORManager:
             while not self._stop_rotation:
                 new_ip = change_ip()
                 logger.info("IP rotated to: %s", new_ip)
-                time.sleep(self.rotation_interval)
+                if self.events is not None and new_ip:
+                    self.events.publish(IPRotated(str(new_ip)))
+                self._wait_for_next_rotation(time.monotonic())
         except Exception:
             logger.exception("tornet-mp rotation error")
         finally:
             self.is_running = False
 
+    def _wait_for_next_rotation(self, rotated_at: float) -> None:
+        """Sleep until ``rotation_interval`` after ``rotated_at``.
+
+        Wakes early when rotation is stopped. A retime also wakes the
+        loop, which then waits out whatever remains of the new interval,
+        so shortening it rotates sooner and lengthening it defers.
+        """
+        while not self._stop_rotation:
+            remaining = rotated_at + self.rotation_interval - time.monotonic()
+            if remaining <= 0:
+                return
+            self._rotation_wakeup.wait(remaining)
+            if not self._stop_rotation:
+                self._rotation_wakeup.clear()
+
+    def set_rotation_interval(self, seconds: int) -> None:
+        """Retime a running rotation without restarting it."""
+        if seconds == self.rotation_interval:
+            return
+        self.rotation_interval = seconds
+        logger.info("IP rotation interval set to %ss", seconds)
+        if self.is_running:
+            self._rotation_wakeup.set()
+
+    @traced("tor.stop_ip_rotation")
     def stop_ip_rotation(self) -> tuple[bool, str]:
         """Stop IP rotation.
 
@@ -242,6 +269,7 @@ class TORManager:
             (success, message) tuple.
         """
         self._stop_rotation = True
+        self._rotation_wakeup.set()
         self.is_running = False
 
         if self._tor_process:
@@ -280,12 +308,6 @@ class TORManager:
         if not success:
             return False, message
 
-        time.sleep(3)
-
-        (_, is_running), status = self.check_service_status()
-        if not is_running:
-            return False, f"TOR verification failed: {status}"
-
         success, message = self.start_ip_rotation()
         if not success:
             return False, f"TOR started but rotation failed: {message}"
@@ -307,3 +329,116 @@ class TORManager:
         from ghosty.utils.network import get_tor_ip
 
         return get_tor_ip()
+
+
+def tor_user() -> pwd.struct_passwd | None:
+    """The distribution's unprivileged tor account, if one exists."""
+    for name in _TOR_USERS:
+        try:
+            return pwd.getpwnam(name)
+        except KeyError:
+            continue
+    return None
+
+
+@dataclass
+class TORInstance:
+    """A private tor process with its own data directory.
+
+    Used by identities: each runs one inside its network namespace, where
+    the fixed loopback ports cannot collide with other instances. Besides
+    SOCKS it exposes a transparent TCP port and a DNS port so the identity's
+    firewall can redirect workloads that know nothing about proxies.
+    """
+
+    data_dir: Path
+    netns: str = ""
+    socks_port: int = 9050
+    trans_port: int = 9040
+    dns_port: int = 53
+    bootstrap_timeout: float = 90.0
+
+    _process: subprocess.Popen | None = field(default=None, repr=False)
+    _bootstrapped: threading.Event = field(default_factory=threading.Event, repr=False)
+    _output: deque[str] = field(default_factory=lambda: deque(maxlen=50), repr=False)
+    user: pwd.struct_passwd | None = field(default_factory=tor_user, repr=False)
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def command(self) -> list[str]:
+        """The tor command line, prefixed to run inside ``netns``."""
+        cmd = [
+            "tor", "--RunAsDaemon", "0", "--Log", "notice stdout",
+            "--DataDirectory", str(self.data_dir),
+            "--SocksPort", f"127.0.0.1:{self.socks_port}",
+            "--TransPort", f"127.0.0.1:{self.trans_port}",
+            "--DNSPort", f"127.0.0.1:{self.dns_port}",
+            "--AutomapHostsOnResolve", "1",
+            "--ControlPort", "0",
+        ]
+        if self.user is not None:
+            cmd.extend(["--User", self.user.pw_name])
+        return in_netns(self.netns, cmd)
+
+    @traced("tor.instance_start")
+    def start(self, cancel: threading.Event | None = None) -> tuple[bool, str]:
+        """Launch tor and wait until it has bootstrapped a circuit.
+
+        Args:
+            cancel: Optional event that aborts waiting for bootstrap.
+
+        Returns:
+            (success, message) tuple.
+        """
+        ok, msg = provision([REQUIREMENTS["tor"]])
+        if not ok:
+            return False, msg
+        if self.is_running:
+            return False, "TOR instance is already running"
+
+        self.data_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        if self.user is not None:
+            os.chown(self.data_dir, self.user.pw_uid, self.user.pw_gid)
+
+        self._bootstrapped.clear()
+        self._output.clear()
+        self._process = subprocess.Popen(
+            self.command(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+        threading.Thread(target=self._monitor, daemon=True, name="ghosty-tor-instance").start()
+
+        deadline = time.monotonic() + self.bootstrap_timeout
+        while not self._bootstrapped.wait(0.5):
+            if not self.is_running:
+                return False, f"TOR exited: {self._output[-1] if self._output else 'no output'}"
+            if time.monotonic() >= deadline or (cancel is not None and cancel.is_set()):
+                self.stop()
+                return False, "TOR did not bootstrap in time"
+        return True, "TOR instance bootstrapped"
+
+    def _monitor(self) -> None:
+        process = self._process
+        if not process or not process.stdout:
+            return
+        for line in process.stdout:
+            line = line.rstrip()
+            self._output.append(line)
+            if "Bootstrapped 100%" in line:
+                self._bootstrapped.set()
+        process.wait()
+
+    @traced("tor.instance_stop")
+    def stop(self) -> tuple[bool, str]:
+        """Terminate the tor process."""
+        if self._process is None:
+            return True, "TOR instance not running"
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+        return True, "TOR instance stopped"
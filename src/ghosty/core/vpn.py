@@ -3,53 +3,108 @@
 from __future__ import annotations
 
 import logging
+import random
+import re
+import socket
 import subprocess
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-
+from typing import Callable
+
+from ghosty.core import preflight
+from ghosty.core.cipher import DataChannelPlan, plan_data_channel
+from ghosty.core.mtu import MTUTuner
+from ghosty.core.netns import in_netns
+from ghosty.core.provision import provision, requirements_for
+from ghosty.core.telemetry import TelemetrySampler, format_rate, tcp_probe
+from ghosty.core.wireguard import WireGuardConfig, WireGuardTunnel, parse_config
+from ghosty.events import EventBus, VPNStateChanged
+from ghosty.tracing import traced
 from ghosty.utils.process import run_command, is_available
 
 logger = logging.getLogger(__name__)
 
 
-def _ensure_openvpn() -> bool:
-    """Install openvpn if not available."""
-    if is_available("openvpn"):
-        return True
-    logger.info("openvpn not found, installing...")
-    for pm_cmd in [
-        ["sudo", "apt-get", "install", "-y", "openvpn"],
-        ["sudo", "dnf", "install", "-y", "openvpn"],
-        ["sudo", "pacman", "-S", "--noconfirm", "openvpn"],
-        ["sudo", "zypper", "install", "-y", "openvpn"],
-    ]:
-        result = run_command(pm_cmd, timeout=120)
-        if result.success:
-            logger.info("openvpn installed successfully")
-            return True
-    logger.error("Failed to install openvpn")
-    return False
-
-
-def _ensure_wireguard() -> bool:
-    """Install wireguard-tools if not available."""
-    if is_available("wg-quick"):
-        return True
-    logger.info("wireguard-tools not found, installing...")
-    for pm_cmd in [
-        ["sudo", "apt-get", "install", "-y", "wireguard-tools"],
-        ["sudo", "dnf", "install", "-y", "wireguard-tools"],
-        ["sudo", "pacman", "-S", "--noconfirm", "wireguard-tools"],
-        ["sudo", "zypper", "install", "-y", "wireguard-tools"],
-    ]:
-        result = run_command(pm_cmd, timeout=120)
-        if result.success:
-            logger.info("wireguard-tools installed successfully")
-            return True
-    logger.error("Failed to install wireguard-tools")
-    return False
+_TUN_DEVICE_RE = re.compile(r"TUN/TAP device (\S+) opened")
+_PING_RTT_RE = re.compile(r"time=([\d.]+) ms")
+
+
+def parse_endpoint(config_file: str, provider: str = "openvpn") -> tuple[str, int] | None:
+    """Extract the first remote endpoint (host, port) from a VPN config.
+
+    Returns:
+        (host, port) tuple or None if the config names no endpoint.
+    """
+    try:
+        if provider == "wireguard":
+            endpoints = parse_config(config_file).endpoints
+            if not endpoints:
+                return None
+            host, _, port_text = endpoints[0].rpartition(":")
+            return host.strip("[]"), int(port_text)
+
+        default_port = 1194
+        for line in Path(config_file).read_text().splitlines():
+            parts = line.split("#", 1)[0].split(";", 1)[0].split()
+            if len(parts) >= 2 and parts[0] == "port":
+                default_port = int(parts[1])
+            if len(parts) >= 2 and parts[0] == "remote":
+                port = int(parts[2]) if len(parts) >= 3 else default_port
+                return parts[1], port
+    except (OSError, ValueError):
+        logger.warning("Could not read endpoint from %s", config_file)
+    return None
+
+
+@dataclass(frozen=True)
+class ParsedVPNConfig:
+    """What connecting would otherwise read from a VPN config file."""
+
+    path: str
+    provider: str
+    endpoint: tuple[str, int] | None  # (host, port) as written, unresolved
+    wireguard: WireGuardConfig | None = None  # WireGuard configs only
+
+
+def parse_vpn_config(config_file: str, provider: str = "openvpn") -> ParsedVPNConfig:
+    """Read and check a VPN config ahead of connecting.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If a WireGuard config is invalid.
+    """
+    if provider == "wireguard":
+        wireguard = parse_config(config_file)
+        return ParsedVPNConfig(config_file, provider, parse_endpoint(config_file, provider),
+                               wireguard)
+    Path(config_file).read_bytes()  # Surface unreadable files here, not at connect
+    return ParsedVPNConfig(config_file, provider, parse_endpoint(config_file, provider))
+
+
+def measure_latency(host: str, timeout: int = 2) -> float | None:
+    """Measure round-trip time to a host in milliseconds with a single ping."""
+    result = run_command(["ping", "-c", "1", "-W", str(timeout), host], timeout=timeout + 2)
+    if not result.success:
+        return None
+    match = _PING_RTT_RE.search(result.stdout)
+    return float(match.group(1)) if match else None
+
+
+def rank_configs(configs: list[str], provider: str = "openvpn") -> list[str]:
+    """Order VPN configs by endpoint latency, fastest first.
+
+    Configs whose endpoint is unknown or unreachable keep their relative
+    order at the end of the list.
+    """
+    latencies: dict[str, float] = {}
+    for config_file in configs:
+        endpoint = parse_endpoint(config_file, provider)
+        rtt = measure_latency(endpoint[0]) if endpoint else None
+        latencies[config_file] = rtt if rtt is not None else float("inf")
+    return sorted(configs, key=lambda c: latencies[c])
 
 
 @dataclass
@@ -59,28 +114,73 @@ class VPNManager:
     provider: str = "openvpn"
     config_file: str = ""
     auth_file: str = ""
+    wireguard_backend: str = "native"  # "native" or "wg-quick"
+    auto_mtu: bool = True
+    tune_data_channel: bool = True
+    benchmark_ciphers: bool = False
+    netns: str = ""  # Run the tunnel inside this network namespace
 
     _process: subprocess.Popen | None = field(default=None, repr=False)
     _connected: bool = field(default=False, repr=False)
     _monitor_thread: threading.Thread | None = field(default=None, repr=False)
+    _wg_tunnel: WireGuardTunnel | None = field(default=None, repr=False)
+    _tun_device: str = field(default="", repr=False)
+    _output: deque[str] = field(default_factory=lambda: deque(maxlen=50), repr=False)
+    telemetry: TelemetrySampler | None = field(default=None, repr=False)
+    _mtu: MTUTuner = field(default_factory=MTUTuner, repr=False)
+    data_channel: DataChannelPlan | None = field(default=None, repr=False)
+    _endpoint: tuple[str, int] | None = field(default=None, repr=False)
+    _parsed: ParsedVPNConfig | None = field(default=None, repr=False)
+    events: EventBus | None = field(default=None, repr=False)
 
     @property
     def is_connected(self) -> bool:
         """Check if VPN is currently connected."""
         if self._process and self._process.poll() is None:
             return True
+        if self.provider == "wireguard" and self._connected:
+            return True
         self._connected = False
         return False
 
+    @property
+    def tunnel_interface(self) -> str:
+        """Name of the tunnel device, or "" if not known yet."""
+        if self.provider == "wireguard":
+            if self._wg_tunnel is not None:
+                return self._wg_tunnel.interface
+            return Path(self.config_file).stem if self.config_file else ""
+        return self._tun_device
+
     def is_available(self) -> bool:
         """Check if the VPN client is installed."""
         if self.provider == "wireguard":
-            return is_available("wg-quick")
+            return is_available("wg" if self.wireguard_backend == "native" else "wg-quick")
         return is_available("openvpn")
 
-    def set_config(self, config_file: str, auth_file: str | None = None) -> tuple[bool, str]:
+    @traced("vpn.ensure_installed")
+    def ensure_installed(self) -> tuple[bool, str]:
+        """Install the VPN client for the current provider if it is missing.
+
+        Returns:
+            (success, message) tuple.
+        """
+        return provision(requirements_for(
+            {"vpn"}, vpn_provider=self.provider, wireguard_backend=self.wireguard_backend
+        ))
+
+    def set_config(
+        self, config_file: str, auth_file: str | None = None, *,
+        parsed: ParsedVPNConfig | None = None,
+    ) -> tuple[bool, str]:
         """Set VPN configuration files.
 
+        Args:
+            config_file: Path to the VPN config.
+            auth_file: Path to the OpenVPN credentials file (optional).
+            parsed: ``config_file`` already parsed (e.g. by a compiled
+                profile), so connecting does not read it again.
+
         Returns:
             (success, message) tuple.
         """
@@ -92,22 +192,25 @@ class VPNManager:
 
         self.config_file = config_file
         self.auth_file = auth_file or ""
+        self._endpoint = None
+        self._parsed = parsed if parsed is not None and parsed.path == config_file else None
         logger.info("VPN config set: %s", config_file)
         return True, "VPN configuration set"
 
-    def connect(self) -> tuple[bool, str]:
+    @traced("vpn.connect")
+    def connect(self, cancel: threading.Event | None = None) -> tuple[bool, str]:
         """Start VPN connection.
 
+        Args:
+            cancel: Optional event that aborts waiting for the tunnel.
+
         Returns:
             (success, message) tuple.
         """
         # Auto-install VPN client if needed
-        if self.provider == "wireguard":
-            if not _ensure_wireguard():
-                return False, "wireguard-tools could not be installed"
-        else:
-            if not _ensure_openvpn():
-                return False, "openvpn could not be installed"
+        success, message = self.ensure_installed()
+        if not success:
+            return False, message
 
         if not self.config_file:
             return False, "No VPN configuration file set"
@@ -119,31 +222,46 @@ class VPNManager:
 
         try:
             if self.provider == "wireguard":
-                return self._connect_wireguard()
-            return self._connect_openvpn()
+                success, message = self._connect_wireguard()
+            else:
+                success, message = self._connect_openvpn(cancel)
         except Exception as e:
             logger.exception("Failed to connect VPN")
             return False, f"Failed to connect: {e}"
+        if success:
+            self._publish("connected", message)
+        return success, message
 
-    def _connect_openvpn(self) -> tuple[bool, str]:
+    def _connect_openvpn(self, cancel: threading.Event | None = None) -> tuple[bool, str]:
         """Start OpenVPN connection."""
-        cmd = ["sudo", "openvpn", "--config", self.config_file]
+        cmd = ["sudo", *in_netns(self.netns, ["openvpn", "--config", self.config_file])]
 
         if self.auth_file:
             cmd.extend(["--auth-user-pass", self.auth_file])
 
-        cmd.extend([
-            "--script-security", "2",
-            "--up", "/etc/openvpn/update-resolv-conf",
-            "--down", "/etc/openvpn/update-resolv-conf",
-        ])
+        if not self.netns:
+            # A namespace gets its resolvers from /etc/netns instead
+            cmd.extend([
+                "--script-security", "2",
+                "--up", "/etc/openvpn/update-resolv-conf",
+                "--down", "/etc/openvpn/update-resolv-conf",
+            ])
+
+        if self.tune_data_channel:
+            self.data_channel = plan_data_channel(
+                self.config_file, benchmark=self.benchmark_ciphers,
+                capabilities=preflight.capabilities(),
+            )
+            cmd.extend(self.data_channel.openvpn_args())
 
         logger.info("Running: %s", " ".join(cmd))
 
+        self._tun_device = ""
+        self._output.clear()
         self._process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
         )
 
@@ -151,29 +269,63 @@ class VPNManager:
         self._monitor_thread.start()
 
         # Wait briefly to check if process starts
-        time.sleep(3)
+        if cancel is None:
+            time.sleep(3)
+        elif cancel.wait(3):
+            self._disconnect_openvpn()
+            return False, "VPN connection cancelled"
         if self._process.poll() is None:
             self._connected = True
             logger.info("OpenVPN connection started")
+            if self.data_channel:
+                return True, f"VPN connection started ({self.data_channel.describe()})"
             return True, "VPN connection started"
 
-        stdout, stderr = self._process.communicate()
-        logger.error("OpenVPN failed: %s", stderr)
-        return False, f"OpenVPN failed to start: {stderr}"
+        self._monitor_thread.join(timeout=5)
+        output = "\n".join(self._output)
+        logger.error("OpenVPN failed: %s", output)
+        return False, f"OpenVPN failed to start: {output}"
 
     def _connect_wireguard(self) -> tuple[bool, str]:
         """Start WireGuard connection."""
+        if self.wireguard_backend == "native" or self.netns:
+            # wg-quick would rewrite the host's resolv.conf from inside a namespace
+            return self._connect_wireguard_native()
+
         result = run_command(
             ["sudo", "wg-quick", "up", self.config_file],
             timeout=30,
         )
         if result.success:
             self._connected = True
+            self._start_telemetry(self.tunnel_interface)
             logger.info("WireGuard connection started")
             return True, "WireGuard VPN connected"
         logger.error("WireGuard failed: %s", result.stderr)
         return False, f"WireGuard failed: {result.stderr}"
 
+    def _connect_wireguard_native(self) -> tuple[bool, str]:
+        """Start WireGuard with the native backend (no wg-quick)."""
+        try:
+            parsed = self._parsed_config()
+            wireguard = parsed.wireguard if parsed is not None else None
+            tunnel = WireGuardTunnel(wireguard or parse_config(self.config_file),
+                                     netns=self.netns)
+        except (OSError, ValueError) as e:
+            return False, f"Invalid WireGuard config: {e}"
+
+        success, message = tunnel.up()
+        if not success:
+            logger.error("WireGuard failed: %s", message)
+            return False, f"WireGuard failed: {message}"
+
+        self._wg_tunnel = tunnel
+        self._connected = True
+        self._start_telemetry(tunnel.interface)
+        logger.info("WireGuard connection started")
+        return True, "WireGuard VPN connected"
+
+    @traced("vpn.disconnect")
     def disconnect(self) -> tuple[bool, str]:
         """Disconnect VPN.
 
@@ -183,13 +335,22 @@ class VPNManager:
         if not self.is_connected and not self._connected:
             return False, "VPN is not connected"
 
+        self._stop_telemetry()
+        self._mtu.remove_clamp()
         try:
             if self.provider == "wireguard":
-                return self._disconnect_wireguard()
-            return self._disconnect_openvpn()
+                success, message = self._disconnect_wireguard()
+            else:
+                success, message = self._disconnect_openvpn()
         except Exception as e:
             logger.exception("Failed to disconnect VPN")
             return False, f"Failed to disconnect: {e}"
+        self._publish("disconnected", message)
+        return success, message
+
+    def _publish(self, state: str, message: str) -> None:
+        if self.events is not None:
+            self.events.publish(VPNStateChanged(state, message))
 
     def _disconnect_openvpn(self) -> tuple[bool, str]:
         """Stop OpenVPN process."""
@@ -208,6 +369,15 @@ class VPNManager:
 
     def _disconnect_wireguard(self) -> tuple[bool, str]:
         """Stop WireGuard connection."""
+        if self._wg_tunnel is not None:
+            success, message = self._wg_tunnel.down()
+            self._wg_tunnel = None
+            self._connected = False
+            if success:
+                logger.info("WireGuard disconnected")
+                return True, "WireGuard VPN disconnected"
+            return False, f"WireGuard disconnect failed: {message}"
+
         result = run_command(
             ["sudo", "wg-quick", "down", self.config_file],
             timeout=30,
@@ -218,23 +388,304 @@ class VPNManager:
             return True, "WireGuard VPN disconnected"
         return False, f"WireGuard disconnect failed: {result.stderr}"
 
+    @traced("vpn.resolve_endpoint")
+    def resolve_endpoint(self) -> tuple[bool, str]:
+        """Resolve the server address ahead of connecting.
+
+        Resolution failures are reported but not fatal: the client retries
+        on its own and may be configured with several remotes.
+
+        Returns:
+            (success, message) tuple.
+        """
+        endpoint = self._remote()
+        if endpoint is None:
+            return True, "No endpoint to resolve"
+        host, port = endpoint
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_DGRAM)
+        except socket.gaierror as e:
+            logger.warning("Could not resolve VPN endpoint %s: %s", host, e)
+            return True, f"Endpoint {host} unresolved"
+        address = str(infos[0][4][0])
+        self._endpoint = (address, port)
+        return True, f"Endpoint {host} -> {address}"
+
+    def _parsed_config(self) -> ParsedVPNConfig | None:
+        """The pre-parsed config, if it still matches the provider in use."""
+        if self._parsed is not None and self._parsed.provider == self.provider:
+            return self._parsed
+        return None
+
+    def _remote(self) -> tuple[str, int] | None:
+        parsed = self._parsed_config()
+        if parsed is not None:
+            return parsed.endpoint
+        return parse_endpoint(self.config_file, self.provider)
+
+    @traced("vpn.tune_mtu")
+    def tune_mtu(self) -> tuple[bool, str]:
+        """Size the tunnel to the path MTU of the endpoint and clamp TCP MSS.
+
+        The path MTU is cached per endpoint, so after the first connection
+        this costs two commands and no probes.
+
+        Returns:
+            (success, message) tuple.
+        """
+        interface = self.tunnel_interface
+        if not interface:
+            return False, "Tunnel device not known yet"
+        endpoint = self._endpoint or self._remote()
+        if endpoint is None:
+            return False, "No endpoint found in VPN config"
+        mark = self._wg_tunnel.fwmark if self._wg_tunnel else None
+        return self._mtu.tune(interface, endpoint, self.provider, mark=mark)
+
+    def _start_telemetry(self, interface: str) -> None:
+        """Begin sampling counters for the tunnel device."""
+        self._stop_telemetry()
+        if self.netns:
+            return  # Our sysfs shows the host namespace's devices only
+        self.telemetry = TelemetrySampler(interface, wireguard=self.provider == "wireguard")
+        self.telemetry.start()
+
+    def _stop_telemetry(self) -> None:
+        if self.telemetry:
+            self.telemetry.stop()
+            self.telemetry = None
+
     def get_status(self) -> str:
         """Get human-readable connection status."""
-        if self.is_connected:
+        if not self.is_connected:
+            return "Disconnected"
+        if not self.telemetry or not self.telemetry.snapshot().samples:
             return "Connected"
-        return "Disconnected"
+
+        snap = self.telemetry.snapshot()
+        status = (
+            f"Connected ({snap.interface}) — "
+            f"↓ {format_rate(snap.rx_rate)} ↑ {format_rate(snap.tx_rate)}"
+        )
+        if snap.handshake_age is not None:
+            status += f", handshake {snap.handshake_age:.0f}s ago"
+        return status
 
     def _monitor_process(self) -> None:
         """Monitor VPN process in background thread."""
-        if not self._process:
+        process = self._process
+        if not process or not process.stdout:
             return
         try:
-            stdout, stderr = self._process.communicate()
-            if self._process.returncode != 0:
-                logger.error("VPN process ended with error: %s", stderr)
+            for line in process.stdout:
+                line = line.rstrip()
+                self._output.append(line)
+                match = _TUN_DEVICE_RE.search(line)
+                if match:
+                    self._tun_device = match.group(1)
+                    self._start_telemetry(self._tun_device)
+            process.wait()
+            if process.returncode != 0:
+                logger.error("VPN process ended with error: %s", "\n".join(self._output))
             else:
                 logger.info("VPN process ended normally")
         except Exception:
             logger.exception("Error monitoring VPN process")
         finally:
             self._connected = False
+
+
+def _read_carrier(interface: str) -> bool:
+    """Check the interface carrier flag in sysfs."""
+    try:
+        return Path(f"/sys/class/net/{interface}/carrier").read_text().strip() == "1"
+    except OSError:
+        return False
+
+
+@dataclass
+class VPNSupervisor:
+    """Keeps a VPN tunnel alive and reconnects it when it fails.
+
+    Liveness is judged from the client process, the tunnel's carrier flag and
+    a periodic TCP probe bound to the tunnel device. A dead tunnel is
+    reconnected with jittered exponential backoff; after
+    ``attempts_per_config`` failures the supervisor fails over to the next
+    config in ``fallback_configs`` (ranked by endpoint latency). The
+    primary config stays a candidate after a failover, so the supervisor
+    can return to it.
+    """
+
+    vpn: VPNManager
+    fallback_configs: list[str] = field(default_factory=list)
+    primary_config: str = ""  # Defaults to the config connected at creation
+    interval: float = 5.0
+    probe_host: str = "1.1.1.1"
+    probe_port: int = 443
+    probe_timeout: float = 3.0
+    probe_failures: int = 2
+    device_grace: float = 30.0  # Seconds OpenVPN may take to report its device
+    backoff_base: float = 1.0
+    backoff_max: float = 60.0
+    attempts_per_config: int = 3
+    max_attempts: int = 0  # 0 = retry forever
+    on_state_change: Callable[[str, str], None] | None = field(default=None, repr=False)
+
+    state: str = field(default="stopped", repr=False)
+    recovery_times: deque[float] = field(default_factory=lambda: deque(maxlen=100), repr=False)
+    failed_recoveries: int = field(default=0, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, repr=False)
+    _thread: threading.Thread | None = field(default=None, repr=False)
+    _device_pending_since: float | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.primary_config:
+            self.primary_config = self.vpn.config_file
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def mean_time_to_recovery(self) -> float | None:
+        """Mean seconds from detected failure to a healthy tunnel."""
+        if not self.recovery_times:
+            return None
+        return sum(self.recovery_times) / len(self.recovery_times)
+
+    def metrics(self) -> dict[str, float | int | None]:
+        """Return reconnect metrics for status displays and exporters."""
+        return {
+            "recoveries": len(self.recovery_times),
+            "failed_recoveries": self.failed_recoveries,
+            "mttr": self.mean_time_to_recovery,
+            "last_recovery": self.recovery_times[-1] if self.recovery_times else None,
+        }
+
+    def start(self) -> None:
+        """Start supervising in a background thread."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._set_state("healthy", "VPN supervisor started")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop supervising. Does not disconnect the VPN."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.state = "stopped"
+
+    def check_health(self) -> tuple[bool, str]:
+        """Run the liveness checks once.
+
+        Returns:
+            (healthy, reason) tuple.
+        """
+        if not self.vpn.is_connected:
+            return False, "VPN client is not running"
+
+        interface = self.vpn.tunnel_interface
+        if not interface:
+            # OpenVPN has not reported its device yet
+            now = time.monotonic()
+            if self._device_pending_since is None:
+                self._device_pending_since = now
+            if now - self._device_pending_since > self.device_grace:
+                return False, f"No tunnel device after {self.device_grace:.0f}s"
+            return True, "Tunnel device pending"
+        self._device_pending_since = None
+        if not _read_carrier(interface):
+            return False, f"No carrier on {interface}"
+        rtt = tcp_probe(interface, self.probe_host, self.probe_port, self.probe_timeout)
+        if rtt is None:
+            return False, f"Probe through {interface} failed"
+        telemetry = self.vpn.telemetry
+        if telemetry is not None:
+            # Reuse the liveness probe as the latency series
+            telemetry.series["latency"].append(rtt)
+        return True, "Tunnel healthy"
+
+    def _set_state(self, state: str, message: str) -> None:
+        self.state = state
+        logger.info(message)
+        if self.on_state_change:
+            self.on_state_change(state, message)
+
+    def _run(self) -> None:
+        """Health-check loop."""
+        failures = 0
+        while not self._stop.wait(self.interval):
+            healthy, reason = self.check_health()
+            if healthy:
+                failures = 0
+                continue
+
+            failures += 1
+            process_dead = not self.vpn.is_connected
+            if process_dead or failures >= self.probe_failures:
+                self._recover(reason)
+                failures = 0
+
+    def _candidates(self) -> list[str]:
+        """Current config first, then the primary, then the fallbacks ranked by latency."""
+        current = self.vpn.config_file
+        primary = [self.primary_config] if self.primary_config not in ("", current) else []
+        others = [c for c in self.fallback_configs if c not in (current, self.primary_config)]
+        return [current, *primary, *rank_configs(others, self.vpn.provider)]
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with equal jitter."""
+        delay = min(self.backoff_max, self.backoff_base * (2.0 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _recover(self, reason: str) -> None:
+        """Reconnect until healthy, the attempt budget runs out or stop() is called."""
+        started = time.monotonic()
+        self._set_state("reconnecting", f"VPN unhealthy ({reason}), reconnecting...")
+
+        candidates = self._candidates()
+        auth_file = self.vpn.auth_file or None
+        attempt = 0
+        while not self._stop.is_set():
+            if self.max_attempts and attempt >= self.max_attempts:
+                self.failed_recoveries += 1
+                self._set_state("failed", f"VPN reconnect gave up after {attempt} attempts")
+                return
+
+            config_file = candidates[(attempt // self.attempts_per_config) % len(candidates)]
+            if config_file != self.vpn.config_file:
+                logger.info("Failing over to VPN config %s", config_file)
+                self.vpn.set_config(config_file, auth_file)
+
+            self.vpn.disconnect()
+            self._device_pending_since = None  # A new client gets a fresh grace period
+            success, message = self.vpn.connect()
+            if success:
+                healthy, reason = self._wait_healthy()
+                if healthy:
+                    if self.vpn.auto_mtu:
+                        self.vpn.tune_mtu()
+                    duration = time.monotonic() - started
+                    self.recovery_times.append(duration)
+                    self._set_state("healthy", f"VPN recovered in {duration:.1f}s")
+                    return
+                message = reason
+
+            logger.warning("VPN reconnect attempt %d failed: %s", attempt + 1, message)
+            if self._stop.wait(self._backoff(attempt)):
+                return
+            attempt += 1
+
+    def _wait_healthy(self, timeout: float = 15.0) -> tuple[bool, str]:
+        """Poll health after a reconnect until the tunnel carries traffic."""
+        deadline = time.monotonic() + timeout
+        while True:
+            healthy, reason = self.check_health()
+            if healthy and self.vpn.tunnel_interface:
+                return True, reason
+            if time.monotonic() >= deadline or self._stop.wait(1.0):
+                return False, reason
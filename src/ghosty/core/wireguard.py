@@ -0,0 +1,349 @@
+"""Native WireGuard backend — brings tunnels up without the wg-quick script.
+
+wg-quick is a bash script that forks ip, wg, resolvconf and friends once per
+address, route and rule. This backend parses the same ``.conf`` format in
+Python, hands the keys and peers to the kernel with a single ``wg setconf``
+and installs addresses, routes and policy rules with one ``ip -batch`` per
+address family.
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from ghosty.utils.process import run_command, is_available
+
+logger = logging.getLogger(__name__)
+
+# Keys understood by wg-quick but rejected by `wg setconf`
+_WG_QUICK_KEYS = {
+    "address", "dns", "mtu", "table",
+    "preup", "postup", "predown", "postdown", "saveconfig",
+}
+
+_DEFAULT_MTU = 1420
+_DEFAULT_TABLE = 51820
+
+
+@dataclass
+class WireGuardPeer:
+    """A [Peer] section of a WireGuard config."""
+
+    public_key: str = ""
+    endpoint: str = ""
+    allowed_ips: list[str] = field(default_factory=list)
+
+
+@dataclass
+class WireGuardConfig:
+    """Parsed wg-quick style configuration."""
+
+    interface: str
+    addresses: list[str] = field(default_factory=list)
+    dns: list[str] = field(default_factory=list)
+    mtu: int | None = None
+    table: str = "auto"
+    fwmark: int | None = None
+    peers: list[WireGuardPeer] = field(default_factory=list)
+    setconf: str = ""  # Config text reduced to the keys `wg setconf` accepts
+
+    @property
+    def endpoints(self) -> list[str]:
+        """Return every peer endpoint (host:port)."""
+        return [peer.endpoint for peer in self.peers if peer.endpoint]
+
+
+def _split_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_config(path: str | Path) -> WireGuardConfig:
+    """Parse a wg-quick ``.conf`` file.
+
+    The interface name follows wg-quick: the file name without ``.conf``.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid WireGuard config.
+    """
+    path = Path(path)
+    config = WireGuardConfig(interface=path.stem)
+    setconf_lines: list[str] = []
+    section = ""
+    peer: WireGuardPeer | None = None
+
+    for lineno, raw in enumerate(path.read_text().splitlines(), start=1):
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+
+        if line.startswith("[") and line.endswith("]"):
+            section = line[1:-1].strip().lower()
+            if section == "peer":
+                peer = WireGuardPeer()
+                config.peers.append(peer)
+            elif section != "interface":
+                raise ValueError(f"{path}:{lineno}: unknown section [{section}]")
+            setconf_lines.append(line)
+            continue
+
+        key, sep, value = line.partition("=")
+        if not sep or not section:
+            raise ValueError(f"{path}:{lineno}: expected 'Key = Value' inside a section")
+        key = key.strip().lower()
+        value = value.strip()
+
+        if section == "interface" and key in _WG_QUICK_KEYS:
+            if key == "address":
+                config.addresses.extend(_split_list(value))
+            elif key == "dns":
+                config.dns.extend(_split_list(value))
+            elif key == "mtu":
+                config.mtu = int(value)
+            elif key == "table":
+                config.table = value.lower()
+            else:
+                logger.warning("Ignoring unsupported wg-quick key %s in %s", key, path)
+            continue
+
+        if section == "interface" and key == "fwmark":
+            config.fwmark = 0 if value == "off" else int(value, 0)
+        elif peer is not None and key == "publickey":
+            peer.public_key = value
+        elif peer is not None and key == "endpoint":
+            peer.endpoint = value
+        elif peer is not None and key == "allowedips":
+            peer.allowed_ips.extend(_split_list(value))
+
+        setconf_lines.append(f"{raw.split('=', 1)[0].strip()} = {value}")
+
+    if not any(line.lower() == "[interface]" for line in setconf_lines):
+        raise ValueError(f"{path}: missing [Interface] section")
+
+    config.setconf = "\n".join(setconf_lines) + "\n"
+    return config
+
+
+@dataclass
+class WireGuardTunnel:
+    """Brings a WireGuard interface up and down without wg-quick."""
+
+    config: WireGuardConfig
+    netns: str = ""  # Move the interface into this namespace once keyed
+
+    _in_netns: bool = field(default=False, repr=False)
+    _policy_families: list[str] = field(default_factory=list, repr=False)
+    _dns_set: bool = field(default=False, repr=False)
+
+    @property
+    def interface(self) -> str:
+        return self.config.interface
+
+    @property
+    def fwmark(self) -> int | None:
+        """Mark carried by the tunnel's own packets, if policy routing is used."""
+        if self.config.fwmark:
+            return self.config.fwmark
+        return _DEFAULT_TABLE if self._uses_policy_routing() else None
+
+    def _uses_policy_routing(self) -> bool:
+        """Default routes go through a dedicated table, like wg-quick.
+
+        Not needed inside a namespace: the encrypted socket stays in the
+        host namespace, so a default route through the tunnel cannot loop.
+        """
+        return not self.netns and self.config.table == "auto" and any(
+            cidr.endswith("/0") for peer in self.config.peers for cidr in peer.allowed_ips
+        )
+
+    def _table(self) -> str:
+        if self.config.table in ("auto", "main"):
+            return "main"
+        return self.config.table
+
+    def _build_batches(self) -> dict[str, list[str]]:
+        """Build the ``ip -batch`` lines per address family."""
+        iface = self.interface
+        mark = self.config.fwmark or _DEFAULT_TABLE
+        batches: dict[str, list[str]] = {"-4": [], "-6": []}
+        for addr in self.config.addresses:
+            batches["-6" if ":" in addr else "-4"].append(f"address add {addr} dev {iface}")
+        # The IPv4 batch runs first, so the link is up before any IPv6 route
+        batches["-4"].append(f"link set mtu {self.config.mtu or _DEFAULT_MTU} up dev {iface}")
+
+        if self.config.table == "off":
+            return batches
+
+        seen: set[str] = set()
+        for peer in self.config.peers:
+            for cidr in peer.allowed_ips:
+                if cidr in seen:
+                    continue
+                seen.add(cidr)
+                family = "-6" if ":" in cidr else "-4"
+                if self._uses_policy_routing() and cidr.endswith("/0"):
+                    batches[family].extend([
+                        f"route add {cidr} dev {iface} table {mark}",
+                        f"rule add not fwmark {mark} table {mark}",
+                        "rule add table main suppress_prefixlength 0",
+                    ])
+                else:
+                    batches[family].append(f"route add {cidr} dev {iface} table {self._table()}")
+        return batches
+
+    def up(self) -> tuple[bool, str]:
+        """Create the interface, load keys/peers and install addresses and routes.
+
+        Returns:
+            (success, message) tuple.
+        """
+        iface = self.interface
+        start = time.monotonic()
+
+        result = run_command(["ip", "link", "add", iface, "type", "wireguard"], timeout=10)
+        if not result.success:
+            return False, f"Failed to create {iface}: {result.stderr}"
+
+        setconf = self.config.setconf
+        if self._uses_policy_routing() and self.config.fwmark is None:
+            setconf = setconf.replace(
+                "[Interface]", f"[Interface]\nFwMark = {_DEFAULT_TABLE}", 1
+            )
+        result = run_command(["wg", "setconf", iface, "/dev/stdin"], timeout=10, input=setconf)
+        if not result.success:
+            self._delete_link()
+            return False, f"wg setconf failed: {result.stderr}"
+
+        if self.netns:
+            result = run_command(["ip", "link", "set", iface, "netns", self.netns], timeout=10)
+            if not result.success:
+                self._delete_link()
+                return False, f"Failed to move {iface} into {self.netns}: {result.stderr}"
+            self._in_netns = True
+
+        if self._uses_policy_routing():
+            # wg-quick enables this so replies to marked packets pass rp_filter
+            try:
+                Path("/proc/sys/net/ipv4/conf/all/src_valid_mark").write_text("1")
+            except OSError:
+                logger.warning("Could not enable src_valid_mark")
+
+        for family, lines in self._build_batches().items():
+            if not lines:
+                continue
+            result = run_command(
+                self._ip(family, "-batch", "-"), timeout=10, input="\n".join(lines) + "\n"
+            )
+            if not result.success:
+                self._delete_link()
+                self._remove_policy_rules()
+                return False, f"Failed to configure {iface}: {result.stderr}"
+            if any(line.startswith("rule ") for line in lines):
+                self._policy_families.append(family)
+
+        if self.config.dns and not self.netns:
+            # A namespace gets its resolvers from /etc/netns instead
+            self._set_dns()
+
+        elapsed = (time.monotonic() - start) * 1000
+        logger.info("WireGuard %s up in %.0f ms", iface, elapsed)
+        return True, f"WireGuard interface {iface} up"
+
+    def down(self) -> tuple[bool, str]:
+        """Remove the interface together with its rules and DNS entries.
+
+        Returns:
+            (success, message) tuple.
+        """
+        start = time.monotonic()
+        if self._dns_set:
+            run_command(["resolvconf", "-d", f"tun.{self.interface}", "-f"], timeout=10)
+            self._dns_set = False
+        self._remove_policy_rules()
+
+        # Deleting the link drops its addresses and routes with it
+        result = self._delete_link()
+        if not result:
+            return False, f"Failed to delete {self.interface}"
+
+        elapsed = (time.monotonic() - start) * 1000
+        logger.info("WireGuard %s down in %.0f ms", self.interface, elapsed)
+        return True, f"WireGuard interface {self.interface} down"
+
+    def _ip(self, *args: str) -> list[str]:
+        """An ``ip`` command aimed at the namespace holding the interface."""
+        return ["ip", "-n", self.netns, *args] if self._in_netns else ["ip", *args]
+
+    def _delete_link(self) -> bool:
+        result = run_command(self._ip("link", "del", self.interface), timeout=10)
+        self._in_netns = False
+        return result.success
+
+    def _remove_policy_rules(self) -> None:
+        mark = self.config.fwmark or _DEFAULT_TABLE
+        for family in self._policy_families:
+            run_command(
+                ["ip", "-force", family, "-batch", "-"],
+                timeout=10,
+                input=f"rule del table {mark}\nrule del table main suppress_prefixlength 0\n",
+            )
+        self._policy_families.clear()
+
+    def _set_dns(self) -> None:
+        if not is_available("resolvconf"):
+            logger.warning("resolvconf not found, DNS from %s not applied", self.interface)
+            return
+        nameservers = "".join(f"nameserver {server}\n" for server in self.config.dns)
+        result = run_command(
+            ["resolvconf", "-a", f"tun.{self.interface}", "-m", "0", "-x"],
+            timeout=10,
+            input=nameservers,
+        )
+        self._dns_set = result.success
+        if not result.success:
+            logger.warning("Failed to set DNS for %s: %s", self.interface, result.stderr)
+
+
+def benchmark_against_wg_quick(config_file: str, rounds: int = 5) -> dict[str, float]:
+    """Measure up/down latency of the native backend against wg-quick.
+
+    Each round brings the tunnel up and down with both backends; medians are
+    reported in milliseconds.
+
+    Returns:
+        Dict with ``native_up``, ``native_down``, ``wg_quick_up`` and
+        ``wg_quick_down`` median latencies.
+    """
+    samples: dict[str, list[float]] = {
+        "native_up": [], "native_down": [], "wg_quick_up": [], "wg_quick_down": [],
+    }
+
+    def _timed(key: str, func: Callable[[], bool]) -> bool:
+        start = time.monotonic()
+        ok = func()
+        samples[key].append((time.monotonic() - start) * 1000)
+        return ok
+
+    def _native(step: Callable[[], tuple[bool, str]]) -> bool:
+        return step()[0]
+
+    def _wg_quick(action: str) -> bool:
+        return run_command(["wg-quick", action, config_file], timeout=30).success
+
+    for _ in range(rounds):
+        tunnel = WireGuardTunnel(parse_config(config_file))
+        if _timed("native_up", partial(_native, tunnel.up)):
+            _timed("native_down", partial(_native, tunnel.down))
+
+        if _timed("wg_quick_up", partial(_wg_quick, "up")):
+            _timed("wg_quick_down", partial(_wg_quick, "down"))
+
+    results = {key: statistics.median(values) for key, values in samples.items() if values}
+    logger.info("WireGuard up/down latency (ms): %s", results)
+    return results
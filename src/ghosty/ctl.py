@@ -0,0 +1,166 @@
+"""``ghosty ctl`` — command-line client for the headless daemon."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import sys
+from typing import Any, Iterator
+
+from ghosty.config import DaemonConfig
+
+
+def request(
+    payload: dict[str, Any], socket_path: str = DaemonConfig.socket, *, timeout: float = 120
+) -> dict[str, Any]:
+    """Send one request to the daemon and return its decoded reply.
+
+    Raises:
+        OSError: If the daemon cannot be reached or closes the connection.
+        ValueError: If the reply is not a JSON object.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("Daemon closed the connection without replying")
+    reply = json.loads(line)
+    if not isinstance(reply, dict):
+        raise ValueError(f"Unexpected reply from daemon: {line.decode(errors='replace')!r}")
+    return reply
+
+
+def watch(socket_path: str = DaemonConfig.socket) -> Iterator[dict[str, Any]]:
+    """Yield daemon events as they arrive, until the connection closes."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(b'{"cmd": "watch"}\n')
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                yield json.loads(line)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ghosty ctl", description=__doc__)
+    parser.add_argument("--socket", default=None,
+                        help="daemon control socket (default from config)")
+    parser.add_argument("--timeout", type=float, default=120,
+                        help="seconds to wait for a reply")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    start = sub.add_parser("start", help="start anonymization")
+    start.add_argument("--profile", help="start a [profiles.<name>] setup from the config")
+    start.add_argument("--mode", help="Normal, Standard or Enhanced")
+    start.add_argument("--interface", help="network interface to modify")
+    start.add_argument("--vpn-config", help="VPN config file")
+    start.add_argument("--vpn-auth", help="VPN auth file")
+    start.add_argument("--provider", choices=["openvpn", "wireguard"], help="VPN provider")
+
+    sub.add_parser("stop", help="stop anonymization and restore the system")
+    status = sub.add_parser("status", help="show the daemon state")
+    status.add_argument("--json", action="store_true", help="print the raw JSON reply")
+    sub.add_parser("rotate", help="request a new TOR identity")
+    sub.add_parser("watch", help="stream events as JSON lines until interrupted")
+
+    identity = sub.add_parser("identity", help="manage namespace-isolated identities")
+    actions = identity.add_subparsers(dest="action", required=True)
+    start_identity = actions.add_parser("start", help="start an identity")
+    start_identity.add_argument("name")
+    start_identity.add_argument("--vpn-config", help="VPN config file")
+    start_identity.add_argument("--vpn-auth", help="VPN auth file")
+    start_identity.add_argument("--provider", choices=["openvpn", "wireguard"],
+                                help="VPN provider")
+    start_identity.add_argument("--tor", action="store_true", help="route through TOR")
+    stop_identity = actions.add_parser("stop", help="stop an identity")
+    stop_identity.add_argument("name")
+    list_identity = actions.add_parser("list", help="show running identities and their cost")
+    list_identity.add_argument("--json", action="store_true", help="print the raw JSON reply")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run one ctl command; returns 0 on success and 1 on failure."""
+    args = _build_parser().parse_args(argv)
+
+    socket_path = args.socket
+    if socket_path is None:
+        from ghosty.config import load_config
+
+        socket_path = load_config().daemon.socket
+
+    if args.cmd == "watch":
+        return _watch(socket_path)
+
+    payload: dict[str, Any] = {"cmd": args.cmd}
+    if args.cmd == "start":
+        for key in ("profile", "mode", "interface", "vpn_config", "vpn_auth", "provider"):
+            value = getattr(args, key)
+            if value:
+                payload[key] = value
+    elif args.cmd == "identity":
+        payload["action"] = args.action
+        for key in ("name", "vpn_config", "vpn_auth", "provider", "tor"):
+            value = getattr(args, key, None)
+            if value:
+                payload[key] = value
+
+    try:
+        reply = request(payload, socket_path, timeout=args.timeout)
+    except (OSError, ValueError) as e:
+        print(f"Cannot reach ghosty daemon at {socket_path}: {e}", file=sys.stderr)
+        return 1
+
+    if getattr(args, "json", False):
+        print(json.dumps(reply, indent=2))
+    elif args.cmd == "status" and reply.get("ok"):
+        print(reply["message"])
+        if reply.get("active"):
+            print(f"  Interface: {reply['interface']}")
+        print(f"  VPN:       {reply['vpn']} ({reply['vpn_state']})")
+        print(f"  TOR:       {'running' if reply['tor'] else 'stopped'}")
+    elif args.cmd == "identity" and args.action == "list" and reply.get("ok"):
+        _print_identities(reply["identities"])
+    else:
+        stream = sys.stdout if reply.get("ok") else sys.stderr
+        print(reply.get("message", ""), file=stream)
+    return 0 if reply.get("ok") else 1
+
+
+def _print_identities(identities: list[dict[str, Any]]) -> None:
+    if not identities:
+        print("No identities running")
+        return
+    print(f"{'NAME':<16} {'PROCS':>5} {'THREADS':>7} {'RSS MiB':>8} {'CPU s':>7} "
+          f"{'FDS':>5} {'SETUP s':>7}  EGRESS")
+    for item in identities:
+        egress = ", ".join(filter(None, [
+            f"VPN {item['vpn']}" if item["vpn"] is not None else "",
+            f"TOR {'up' if item['tor'] else 'down'}" if item["tor"] is not None else "",
+        ]))
+        print(f"{item['name']:<16} {item['processes']:>5} {item['threads']:>7} "
+              f"{item['rss_bytes'] / 2**20:>8.1f} {item['cpu_seconds']:>7.1f} "
+              f"{item['open_files']:>5} {item['setup_seconds']:>7.1f}  {egress}")
+    total = sum(item["rss_bytes"] for item in identities) / 2**20
+    print(f"{len(identities)} identities, {total:.1f} MiB resident "
+          f"({total / len(identities):.1f} MiB each)")
+
+
+def _watch(socket_path: str) -> int:
+    try:
+        events = watch(socket_path)
+        ack = next(events)
+        if not ack.get("ok"):
+            print(ack.get("message", ""), file=sys.stderr)
+            return 1
+        for event in events:
+            print(json.dumps(event), flush=True)
+    except KeyboardInterrupt:
+        return 0
+    except (OSError, ValueError, StopIteration) as e:
+        print(f"Cannot reach ghosty daemon at {socket_path}: {e}", file=sys.stderr)
+        return 1
+    return 0
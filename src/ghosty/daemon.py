@@ -0,0 +1,406 @@
+"""Headless daemon — runs the Orchestrator behind a Unix-socket control API.
+
+The daemon never imports the GUI. Clients send one JSON object per line and
+receive one JSON object per line in reply::
+
+    {"cmd": "start", "mode": "Standard", "interface": "wlan0"}
+    {"ok": true, "message": "Standard mode started"}
+
+Commands are ``start``, ``stop``, ``status``, ``rotate`` and ``identity``
+(start, stop or list namespace-isolated identities). ``start`` takes
+either a mode and its settings or ``"profile": "<name>"`` to launch a
+precompiled ``[profiles.<name>]`` plan. Clients are
+served concurrently by asyncio; commands that change state are serialized,
+while ``status`` is always answered immediately. ``watch`` turns the
+connection into a stream of orchestrator events, one JSON object per line.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import signal
+import socket
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from ghosty.config import DaemonConfig, GhostyConfig, IdentityConfig, load_config
+from ghosty.core import preflight
+from ghosty.core.identity import IdentityManager, validate_name
+from ghosty.core.orchestrator import Orchestrator, parse_mode
+from ghosty.core.profiles import PlanCache, launch
+from ghosty.events import Event, to_dict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = DaemonConfig.socket
+
+_MAX_REQUEST = 64 * 1024  # Bytes per request line
+_WATCH_BACKLOG = 100  # Event batches buffered per watching client
+
+
+class Daemon:
+    """Serves control requests for one Orchestrator on a Unix socket."""
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        socket_path: str = DEFAULT_SOCKET,
+        *,
+        socket_mode: int = 0o660,
+        config: GhostyConfig | None = None,
+        identities: IdentityManager | None = None,
+    ) -> None:
+        self.orchestrator = orchestrator
+        self.identities = identities or IdentityManager(events=orchestrator.events)
+        self.socket_path = Path(socket_path)
+        self.socket_mode = socket_mode
+        self.config = config or GhostyConfig()
+        self.plans = PlanCache()
+        self._commands: dict[str, Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]] = {
+            "start": self._cmd_start,
+            "stop": self._cmd_stop,
+            "status": self._cmd_status,
+            "rotate": self._cmd_rotate,
+            "identity": self._cmd_identity,
+        }
+        self._lock: asyncio.Lock | None = None
+        self._shutdown: asyncio.Event | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._clients: set[asyncio.Task[None]] = set()
+
+    async def start(self) -> None:
+        """Bind the control socket and begin accepting clients."""
+        self._lock = asyncio.Lock()
+        self._shutdown = asyncio.Event()
+        self._prepare_socket()
+        self._server = await asyncio.start_unix_server(
+            self._handle_client, path=str(self.socket_path), limit=_MAX_REQUEST
+        )
+        os.chmod(self.socket_path, self.socket_mode)
+        logger.info("Listening on %s", self.socket_path)
+
+    async def serve(self) -> None:
+        """Serve until ``request_shutdown`` is called, then clean up."""
+        if self._server is None:
+            await self.start()
+        assert self._shutdown is not None
+        try:
+            await self._shutdown.wait()
+        finally:
+            await self.close()
+
+    def request_shutdown(self) -> None:
+        """Ask ``serve`` to return; safe to call from signal handlers."""
+        if self._shutdown is not None:
+            self._shutdown.set()
+
+    async def close(self) -> None:
+        """Stop accepting clients, tear down active layers and remove the socket."""
+        if self._server is not None:
+            self._server.close()
+            # Watchers never finish on their own; end them before waiting
+            clients = list(self._clients)
+            for task in clients:
+                task.cancel()
+            await asyncio.gather(*clients, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        loop = asyncio.get_running_loop()
+        if self.orchestrator.is_active:
+            logger.info("Shutting down, stopping active layers")
+            await loop.run_in_executor(None, self.orchestrator.stop)
+        await loop.run_in_executor(None, self.identities.stop_all)
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+    def _prepare_socket(self) -> None:
+        """Create the socket directory and clear a stale socket file.
+
+        Raises:
+            RuntimeError: If another daemon is already listening.
+        """
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            self.socket_path.unlink()
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._clients.add(task)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._reply(writer, {"ok": False, "message": "Request too large"})
+                    break
+                if not line:
+                    break
+                if _is_watch(line):
+                    await self._watch(writer)
+                    break
+                response = await self.dispatch(line)
+                await self._reply(writer, response)
+        except ConnectionError:
+            pass
+        finally:
+            if task is not None:
+                self._clients.discard(task)
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def _watch(self, writer: asyncio.StreamWriter) -> None:
+        """Stream events to the client until it disconnects."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[list[Event]] = asyncio.Queue(maxsize=_WATCH_BACKLOG)
+
+        def _enqueue(batch: list[Event]) -> None:
+            with contextlib.suppress(asyncio.QueueFull):
+                queue.put_nowait(batch)
+
+        def _deliver(batch: list[Event]) -> None:
+            loop.call_soon_threadsafe(_enqueue, batch)
+
+        subscription = self.orchestrator.events.subscribe(
+            _deliver, interval=0.1, name="daemon-watch",
+        )
+        try:
+            await self._reply(writer, {"ok": True, "message": "Watching events"})
+            while True:
+                batch = await queue.get()
+                for event in batch:
+                    writer.write(json.dumps(to_dict(event), default=str).encode() + b"\n")
+                await writer.drain()
+        finally:
+            subscription.close()
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, response: dict[str, Any]) -> None:
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def dispatch(self, line: bytes | str) -> dict[str, Any]:
+        """Decode one request line and run its command."""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"ok": False, "message": "Invalid JSON"}
+        if not isinstance(request, dict):
+            return {"ok": False, "message": "Request must be a JSON object"}
+
+        command = self._commands.get(str(request.get("cmd", "")))
+        if command is None:
+            choices = ", ".join(self._commands)
+            return {"ok": False, "message": f"Unknown command (choose from {choices})"}
+        try:
+            return await command(request)
+        except Exception as e:
+            logger.exception("Command %s failed", request.get("cmd"))
+            return {"ok": False, "message": str(e)}
+
+    async def _locked(self, func: Callable[..., tuple[bool, str]], *args: Any) -> dict[str, Any]:
+        """Run a blocking state change off the loop, one at a time."""
+        assert self._lock is not None
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            success, message = await loop.run_in_executor(None, func, *args)
+        return {"ok": success, "message": message}
+
+    def update_config(self, config: GhostyConfig) -> None:
+        """Use a reloaded config for later commands and recompile its profiles."""
+        self.config = config
+        self.plans.compile_all(config)
+
+    async def _cmd_start(self, request: dict[str, Any]) -> dict[str, Any]:
+        if request.get("profile"):
+            return await self._start_profile(str(request["profile"]), request)
+
+        mode = parse_mode(str(request.get("mode") or self.config.general.default_mode))
+        interface = request.get("interface") or self.config.general.default_interface
+        if not interface:
+            return {"ok": False, "message": "No interface given and no default configured"}
+
+        vpn_config = request.get("vpn_config") or ""
+        vpn_auth = request.get("vpn_auth") or None
+        if "vpn" in mode.layers:
+            vpn_config = vpn_config or self.config.vpn.config_path
+            vpn_auth = vpn_auth or self.config.vpn.auth_path or None
+            if not vpn_config:
+                return {"ok": False, "message": "VPN config required for this mode"}
+        provider = str(request["provider"]) if request.get("provider") else None
+
+        def _start() -> tuple[bool, str]:
+            # Under the state lock, so a start already running keeps its
+            # settings. A profile started earlier may have left its own
+            # backends on the managers, and a reload during a session only
+            # applied the rotation interval.
+            if not self.orchestrator.is_active:
+                self.orchestrator.apply_config(self.config)
+            if provider and "vpn" in mode.layers:
+                self.orchestrator.vpn.provider = provider
+            return self.orchestrator.start(
+                mode, interface, vpn_config=vpn_config, vpn_auth=vpn_auth,
+                vpn_fallbacks=self.config.vpn.fallback_configs,
+            )
+
+        return await self._locked(_start)
+
+    async def _start_profile(self, name: str, request: dict[str, Any]) -> dict[str, Any]:
+        """Start a configured profile; only the interface may be overridden."""
+        try:
+            plan = self.plans.get(name, self.config)
+        except ValueError as e:
+            return {"ok": False, "message": str(e)}
+        if request.get("interface"):
+            plan = replace(plan, interface=str(request["interface"]))
+
+        def _launch() -> tuple[bool, str]:
+            # Settings the profile does not set come from the current config
+            if not self.orchestrator.is_active:
+                self.orchestrator.apply_config(self.config)
+            return launch(self.orchestrator, plan)
+
+        return await self._locked(_launch)
+
+    async def _cmd_stop(self, request: dict[str, Any]) -> dict[str, Any]:
+        return await self._locked(self.orchestrator.stop)
+
+    async def _cmd_rotate(self, request: dict[str, Any]) -> dict[str, Any]:
+        mode = self.orchestrator.current_mode
+        if not self.orchestrator.is_active or mode is None or "tor" not in mode.layers:
+            return {"ok": False, "message": "TOR is not active"}
+        return await self._locked(self.orchestrator.tor.rotate_ip)
+
+    async def _cmd_identity(self, request: dict[str, Any]) -> dict[str, Any]:
+        # Identities run independently of the host-wide mode, so they do
+        # not take the state lock; the manager serializes per identity.
+        loop = asyncio.get_running_loop()
+        action = str(request.get("action") or "list")
+        if action == "list":
+            identities = await loop.run_in_executor(None, self.identities.running)
+            return {"ok": True, "message": f"{len(identities)} identities running",
+                    "identities": identities}
+
+        name = validate_name(str(request.get("name") or ""))
+        if action == "start":
+            config = self._identity_config(name, request)
+            success, message = await loop.run_in_executor(
+                None, self.identities.start, name, config
+            )
+        elif action == "stop":
+            success, message = await loop.run_in_executor(None, self.identities.stop, name)
+        else:
+            return {"ok": False,
+                    "message": "Unknown identity action (choose from start, stop, list)"}
+        return {"ok": success, "message": message}
+
+    def _identity_config(self, name: str, request: dict[str, Any]) -> IdentityConfig:
+        """The configured identity, with any fields given in the request applied.
+
+        Raises:
+            ValueError: If the identity is neither configured nor described.
+        """
+        overrides = {key: request[key] for key in ("provider", "vpn_config", "vpn_auth", "tor")
+                     if request.get(key)}
+        base = self.config.identities.get(name)
+        if base is None and not overrides:
+            raise ValueError(f"Unknown identity {name}; configure [identities.{name}] "
+                             "or pass --vpn-config/--tor")
+        return replace(base or IdentityConfig(), **overrides)
+
+    async def _cmd_status(self, request: dict[str, Any]) -> dict[str, Any]:
+        orch = self.orchestrator
+        mode = orch.current_mode
+        return {
+            "ok": True,
+            "message": f"{mode.value} mode active" if orch.is_active and mode else "Inactive",
+            "active": orch.is_active,
+            "mode": mode.value if orch.is_active and mode else None,
+            "interface": orch.current_interface if orch.is_active else None,
+            "vpn": orch.vpn.get_status(),
+            "vpn_state": orch.vpn_state,
+            "tor": orch.tor.is_running,
+        }
+
+
+def _is_watch(line: bytes) -> bool:
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return False
+    return isinstance(request, dict) and request.get("cmd") == "watch"
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the daemon in the foreground until SIGTERM or SIGINT."""
+    import argparse
+
+    from ghosty.logger import setup_logging
+    from ghosty.reload import ConfigWatcher
+    from ghosty.tracing import setup_tracing
+
+    started = time.monotonic()
+    parser = argparse.ArgumentParser(prog="ghosty daemon", description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", help="control socket path (default from config)")
+    args = parser.parse_args(argv)
+
+    config = load_config()
+    setup_logging(
+        config.log.level, config.log.file,
+        max_bytes=config.log.max_size, backup_count=config.log.backup_count,
+        rotate_hours=config.log.rotate_hours, compress=config.log.compress,
+        fmt=config.log.format,
+    )
+    setup_tracing(config.trace.enabled, config.trace.path, config.trace.format)
+
+    orchestrator = Orchestrator()
+    orchestrator.apply_config(config)
+
+    daemon = Daemon(
+        orchestrator,
+        args.socket or config.daemon.socket,
+        socket_mode=config.daemon.socket_mode,
+        config=config,
+    )
+
+    # Edits to config.toml apply live; commands read the reloaded config
+    watcher = ConfigWatcher(orchestrator, config, on_reload=daemon.update_config)
+
+    async def _run() -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, daemon.request_shutdown)
+        await daemon.start()
+        watcher.start()
+        logger.info("Daemon ready in %.0f ms", (time.monotonic() - started) * 1000)
+        # Warm the capability cache and profile plans without delaying readiness
+        loop.run_in_executor(None, preflight.capabilities)
+        loop.run_in_executor(None, daemon.plans.compile_all, config)
+        await daemon.serve()
+
+    try:
+        asyncio.run(_run())
+    except RuntimeError as e:
+        logger.error("%s", e)
+        return 1
+    finally:
+        watcher.stop()
+    return 0
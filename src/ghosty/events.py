@@ -0,0 +1,296 @@
+"""Typed in-process event bus with bounded, coalescing per-subscriber queues.
+
+Publishers never block: ``publish`` appends to each matching subscriber's
+queue under a short lock and returns. Events with a ``coalesce_key``
+(state snapshots such as the VPN state) replace any queued event with the
+same key, so a slow subscriber sees the latest state instead of a backlog.
+When a queue is full the oldest event is dropped and the subscriber gets
+an ``EventsDropped`` count with its next batch.
+
+Subscribers either pass a handler, which a dedicated thread calls with
+batches of events, or poll ``Subscription.drain()`` themselves (e.g. from
+a Tk ``after`` callback on the main thread).
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Event:
+    """Base class for all events."""
+
+    timestamp: float = field(default_factory=time.time, kw_only=True)
+
+    @property
+    def coalesce_key(self) -> Hashable | None:
+        """Events sharing a key replace each other while queued; None keeps all."""
+        return None
+
+
+@dataclass(frozen=True)
+class LogMessage(Event):
+    """Human-readable activity message."""
+
+    message: str
+    level: str = "info"
+
+
+@dataclass(frozen=True)
+class StepProgress(Event):
+    """A start or stop step finished."""
+
+    step: str
+    label: str
+    success: bool
+    message: str
+
+
+@dataclass(frozen=True)
+class ModeChanged(Event):
+    """Anonymization was started, stopped or switched."""
+
+    mode: str | None  # None when inactive
+    active: bool
+
+    @property
+    def coalesce_key(self) -> Hashable:
+        return "mode"
+
+
+@dataclass(frozen=True)
+class MACChanged(Event):
+    """An interface's MAC address was changed or restored."""
+
+    interface: str
+    mac: str
+    restored: bool = False
+
+    @property
+    def coalesce_key(self) -> Hashable:
+        return ("mac", self.interface)
+
+
+@dataclass(frozen=True)
+class VPNStateChanged(Event):
+    """VPN client or supervisor state: connected, disconnected, healthy,
+    reconnecting, failed or stopped."""
+
+    state: str
+    message: str = ""
+
+    @property
+    def coalesce_key(self) -> Hashable:
+        return "vpn_state"
+
+
+@dataclass(frozen=True)
+class IPRotated(Event):
+    """TOR rotation produced a new exit IP."""
+
+    ip: str
+
+    @property
+    def coalesce_key(self) -> Hashable:
+        return "tor_ip"
+
+
+@dataclass(frozen=True)
+class IdentityChanged(Event):
+    """An isolated identity was started or stopped."""
+
+    name: str
+    active: bool
+    message: str = ""
+
+    @property
+    def coalesce_key(self) -> Hashable:
+        return ("identity", self.name)
+
+
+@dataclass(frozen=True)
+class InterfacesChanged(Event):
+    """The set of network interfaces, or which of them have an IPv4 address, changed."""
+
+    interfaces: tuple[str, ...]  # Sorted, loopback excluded
+    connected: tuple[str, ...] = ()  # Up with at least one IPv4 address
+
+    @property
+    def coalesce_key(self) -> Hashable:
+        return "interfaces"
+
+
+@dataclass(frozen=True)
+class ConfigReloaded(Event):
+    """config.toml changed on disk and the listed settings were applied."""
+
+    changed: tuple[str, ...]  # "section.key" names
+
+    @property
+    def coalesce_key(self) -> Hashable:
+        return "config"
+
+
+@dataclass(frozen=True)
+class EventsDropped(Event):
+    """Delivered first in a batch when the subscriber's queue overflowed."""
+
+    count: int
+
+
+def to_dict(event: Event) -> dict[str, Any]:
+    """JSON-friendly form of an event, tagged with its type name."""
+    return {"type": type(event).__name__, **asdict(event)}
+
+
+Handler = Callable[[list[Event]], None]
+
+
+class Subscription:
+    """One subscriber's bounded queue and (optionally) its delivery thread."""
+
+    def __init__(
+        self,
+        bus: EventBus,
+        handler: Handler | None,
+        types: tuple[type[Event], ...],
+        maxsize: int,
+        interval: float,
+        name: str,
+    ) -> None:
+        self._bus = bus
+        self.handler = handler
+        self.types = types
+        self.maxsize = maxsize
+        self.interval = interval  # Minimum seconds between handler batches
+        self.name = name
+        self.dropped = 0  # Total over the subscription's lifetime
+        self._pending: OrderedDict[Hashable, Event] = OrderedDict()
+        self._unreported = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        if handler is not None:
+            self._thread = threading.Thread(
+                target=self._deliver, daemon=True, name=f"ghosty-events-{name or id(self)}"
+            )
+            self._thread.start()
+
+    def wants(self, event: Event) -> bool:
+        return isinstance(event, self.types)
+
+    def offer(self, event: Event) -> None:
+        """Queue an event; never blocks beyond the queue lock."""
+        key = event.coalesce_key
+        with self._cond:
+            if self._closed:
+                return
+            if key is None:
+                key = ("seq", next(self._seq))
+            elif key in self._pending:
+                del self._pending[key]  # Re-queue at the tail with the newer value
+            if len(self._pending) >= self.maxsize:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+                self._unreported += 1
+            self._pending[key] = event
+            self._cond.notify()
+
+    def drain(self, max_items: int | None = None) -> list[Event]:
+        """Take queued events, oldest first (for polling subscribers)."""
+        with self._cond:
+            return self._take(max_items)
+
+    def _take(self, max_items: int | None) -> list[Event]:
+        batch: list[Event] = []
+        if self._unreported:
+            batch.append(EventsDropped(self._unreported))
+            self._unreported = 0
+        while self._pending and (max_items is None or len(batch) < max_items):
+            batch.append(self._pending.popitem(last=False)[1])
+        return batch
+
+    def _deliver(self) -> None:
+        assert self.handler is not None
+        while True:
+            with self._cond:
+                while not self._pending and not self._unreported and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                batch = self._take(None)
+            try:
+                self.handler(batch)
+            except Exception:
+                logger.exception("Event subscriber %s failed", self.name or self.handler)
+            if self.interval:
+                # Let events accumulate (and coalesce) before the next batch
+                with self._cond:
+                    self._cond.wait_for(lambda: self._closed, timeout=self.interval)
+
+    def close(self) -> None:
+        """Stop delivery and detach from the bus."""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+        self._bus._remove(self)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+
+
+class EventBus:
+    """Fan-out of events to independent subscribers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscriptions: tuple[Subscription, ...] = ()
+
+    def subscribe(
+        self,
+        handler: Handler | None = None,
+        *,
+        types: tuple[type[Event], ...] = (Event,),
+        maxsize: int = 1000,
+        interval: float = 0.0,
+        name: str = "",
+    ) -> Subscription:
+        """Register a subscriber.
+
+        Args:
+            handler: Called from a dedicated thread with each batch of
+                events; omit to poll ``Subscription.drain()`` instead.
+            types: Event classes to receive (subclasses included).
+            maxsize: Queue bound; the oldest events are dropped beyond it.
+            interval: Minimum seconds between handler batches.
+            name: Label used in thread names and error logs.
+        """
+        subscription = Subscription(self, handler, types, maxsize, interval, name)
+        with self._lock:
+            self._subscriptions = (*self._subscriptions, subscription)
+        return subscription
+
+    def publish(self, event: Event) -> None:
+        """Queue ``event`` for every interested subscriber."""
+        for subscription in self._subscriptions:  # Immutable snapshot, no lock needed
+            if subscription.wants(event):
+                subscription.offer(event)
+
+    def _remove(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+
+    def close(self) -> None:
+        """Close every subscription."""
+        for subscription in self._subscriptions:
+            subscription.close()
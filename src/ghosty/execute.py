@@ -0,0 +1,66 @@
+"""``ghosty exec`` — run a command inside a running identity's namespace.
+
+The command runs as the user who invoked sudo, not as root: the identity's
+firewall only lets root (its tunnel and TOR clients) use the namespace's
+direct uplink, so unprivileged workloads cannot bypass the tunnel.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+from ghosty.core.netns import exists, in_netns, netns_name
+
+
+def command(identity: str, argv: list[str], *, uid: int | None, gid: int | None) -> list[str]:
+    """The full command line that enters ``identity`` and runs ``argv``.
+
+    Args:
+        identity: Identity name.
+        argv: Workload command and arguments.
+        uid: User to drop to inside the namespace; None keeps root.
+        gid: Primary group to drop to.
+    """
+    if uid is not None and gid is not None:
+        argv = ["setpriv", f"--reuid={uid}", f"--regid={gid}", "--init-groups", "--", *argv]
+    return in_netns(netns_name(identity), argv)
+
+
+def _invoking_user() -> tuple[int | None, int | None]:
+    """The sudo caller's uid/gid, or (None, None) when run as root directly."""
+    uid, gid = os.environ.get("SUDO_UID"), os.environ.get("SUDO_GID")
+    if uid and gid and uid != "0":
+        return int(uid), int(gid)
+    return None, None
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Replace this process with the workload; returns 1 only on error."""
+    parser = argparse.ArgumentParser(prog="ghosty exec", description=__doc__.splitlines()[0])
+    parser.add_argument("--identity", "-i", required=True, help="identity to run inside")
+    parser.add_argument("--as-root", action="store_true",
+                        help="keep root inside the namespace (bypasses the firewall)")
+    parser.add_argument("argv", nargs=argparse.REMAINDER, help="command to run")
+    args = parser.parse_args(argv)
+
+    workload = args.argv[1:] if args.argv[:1] == ["--"] else args.argv
+    if not workload:
+        parser.error("no command given")
+    if not exists(netns_name(args.identity)):
+        print(f"Identity {args.identity} is not running (start it with "
+              f"`ghosty ctl identity start {args.identity}`)", file=sys.stderr)
+        return 1
+
+    uid, gid = (None, None) if args.as_root else _invoking_user()
+    if uid is None and not args.as_root:
+        print("[!] Not started through sudo; the command runs as root and is not "
+              "confined to the identity's tunnel", file=sys.stderr)
+
+    cmd = command(args.identity, workload, uid=uid, gid=gid)
+    try:
+        os.execvp(cmd[0], cmd)
+    except OSError as e:
+        print(f"Cannot run {cmd[0]}: {e}", file=sys.stderr)
+    return 1
@@ -1,5 +1,19 @@
 """Ghosty GUI — CustomTkinter-based graphical interface."""
 
-from ghosty.gui.main_window import MainWindow
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ghosty.gui.main_window import MainWindow
 
 __all__ = ["MainWindow"]
+
+
+def __getattr__(name: str) -> Any:
+    # Defer customtkinter and the panels until the window is actually built
+    if name == "MainWindow":
+        from ghosty.gui.main_window import MainWindow
+
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
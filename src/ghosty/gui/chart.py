@@ -0,0 +1,129 @@
+"""Live throughput chart — rx/tx rate and latency from telemetry ring buffers."""
+
+from __future__ import annotations
+
+from typing import Callable
+
+import customtkinter as ctk
+
+from ghosty.core.telemetry import TelemetrySampler, format_rate
+
+_RX_COLOR = "#22c55e"
+_TX_COLOR = "#3b82f6"
+_LATENCY_COLOR = "#f59e0b"
+_MIN_RATE_SCALE = 1000.0  # 1 kB/s, so an idle link draws flat rather than noise
+
+
+def _polyline(values: list[float], width: int, height: int, scale: float,
+              count: int) -> list[float]:
+    """Canvas coordinates for ``values`` right-aligned in a ``count``-slot window."""
+    if len(values) < 2:
+        return [0.0, float(height), 0.0, float(height)]
+    step = width / max(1, count - 1)
+    x0 = width - step * (len(values) - 1)
+    usable = height - 2
+    points: list[float] = []
+    for i, value in enumerate(values):
+        points.append(x0 + i * step)
+        points.append(height - 1 - min(value / scale, 1.0) * usable)
+    return points
+
+
+class ThroughputChart(ctk.CTkFrame):
+    """Sparkline chart of a ``TelemetrySampler``'s rx/tx rate and latency.
+
+    The chart polls its source at most ``1000 / FRAME_MS`` times a second
+    and only redraws when the sampler has appended new samples (the ring
+    buffers' ``total`` counters). Lines are long-lived canvas items whose
+    coordinates are replaced, so a redraw allocates no widgets. With no
+    source attached nothing is scheduled at all.
+    """
+
+    FRAME_MS = 500  # Redraw cap; telemetry samples once per second
+    WINDOW = 120  # Samples shown (two minutes at the default interval)
+
+    def __init__(self, master: ctk.CTkFrame, *, height: int = 60) -> None:
+        super().__init__(master, fg_color="transparent")
+        self._source: Callable[[], TelemetrySampler | None] | None = None
+        self._sampler: TelemetrySampler | None = None
+        self._seen: int | None = -1  # Sample total at the last redraw; None while waiting
+        self._frame_after: str | None = None
+        self._size = (1, height)
+
+        self._canvas = ctk.CTkCanvas(self, height=height, bg="#111827", highlightthickness=0)
+        self._canvas.pack(fill="x")
+        self._rx = self._canvas.create_line(0, 0, 0, 0, fill=_RX_COLOR, width=1.5)
+        self._tx = self._canvas.create_line(0, 0, 0, 0, fill=_TX_COLOR, width=1.5)
+        self._latency = self._canvas.create_line(0, 0, 0, 0, fill=_LATENCY_COLOR, dash=(2, 2))
+        self._canvas.bind("<Configure>", self._on_resize)
+
+        self._legend = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=11),
+                                    text_color="gray")
+        self._legend.pack(anchor="w")
+
+    def set_source(self, source: Callable[[], TelemetrySampler | None] | None) -> None:
+        """Chart whatever sampler ``source`` returns (re-resolved each frame).
+
+        A callable rather than a sampler, because the VPN replaces its
+        sampler when the tunnel device appears or is reconnected.
+        """
+        self._source = source
+        self._sampler = None
+        self._seen = -1
+        if self._frame_after is not None:
+            self.after_cancel(self._frame_after)
+            self._frame_after = None
+        if source is None:
+            self._clear()
+        else:
+            self._frame()
+
+    def _frame(self) -> None:
+        self._frame_after = self.after(self.FRAME_MS, self._frame)
+        sampler = self._source() if self._source is not None else None
+        if sampler is not self._sampler:
+            self._sampler, self._seen = sampler, -1
+        if sampler is None:
+            if self._seen is not None:
+                self._clear()
+                self._legend.configure(text="Waiting for telemetry…")
+                self._seen = None
+            return
+        total = sampler.series["rx_rate"].total + sampler.series["latency"].total
+        if total != self._seen:
+            self._seen = total
+            self._draw(sampler)
+
+    def _draw(self, sampler: TelemetrySampler) -> None:
+        width, height = self._size
+        rx = sampler.values("rx_rate", self.WINDOW)
+        tx = sampler.values("tx_rate", self.WINDOW)
+        latency = sampler.values("latency", self.WINDOW)
+
+        rate_scale = max(_MIN_RATE_SCALE, *rx, *tx) * 1.1 if rx or tx else _MIN_RATE_SCALE
+        self._canvas.coords(self._rx, *_polyline(rx, width, height, rate_scale, self.WINDOW))
+        self._canvas.coords(self._tx, *_polyline(tx, width, height, rate_scale, self.WINDOW))
+        latency_scale = max(50.0, *latency) * 1.1 if latency else 1.0
+        self._canvas.coords(
+            self._latency, *_polyline(latency, width, height, latency_scale, self.WINDOW)
+        )
+
+        legend = (f"↓ {format_rate(rx[-1] if rx else None)}   "
+                  f"↑ {format_rate(tx[-1] if tx else None)}")
+        if latency:
+            legend += f"   ⏱ {latency[-1]:.0f} ms"
+        legend += f"   ({sampler.interface})"
+        if self._legend.cget("text") != legend:
+            self._legend.configure(text=legend)
+
+    def _clear(self) -> None:
+        for item in (self._rx, self._tx, self._latency):
+            self._canvas.coords(item, 0, 0, 0, 0)
+        self._legend.configure(text="")
+
+    def _on_resize(self, event: object) -> None:
+        size = (max(1, getattr(event, "width", 1)), max(1, getattr(event, "height", 1)))
+        if size != self._size:
+            self._size = size
+            if self._seen is not None:
+                self._seen = -1  # Force a redraw at the new size
@@ -1,14 +1,21 @@
-"""Interface panel — lets the user select and refresh network interfaces."""
+"""Interface panel — lets the user select a network interface."""
 
 from __future__ import annotations
 
 import customtkinter as ctk
 
-from ghosty.utils.network import get_interfaces
+from ghosty.events import InterfacesChanged
+
+_SCANNING = "Scanning…"
 
 
 class InterfacePanel(ctk.CTkFrame):
-    """Network interface selector."""
+    """Network interface selector.
+
+    The list is filled and kept current by ``set_interfaces``, which the
+    main window calls with ``InterfacesChanged`` events from the netlink
+    watcher, so building the panel never enumerates interfaces.
+    """
 
     def __init__(self, master: ctk.CTk) -> None:
         super().__init__(master, corner_radius=8)
@@ -20,28 +27,42 @@ class InterfacePanel(ctk.CTkFrame):
         title.grid(row=0, column=0, columnspan=2, padx=10, pady=(10, 5), sticky="w")
 
         # Interface dropdown
-        self._interfaces = get_interfaces()
-        self._selected = ctk.StringVar(value=self._interfaces[0] if self._interfaces else "eth0")
+        self._interfaces: tuple[str, ...] = ()
+        self._selected = ctk.StringVar(value=_SCANNING)
 
         self._dropdown = ctk.CTkOptionMenu(
-            self, variable=self._selected, values=self._interfaces, width=160
+            self, variable=self._selected, values=[_SCANNING], width=160
         )
         self._dropdown.grid(row=1, column=0, padx=10, pady=5, sticky="w")
 
-        # Refresh button
-        self._refresh_btn = ctk.CTkButton(
-            self, text="↻ Refresh", width=80, command=self._refresh
-        )
-        self._refresh_btn.grid(row=1, column=1, padx=(5, 10), pady=5, sticky="e")
+        # Connectivity of the selected interface
+        self._state = ctk.CTkLabel(self, text="", text_color="gray")
+        self._state.grid(row=1, column=1, padx=(5, 10), pady=5, sticky="e")
+        self._connected: tuple[str, ...] = ()
+        self._selected.trace_add("write", lambda *_args: self._update_state())
 
     @property
     def selected(self) -> str:
-        """Return the selected interface name."""
-        return self._selected.get()
-
-    def _refresh(self) -> None:
-        """Re-scan available interfaces."""
-        self._interfaces = get_interfaces()
-        self._dropdown.configure(values=self._interfaces)
-        if self._interfaces:
-            self._selected.set(self._interfaces[0])
+        """Return the selected interface name, or "" before any are known."""
+        name = self._selected.get()
+        return name if name in self._interfaces else ""
+
+    def set_interfaces(self, event: InterfacesChanged) -> None:
+        """Show the current interfaces, keeping the selection if it still exists."""
+        self._interfaces = event.interfaces
+        self._connected = event.connected
+        self._dropdown.configure(values=list(event.interfaces) or ["(none)"])
+        if self._selected.get() not in event.interfaces:
+            # Prefer an interface that actually has an address
+            fallback = event.connected or event.interfaces
+            self._selected.set(fallback[0] if fallback else "(none)")
+        self._update_state()
+
+    def _update_state(self) -> None:
+        name = self._selected.get()
+        if name not in self._interfaces:
+            self._state.configure(text="")
+        elif name in self._connected:
+            self._state.configure(text="● connected", text_color="#22c55e")
+        else:
+            self._state.configure(text="○ no address", text_color="gray")
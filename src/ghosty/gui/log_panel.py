@@ -1,15 +1,67 @@
-"""Log panel — scrollable activity log."""
+"""Log panel — searchable, virtualized activity log."""
 
 from __future__ import annotations
 
+import logging
+import time
+
 import customtkinter as ctk
 
+from ghosty.utils.logbuffer import LogBuffer
+from ghosty.utils.logstore import LogFilter, LogRecord, LogStore, LogView
+
+_LEVELS = {
+    "All levels": logging.NOTSET,
+    "Info+": logging.INFO,
+    "Warnings+": logging.WARNING,
+    "Errors": logging.ERROR,
+}
+_ALL_SOURCES = "All sources"
+_GUI_SOURCE = "ghosty.gui"
+
+Entry = tuple[float, int, str, str]  # (timestamp, level, source, message)
+
+
+class _PanelHandler(logging.Handler):
+    """Forwards log records to a LogPanel without touching Tk."""
+
+    def __init__(self, buffer: LogBuffer[Entry]) -> None:
+        super().__init__()
+        self._buffer = buffer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+            if record.exc_info and record.exc_info[1] is not None:
+                message = f"{message}: {record.exc_info[1]!r}"
+            self._buffer.push((record.created, record.levelno, record.name, message))
+        except Exception:
+            self.handleError(record)
+
 
 class LogPanel(ctk.CTkFrame):
-    """Scrollable text area displaying activity logs."""
+    """Activity log with search, level and source filters.
+
+    Records arrive through ``append`` or the logging ``handler`` from any
+    thread and are queued in a ``LogBuffer``. Once per frame the
+    queue is drained into a ``LogStore`` and the filtered ``LogView``
+    catches up incrementally. The textbox only ever holds the rows in view,
+    so rendering cost does not depend on how many records are stored.
+    """
 
-    def __init__(self, master: ctk.CTk) -> None:
+    FLUSH_MS = 100  # Frame cadence for draining the queue and redrawing
+
+    def __init__(self, master: ctk.CTk, *, capacity: int = 100_000) -> None:
         super().__init__(master, corner_radius=8)
+        self._buffer: LogBuffer[Entry] = LogBuffer(10_000)
+        self._store = LogStore(capacity)
+        self._view = LogView(self._store)
+        self._rows = 10  # Rows that fit in the textbox
+        self._follow = True  # Stick to the newest record
+        self._top_id = 0  # First visible record when not following
+        self._dirty = True
+        self._filter_job: str | None = None
+        self._font = ctk.CTkFont(family="Consolas", size=11)
 
         # Title row
         title_row = ctk.CTkFrame(self, fg_color="transparent")
@@ -25,22 +77,177 @@ class LogPanel(ctk.CTkFrame):
         )
         clear_btn.pack(side="right")
 
-        # Log text area
+        self._count = ctk.CTkLabel(title_row, text="", text_color="gray")
+        self._count.pack(side="right", padx=10)
+
+        # Filter row
+        filter_row = ctk.CTkFrame(self, fg_color="transparent")
+        filter_row.pack(fill="x", padx=10, pady=(0, 5))
+
+        self._search = ctk.CTkEntry(filter_row, placeholder_text="Search")
+        self._search.pack(side="left", fill="x", expand=True)
+        self._search.bind("<KeyRelease>", self._schedule_filter)
+
+        self._level = ctk.StringVar(value="All levels")
+        ctk.CTkOptionMenu(
+            filter_row, variable=self._level, values=list(_LEVELS), width=110,
+            command=lambda _value: self._apply_filter(),
+        ).pack(side="left", padx=(5, 0))
+
+        self._source = ctk.StringVar(value=_ALL_SOURCES)
+        self._source_menu = ctk.CTkOptionMenu(
+            filter_row, variable=self._source, values=[_ALL_SOURCES], width=140,
+            command=lambda _value: self._apply_filter(),
+        )
+        self._source_menu.pack(side="left", padx=(5, 0))
+
+        # Log rows: only the visible window is ever inserted
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        self._scrollbar = ctk.CTkScrollbar(body, command=self._on_scrollbar)
+        self._scrollbar.pack(side="right", fill="y")
+
         self._text = ctk.CTkTextbox(
-            self, font=ctk.CTkFont(family="Consolas", size=11), height=180
+            body, font=self._font, height=180, wrap="none", activate_scrollbars=False
         )
-        self._text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self._text.pack(side="left", fill="both", expand=True)
+        self._text.tag_config("DEBUG", foreground="gray")
+        self._text.tag_config("WARNING", foreground="#f59e0b")
+        self._text.tag_config("ERROR", foreground="#ef4444")
         self._text.configure(state="disabled")
 
-    def append(self, message: str) -> None:
-        """Append a message to the log."""
-        self._text.configure(state="normal")
-        self._text.insert("end", f"{message}\n")
-        self._text.see("end")
-        self._text.configure(state="disabled")
+        self._text.bind("<Configure>", self._on_resize)
+        self._text.bind("<MouseWheel>", self._on_wheel)
+        self._text.bind("<Button-4>", lambda _e: self._scroll(-3))
+        self._text.bind("<Button-5>", lambda _e: self._scroll(3))
+
+        self.after(self.FLUSH_MS, self._flush)
+
+    def handler(self) -> logging.Handler:
+        """A logging handler that feeds this panel; safe on any thread."""
+        return _PanelHandler(self._buffer)
+
+    def append(self, message: str, level: int = logging.INFO) -> None:
+        """Add a GUI message to the log; safe from any thread."""
+        self._buffer.push((time.time(), level, _GUI_SOURCE, message))
+
+    # --- Model updates ---
+
+    def _flush(self) -> None:
+        """Move queued records into the store and redraw if anything changed."""
+        entries, dropped = self._buffer.take()
+        if dropped:
+            self._store.append(time.time(), logging.WARNING, _GUI_SOURCE,
+                               f"{dropped} log records dropped")
+        if entries or dropped:
+            known_sources = len(self._store.sources)
+            for entry in entries:
+                self._store.append(*entry)
+            if len(self._store.sources) != known_sources:
+                self._source_menu.configure(values=[_ALL_SOURCES, *self._store.sources])
+            self._view.refresh()
+            self._dirty = True
+        if self._dirty:
+            self._render()
+        self.after(self.FLUSH_MS, self._flush)
+
+    def _schedule_filter(self, _event: object = None) -> None:
+        """Debounce typing in the search box."""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(150, self._apply_filter)
+
+    def _apply_filter(self) -> None:
+        self._filter_job = None
+        source = self._source.get()
+        self._view.set_filter(LogFilter(
+            text=self._search.get(),
+            min_level=_LEVELS[self._level.get()],
+            sources=None if source == _ALL_SOURCES else frozenset({source}),
+        ))
+        self._follow = True
+        self._render()
 
     def _clear(self) -> None:
         """Clear the log."""
+        self._store.clear()
+        self._view.refresh()
+        self._follow = True
+        self._render()
+
+    # --- Rendering and scrolling ---
+
+    def _top(self) -> int:
+        """Index in the view of the first visible row."""
+        last_page = max(0, len(self._view) - self._rows)
+        if self._follow:
+            return last_page
+        return min(self._view.index(self._top_id), last_page)
+
+    def _render(self) -> None:
+        """Replace the textbox contents with the rows currently in view."""
+        total = len(self._view)
+        top = self._top()
+        records = self._view.records(top, self._rows)
+
         self._text.configure(state="normal")
         self._text.delete("1.0", "end")
+        for record in records:
+            self._text.insert("end", _format(record) + "\n", _tag(record.level))
         self._text.configure(state="disabled")
+
+        if total:
+            self._scrollbar.set(top / total, (top + len(records)) / total)
+        else:
+            self._scrollbar.set(0.0, 1.0)
+        self._count.configure(text=f"{total:,} / {len(self._store):,}")
+        self._dirty = False
+
+    def _scroll_to(self, top: int) -> None:
+        last_page = max(0, len(self._view) - self._rows)
+        top = max(0, min(top, last_page))
+        self._follow = top >= last_page
+        ids = self._view.ids(top, 1)
+        self._top_id = ids[0] if ids else 0
+        self._render()
+
+    def _scroll(self, rows: int) -> str:
+        self._scroll_to(self._top() + rows)
+        return "break"  # Keep Tk from scrolling the textbox itself
+
+    def _on_wheel(self, event: object) -> str:
+        delta = getattr(event, "delta", 0)
+        return self._scroll(-3 if delta > 0 else 3)
+
+    def _on_scrollbar(self, action: str, *args: str) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(args[0]) * len(self._view)))
+        elif action == "scroll":
+            amount = int(args[0]) * (self._rows if args[1] == "pages" else 1)
+            self._scroll(amount)
+
+    def _on_resize(self, event: object) -> None:
+        height = getattr(event, "height", 0)
+        rows = max(1, height // max(1, self._font.metrics("linespace")))
+        if rows != self._rows:
+            self._rows = rows
+            self._render()
+
+
+def _tag(level: int) -> str | None:
+    if level >= logging.ERROR:
+        return "ERROR"
+    if level >= logging.WARNING:
+        return "WARNING"
+    if level < logging.INFO:
+        return "DEBUG"
+    return None
+
+
+def _format(record: LogRecord) -> str:
+    """One display row per record."""
+    clock = time.strftime("%H:%M:%S", time.localtime(record.timestamp))
+    source = record.source.removeprefix("ghosty.")
+    message = record.message.replace("\n", " ⏎ ")
+    return f"{clock} {logging.getLevelName(record.level):<7} {source}: {message}"
@@ -2,19 +2,27 @@
 
 from __future__ import annotations
 
-import threading
+import logging
 
 import customtkinter as ctk
 
 from ghosty.config import load_config, save_config
+from ghosty.core import preflight
 from ghosty.core.orchestrator import AnonymizationMode, Orchestrator
+from ghosty.core.telemetry import TelemetrySampler
+from ghosty.events import ConfigReloaded, InterfacesChanged, IPRotated
 from ghosty.gui.control_panel import ControlPanel
 from ghosty.gui.interface_panel import InterfacePanel
 from ghosty.gui.log_panel import LogPanel
 from ghosty.gui.mode_panel import ModePanel
 from ghosty.gui.settings_dialog import SettingsDialog
 from ghosty.gui.status_panel import StatusPanel
+from ghosty.gui.tasks import TaskRunner
 from ghosty.gui.vpn_panel import VPNPanel
+from ghosty.logger import setup_logging
+from ghosty.reload import ConfigWatcher
+from ghosty.tracing import setup_tracing
+from ghosty.utils.netlink import LinkWatcher
 from ghosty.utils.network import get_external_ip
 
 
@@ -23,11 +31,15 @@ class MainWindow(ctk.CTk):
 
     WIDTH = 960
     HEIGHT = 600
+    EVENT_POLL_MS = 50  # Events and task results are drained on the Tk thread at this cadence
 
     def __init__(self) -> None:
         super().__init__()
 
         self._config = load_config()
+        self._setup_logging()
+        setup_tracing(self._config.trace.enabled, self._config.trace.path,
+                      self._config.trace.format)
         ctk.set_appearance_mode(self._config.general.theme)
 
         # Window setup
@@ -37,12 +49,34 @@ class MainWindow(ctk.CTk):
 
         # Orchestrator
         self._orchestrator = Orchestrator()
-        self._orchestrator.set_log_callback(self._log_message)
+        self._orchestrator.apply_config(self._config)
+        # Activity messages reach the log panel through logging, with levels
+        self._events = self._orchestrator.events.subscribe(
+            types=(IPRotated, InterfacesChanged, ConfigReloaded), maxsize=500, name="gui"
+        )
+
+        # Blocking actions share one executor; results come back via _pump_events
+        self._tasks = TaskRunner()
+        self._sampler: TelemetrySampler | None = None  # Traffic on non-VPN sessions
+
+        # Warm the capability cache while the user picks a mode
+        self._tasks.submit("preflight", lambda _cancel: preflight.capabilities())
 
         # Build layout
         self._build_menu()
         self._build_panels()
 
+        # Interface list follows rtnetlink link/address changes
+        self._links = LinkWatcher(self._orchestrator.events)
+        self._links.start()
+
+        # Edits to config.toml (by hand or via Settings) apply without a restart
+        self._reloader = ConfigWatcher(self._orchestrator, self._config)
+        self._reloader.start()
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after(self.EVENT_POLL_MS, self._pump_events)
+
     def _build_menu(self) -> None:
         """Build the menu bar."""
         menu = ctk.CTkFrame(self, height=32, corner_radius=0)
@@ -75,6 +109,7 @@ class MainWindow(ctk.CTk):
 
         # Mode panel
         self._mode = ModePanel(left_frame)
+        self._mode.on_change(self._on_mode_selected)
         self._mode.pack(fill="x", pady=5)
 
         # VPN panel
@@ -99,16 +134,19 @@ class MainWindow(ctk.CTk):
         log_header.pack(anchor="w", pady=(5, 2))
 
         # Log panel
-        self._log = LogPanel(right_frame)
+        self._log = LogPanel(right_frame, capacity=self._config.general.log_lines)
         self._log.pack(fill="both", expand=True, pady=5)
-
-        # Connect orchestrator to log
-        self._orchestrator._log_callback = self._log.append
+        logging.getLogger("ghosty").addHandler(self._log.handler())
 
     def _start_anonymization(self) -> None:
-        """Start anonymization in a background thread."""
+        """Start anonymization in the background."""
+        if self._tasks.pending("session"):
+            return  # Double click, or a stop/switch still running
         mode = self._mode.selected
         interface = self._interface.selected
+        if not interface:
+            self._log.append("No network interface selected", logging.ERROR)
+            return
 
         # Validate VPN config for modes that need it
         vpn_config = ""
@@ -118,7 +156,8 @@ class MainWindow(ctk.CTk):
             vpn_config = self._vpn.config_path
             vpn_auth = self._vpn.auth_path
             if not vpn_config:
-                self._log.append("ERROR: VPN config required for Standard/Enhanced modes")
+                self._log.append("VPN config required for Standard/Enhanced modes",
+                                 logging.ERROR)
                 return
 
         # Update UI
@@ -128,68 +167,186 @@ class MainWindow(ctk.CTk):
         self._status.set_active(mode.value)
         self._log.append(f"Starting {mode.value} mode on {interface}...")
 
+        # Config changes held back while a session was up apply now
+        if not self._orchestrator.is_active:
+            self._orchestrator.apply_config(self._config)
         # Set VPN provider before starting
         if mode in (AnonymizationMode.STANDARD, AnonymizationMode.ENHANCED):
             self._orchestrator.vpn.provider = vpn_provider
             self._log.append(f"Using VPN provider: {vpn_provider}")
 
-        # Run in background thread
-        def _start():
-            success, message = self._orchestrator.start(
-                mode, interface, vpn_config=vpn_config, vpn_auth=vpn_auth
-            )
-            self.after(0, lambda: self._on_start_complete(success, message))
-
-        threading.Thread(target=_start, daemon=True).start()
+        fallbacks = list(self._config.vpn.fallback_configs)
+        self._tasks.submit(
+            "session",
+            lambda cancel: self._orchestrator.start(
+                mode, interface, vpn_config=vpn_config, vpn_auth=vpn_auth,
+                vpn_fallbacks=fallbacks, cancel=cancel,
+            ),
+            lambda result: self._on_start_complete(*result),
+            name="start",
+            on_error=lambda e: self._on_start_complete(False, str(e)),
+        )
 
     def _on_start_complete(self, success: bool, message: str) -> None:
         """Handle start completion on main thread."""
         if not success:
-            self._log.append(f"FAILED: {message}")
+            self._log.append(f"FAILED: {message}", logging.ERROR)
             self._control.set_active(False)
             self._mode.set_enabled(True)
             self._vpn.set_enabled(True)
             self._status.set_inactive()
         else:
             self._log.append(f"OK: {message}")
+            self._mode.set_enabled(True)
+            mode = self._orchestrator.current_mode
+            self._vpn.set_enabled(mode is not None and "vpn" not in mode.layers)
+            self._attach_telemetry()
             self._update_ip()
 
-    def _stop_anonymization(self) -> None:
-        """Stop anonymization in a background thread."""
-        self._log.append("Stopping anonymization...")
+    def _on_mode_selected(self, mode: AnonymizationMode) -> None:
+        """Apply a mode change to the running session without a restart."""
+        current = self._orchestrator.current_mode
+        if not self._orchestrator.is_active or current is None or mode == current:
+            return
+        if self._tasks.pending("session"):
+            self._mode.select(current)  # Another session action is still running
+            return
+
+        vpn_config = ""
+        vpn_auth = None
+        if "vpn" in mode.layers and "vpn" not in current.layers:
+            vpn_config = self._vpn.config_path
+            vpn_auth = self._vpn.auth_path
+            if not vpn_config:
+                self._log.append("VPN config required for Standard/Enhanced modes",
+                                 logging.ERROR)
+                self._mode.select(current)
+                return
+            self._orchestrator.vpn.provider = self._vpn.provider
+
+        fallbacks = list(self._config.vpn.fallback_configs)
+        self._tasks.submit(
+            "session",
+            lambda cancel: self._orchestrator.transition(
+                mode, vpn_config=vpn_config, vpn_auth=vpn_auth,
+                vpn_fallbacks=fallbacks, cancel=cancel,
+            ),
+            lambda result: self._on_transition_complete(*result),
+            name="transition",
+            on_error=lambda e: self._on_transition_complete(False, str(e)),
+        )
+        self._mode.set_enabled(False)
+        self._vpn.set_enabled(False)
+
+    def _on_transition_complete(self, success: bool, message: str) -> None:
+        """Handle mode transition completion on main thread."""
+        mode = self._orchestrator.current_mode
+        if success:
+            self._log.append(f"OK: {message}")
+            self._attach_telemetry()
+            self._update_ip()
+        else:
+            self._log.append(f"FAILED: {message}", logging.ERROR)
+            if mode is not None:
+                self._mode.select(mode)
 
-        def _stop():
-            success, message = self._orchestrator.stop()
-            self.after(0, lambda: self._on_stop_complete(success, message))
+        if mode is not None:
+            self._status.set_mode(mode.value)
+            self._vpn.set_enabled("vpn" not in mode.layers)
+        self._mode.set_enabled(True)
+
+    def _stop_anonymization(self) -> None:
+        """Stop anonymization in the background, or cancel a pending start."""
+        pending = self._tasks.pending("session")
+        if pending is not None:
+            if pending.name != "stop" and not pending.cancelled:
+                # The start/switch rolls back and reports through its own callback
+                self._log.append(f"Cancelling {pending.name}...", logging.WARNING)
+                pending.cancel()
+            return
 
-        threading.Thread(target=_stop, daemon=True).start()
+        self._log.append("Stopping anonymization...")
+        self._tasks.submit(
+            "session",
+            lambda _cancel: self._orchestrator.stop(),
+            lambda result: self._on_stop_complete(*result),
+            name="stop",
+            on_error=lambda e: self._on_stop_complete(False, str(e)),
+        )
 
     def _on_stop_complete(self, success: bool, message: str) -> None:
         """Handle stop completion on main thread."""
         if success:
             self._log.append(f"OK: {message}")
         else:
-            self._log.append(f"WARNING: {message}")
+            self._log.append(f"WARNING: {message}", logging.WARNING)
 
         self._control.set_active(False)
         self._mode.set_enabled(True)
         self._vpn.set_enabled(True)
         self._status.set_inactive()
+        self._detach_telemetry()
+
+    def _attach_telemetry(self) -> None:
+        """Chart the tunnel when the VPN is up, otherwise the session's interface."""
+        mode = self._orchestrator.current_mode
+        self._detach_telemetry()
+        if mode is None:
+            return
+        if "vpn" in mode.layers:
+            # The VPN owns its sampler and replaces it on reconnect
+            self._status.set_telemetry(lambda: self._orchestrator.vpn.telemetry)
+            return
+        interface = self._orchestrator.current_interface
+        if interface:
+            self._sampler = TelemetrySampler(interface)
+            self._sampler.start()
+            sampler = self._sampler
+            self._status.set_telemetry(lambda: sampler)
+
+    def _detach_telemetry(self) -> None:
+        self._status.set_telemetry(None)
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
 
     def _update_ip(self) -> None:
         """Fetch and display external IP in background."""
-        def _fetch():
-            ip = get_external_ip()
-            self.after(0, lambda: self._status.set_ip(ip or "unavailable"))
-
-        threading.Thread(target=_fetch, daemon=True).start()
+        self._tasks.submit(
+            "ip",
+            lambda _cancel: get_external_ip(),
+            lambda ip: self._status.set_ip(ip or "unavailable"),
+        )
 
-    def _log_message(self, message: str) -> None:
-        """Log callback for orchestrator (may be called from threads)."""
-        if threading.current_thread() is threading.main_thread():
-            self._log.append(message)
-        else:
-            self.after(0, lambda: self._log.append(message))
+    def _pump_events(self) -> None:
+        """Apply queued orchestrator events and task results on the Tk thread."""
+        for event in self._events.drain():
+            if isinstance(event, IPRotated):
+                self._status.set_ip(event.ip)
+            elif isinstance(event, InterfacesChanged):
+                self._interface.set_interfaces(event)
+            elif isinstance(event, ConfigReloaded):
+                self._config = self._reloader.config
+                ctk.set_appearance_mode(self._config.general.theme)
+        self._tasks.drain()
+        self.after(self.EVENT_POLL_MS, self._pump_events)
+
+    def _on_close(self) -> None:
+        """Cancel background actions and close the window."""
+        self._links.stop()
+        self._reloader.stop()
+        self._detach_telemetry()
+        self._tasks.shutdown()
+        self.destroy()
+
+    def _setup_logging(self) -> None:
+        """Start the background log writer from the current config."""
+        log = self._config.log
+        setup_logging(
+            log.level, log.file,
+            max_bytes=log.max_size, backup_count=log.backup_count,
+            rotate_hours=log.rotate_hours, compress=log.compress, fmt=log.format,
+        )
 
     def _open_settings(self) -> None:
         """Open settings dialog."""
@@ -197,5 +354,8 @@ class MainWindow(ctk.CTk):
         self.wait_window(dialog)
 
         if dialog.saved:
-            self._config = load_config()
+            # Applied now rather than after the watcher's debounce; the
+            # watcher's own reload then finds nothing changed
+            self._reloader.reload()
+            self._config = self._reloader.config
         ctk.set_appearance_mode(self._config.general.theme)
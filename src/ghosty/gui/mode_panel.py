@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Callable
+
 import customtkinter as ctk
 
 from ghosty.core.orchestrator import AnonymizationMode
@@ -13,6 +15,8 @@ class ModePanel(ctk.CTkFrame):
     def __init__(self, master: ctk.CTk) -> None:
         super().__init__(master, corner_radius=8)
 
+        self._on_change: Callable[[AnonymizationMode], None] | None = None
+
         # Title
         title = ctk.CTkLabel(
             self, text="Anonymization Mode", font=ctk.CTkFont(size=14, weight="bold")
@@ -55,8 +59,18 @@ class ModePanel(ctk.CTkFrame):
         """Return the selected mode as AnonymizationMode enum."""
         return AnonymizationMode(self._mode_var.get())
 
+    def on_change(self, callback: Callable[[AnonymizationMode], None] | None) -> None:
+        """Register callback invoked with the new mode when the selection changes."""
+        self._on_change = callback
+
+    def select(self, mode: AnonymizationMode) -> None:
+        """Set the selection without notifying the change callback."""
+        callback, self._on_change = self._on_change, None
+        self._mode_var.set(mode.value)
+        self._on_change = callback
+
     def set_enabled(self, enabled: bool) -> None:
-        """Enable or disable mode selection (disabled while active)."""
+        """Enable or disable mode selection (disabled while a change is applied)."""
         state = "normal" if enabled else "disabled"
         self._normal_btn.configure(state=state)
         self._standard_btn.configure(state=state)
@@ -71,3 +85,5 @@ class ModePanel(ctk.CTkFrame):
             AnonymizationMode.ENHANCED: "Enhanced: MAC spoof + VPN + TOR",
         }
         self._desc_label.configure(text=descriptions.get(mode, ""))
+        if self._on_change:
+            self._on_change(mode)
@@ -1,12 +1,18 @@
-"""Status panel — displays current anonymization state and external IP."""
+"""Status panel — displays current anonymization state, external IP and traffic."""
 
 from __future__ import annotations
 
+import time
+from typing import Callable
+
 import customtkinter as ctk
 
+from ghosty.core.telemetry import TelemetrySampler
+from ghosty.gui.chart import ThroughputChart
+
 
 class StatusPanel(ctk.CTkFrame):
-    """Displays connection status, current mode, and external IP."""
+    """Displays connection status, current mode, external IP and a live chart."""
 
     def __init__(self, master: ctk.CTk) -> None:
         super().__init__(master, corner_radius=8)
@@ -43,8 +49,13 @@ class StatusPanel(ctk.CTkFrame):
         self._uptime_label = ctk.CTkLabel(self, text="—", font=ctk.CTkFont(size=12))
         self._uptime_label.grid(row=4, column=1, padx=5, pady=2, sticky="w")
 
+        # Live rx/tx/latency chart
+        self._chart = ThroughputChart(self)
+        self._chart.grid(row=5, column=0, columnspan=2, padx=10, pady=(5, 10), sticky="ew")
+        self.grid_columnconfigure(1, weight=1)
+
         # Uptime ticker
-        self._uptime_seconds = 0
+        self._started = 0.0
         self._ticker_after: str | None = None
 
     def set_active(self, mode: str) -> None:
@@ -54,6 +65,10 @@ class StatusPanel(ctk.CTkFrame):
         self._mode_label.configure(text=f"Mode: {mode}")
         self._start_ticker()
 
+    def set_mode(self, mode: str) -> None:
+        """Update the mode label without restarting the uptime counter."""
+        self._mode_label.configure(text=f"Mode: {mode}")
+
     def set_inactive(self) -> None:
         """Update UI to inactive state."""
         self._status_dot.configure(text_color="gray")
@@ -61,14 +76,20 @@ class StatusPanel(ctk.CTkFrame):
         self._mode_label.configure(text="Mode: —")
         self._ip_label.configure(text="—")
         self._stop_ticker()
+        self._chart.set_source(None)
 
     def set_ip(self, ip: str) -> None:
         """Display external IP."""
         self._ip_label.configure(text=ip)
 
+    def set_telemetry(self, source: Callable[[], TelemetrySampler | None] | None) -> None:
+        """Chart the sampler returned by ``source``; None hides the traffic."""
+        self._chart.set_source(source)
+
     def _start_ticker(self) -> None:
         """Start uptime counter."""
-        self._uptime_seconds = 0
+        self._stop_ticker()
+        self._started = time.monotonic()
         self._tick()
 
     def _stop_ticker(self) -> None:
@@ -79,9 +100,11 @@ class StatusPanel(ctk.CTkFrame):
         self._uptime_label.configure(text="—")
 
     def _tick(self) -> None:
-        """Update uptime display."""
-        minutes, seconds = divmod(self._uptime_seconds, 60)
+        """Update uptime display, aligned to whole seconds of uptime."""
+        elapsed = time.monotonic() - self._started
+        minutes, seconds = divmod(int(elapsed), 60)
         hours, minutes = divmod(minutes, 60)
         self._uptime_label.configure(text=f"{hours:02d}:{minutes:02d}:{seconds:02d}")
-        self._uptime_seconds += 1
-        self._ticker_after = self.after(1000, self._tick)
+        # Computed from the start time so a late callback does not drift
+        delay = 1000 - int((elapsed % 1) * 1000)
+        self._ticker_after = self.after(delay, self._tick)
@@ -0,0 +1,129 @@
+"""Background task layer for GUI actions.
+
+Every blocking action the window triggers (start, stop, mode switch, IP
+lookup) runs on one shared, bounded executor. Actions are single-flight
+per key: submitting while a task with the same key is pending is rejected,
+so a double click cannot race two ``Orchestrator.start`` calls. Each task
+gets a ``threading.Event`` it can hand to the core managers as a
+cancellation token.
+
+Completion callbacks are queued and run by ``drain``, which the window
+calls from its existing ``after`` pump, so results reach the Tk thread in
+batches instead of one ``after(0)`` per completion. This module does not
+import Tk.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Task:
+    """A submitted action."""
+
+    key: str
+    name: str
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+    def cancel(self) -> None:
+        """Ask the action to stop.
+
+        The action still runs (or finishes) and its callback still fires,
+        so the caller always gets to restore its UI state.
+        """
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+
+class TaskRunner:
+    """Shared executor with per-key single-flight and batched completions."""
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="ghosty-gui")
+        self._pending: dict[str, Task] = {}  # Touched on the Tk thread only
+        self._done: deque[Callable[[], None]] = deque()  # Appended from workers
+
+    def submit(
+        self,
+        key: str,
+        action: Callable[[threading.Event], Any],
+        on_done: Callable[[Any], None] | None = None,
+        *,
+        name: str = "",
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> Task | None:
+        """Run ``action(cancel_event)`` in the background.
+
+        Args:
+            key: Single-flight key; actions sharing a key never overlap.
+            action: Blocking callable; receives the task's cancellation event.
+            on_done: Called with the result on the thread that calls ``drain``.
+            name: What the task is doing, for callers inspecting ``pending``.
+            on_error: Called with the exception if ``action`` raises.
+
+        Returns:
+            The task, or None if one with the same key is still pending.
+        """
+        if key in self._pending:
+            logger.debug("Task %s rejected: %s still pending", key, self._pending[key].name)
+            return None
+
+        task = Task(key, name or key)
+
+        def _run() -> None:
+            try:
+                result = action(task.cancel_event)
+            except Exception as e:
+                logger.exception("Task %s failed", task.name)
+                self._done.append(partial(self._finish, task, on_error, e))
+            else:
+                self._done.append(partial(self._finish, task, on_done, result))
+
+        self._pending[key] = task
+        self._pool.submit(_run)
+        return task
+
+    def _finish(self, task: Task, callback: Callable[[Any], None] | None, value: Any) -> None:
+        if self._pending.get(task.key) is task:
+            del self._pending[task.key]
+        if callback is not None:
+            callback(value)
+
+    def pending(self, key: str) -> Task | None:
+        """The task currently holding ``key``, if any."""
+        return self._pending.get(key)
+
+    def drain(self) -> int:
+        """Run queued completion callbacks; call from the Tk thread.
+
+        Returns:
+            Number of completions handled.
+        """
+        handled = 0
+        while self._done:
+            callback = self._done.popleft()
+            handled += 1
+            try:
+                callback()
+            except Exception:
+                logger.exception("Task completion handler failed")
+        return handled
+
+    def shutdown(self) -> None:
+        """Cancel everything and stop accepting work (does not wait)."""
+        for task in list(self._pending.values()):
+            task.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,34 +1,190 @@
-"""Structured logging setup with file and console output."""
+"""Structured logging setup with file and console output.
+
+Log calls never touch the console or disk on the calling thread: the root
+logger only has a ``QueueHandler``, and a ``QueueListener`` thread formats
+and writes records. The log file rotates by size and, optionally, by age;
+rotated files can be gzipped. ``fmt="jsonl"`` writes one JSON object per
+record instead of text lines.
+"""
 
 from __future__ import annotations
 
+import atexit
+import gzip
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
 import sys
+import time
 from pathlib import Path
 
 _LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 _DATE_FORMAT = "%H:%M:%S"
+_FILE_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: logging.handlers.QueueHandler | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S")
+            + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-rotating file handler that also rotates every ``interval`` seconds.
+
+    With ``compress`` set, rotated files are gzipped (``ghosty.log.1.gz``).
+    """
+
+    def __init__(
+        self,
+        filename: str | Path,
+        *,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        interval: float = 0,
+        compress: bool = False,
+    ) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding="utf-8", delay=True)
+        self.interval = interval
+        self._rollover_at = time.time() + interval if interval else 0.0
+        if compress:
+            self.namer = _gz_name
+            self.rotator = _gz_rotate
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802
+        if self._rollover_at and time.time() >= self._rollover_at:
+            return self.backupCount > 0
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:  # noqa: N802
+        super().doRollover()
+        if self.interval:
+            self._rollover_at = time.time() + self.interval
+
+
+def _gz_name(name: str) -> str:
+    return name + ".gz"
 
 
-def setup_logging(level: str = "INFO", log_file: str | None = None) -> None:
+def _gz_rotate(source: str, dest: str) -> None:
+    """Compress the file being rotated out (on the listener thread)."""
+    if not os.path.exists(source):
+        return
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener with the traceback rendered.
+
+    The stock handler bakes the traceback into ``msg``; keeping it in
+    ``exc_text`` lets each output format place it itself.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def stop_logging() -> None:
+    """Flush queued records and detach the background writer."""
+    global _listener, _queue_handler  # noqa: PLW0603
+    listener, _listener = _listener, None
+    handler, _queue_handler = _queue_handler, None
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+        for target in listener.handlers:
+            target.close()
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_file: str | None = None,
+    *,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    rotate_hours: float = 0,
+    compress: bool = False,
+    fmt: str = "text",
+) -> None:
     """Configure root logger with console and optional file handler.
 
+    Safe to call again (e.g. after settings change); the previous writer is
+    flushed and replaced.
+
     Args:
         level: Logging level string (DEBUG, INFO, WARNING, ERROR).
         log_file: Optional path to a log file.
+        max_bytes: Rotate the file at this size; 0 disables size rotation.
+        backup_count: Rotated files to keep; 0 disables rotation entirely.
+        rotate_hours: Also rotate after this many hours; 0 disables.
+        compress: Gzip rotated files.
+        fmt: File format, "text" or "jsonl".
     """
+    global _listener, _queue_handler  # noqa: PLW0603
+    stop_logging()
+
     root = logging.getLogger()
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
     # Console handler
     console = logging.StreamHandler(sys.stdout)
     console.setFormatter(logging.Formatter(_LOG_FORMAT, datefmt=_DATE_FORMAT))
-    root.addHandler(console)
+    handlers: list[logging.Handler] = [console]
 
     # File handler
     if log_file:
         log_path = Path(log_file).expanduser()
         log_path.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_path)
-        file_handler.setFormatter(logging.Formatter(_LOG_FORMAT, datefmt=_DATE_FORMAT))
-        root.addHandler(file_handler)
+        file_handler = RotatingFileHandler(
+            log_path,
+            max_bytes=max_bytes if backup_count else 0,
+            backup_count=backup_count,
+            interval=rotate_hours * 3600,
+            compress=compress,
+        )
+        if fmt == "jsonl":
+            file_handler.setFormatter(JsonFormatter())
+        else:
+            file_handler.setFormatter(logging.Formatter(_LOG_FORMAT, datefmt=_FILE_DATE_FORMAT))
+        handlers.append(file_handler)
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _queue_handler = _QueueHandler(records)
+    _listener = logging.handlers.QueueListener(records, *handlers)
+    _listener.start()
+    root.addHandler(_queue_handler)
+    atexit.register(stop_logging)
+
+
+def set_level(level: str) -> None:
+    """Change the root level in place, keeping the writer and open files."""
+    logging.getLogger().setLevel(getattr(logging, level.upper(), logging.INFO))
@@ -0,0 +1,229 @@
+"""Config hot-reload — apply edits to config.toml without restarting layers.
+
+``ConfigWatcher`` watches the config directory with inotify (the file
+itself may be replaced by an editor's rename, which a watch on the file
+would lose) and, once writes have settled, re-parses the file strictly.
+An invalid file is rejected and the running settings are kept. Otherwise
+only the settings that differ are applied: VPN and TOR preferences go to
+the orchestrator (a new rotation interval retimes a running rotation), a
+new log level is set on the root logger in place, and other log or trace
+changes restart just that writer. ``daemon.*`` settings only take effect
+after a restart. Each applied reload is published as ``ConfigReloaded``.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import selectors
+import struct
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable
+
+from ghosty.config import GhostyConfig, config_path
+from ghosty.core.orchestrator import Orchestrator
+from ghosty.events import ConfigReloaded
+from ghosty.logger import set_level, setup_logging
+from ghosty.tracing import disable_tracing, setup_tracing
+
+logger = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_TO = 0x80
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_EVENT = struct.Struct("=iIII")  # wd, mask, cookie, len (name follows)
+_DEBOUNCE = 0.2  # Seconds without writes before the file is re-read
+
+# Read once at startup. ``general`` and ``identities`` need no applying:
+# the GUI and the daemon read them from the new config when they use them.
+_RESTART_SECTIONS = ("daemon",)
+
+
+def changes(old: GhostyConfig, new: GhostyConfig) -> list[str]:
+    """Names ("section.key", or "identities.<name>") of settings that differ."""
+    before, after = asdict(old), asdict(new)
+    changed: list[str] = []
+    for section in after:
+        old_values, new_values = before.get(section, {}), after[section]
+        for key in sorted(old_values.keys() | new_values.keys()):
+            if old_values.get(key) != new_values.get(key):
+                changed.append(f"{section}.{key}")
+    return changed
+
+
+def _inotify_init(directory: Path) -> int:
+    """An inotify fd watching ``directory`` for completed writes and renames.
+
+    Raises:
+        OSError: If inotify is unavailable or the watch cannot be added.
+    """
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    try:
+        init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except AttributeError as e:
+        raise OSError("inotify not supported") from e
+    fd = int(init(IN_NONBLOCK | IN_CLOEXEC))
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    if add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        errno = ctypes.get_errno()
+        os.close(fd)
+        raise OSError(errno, f"inotify_add_watch failed for {directory}")
+    return fd
+
+
+def notifications(data: bytes) -> list[tuple[int, str]]:
+    """(mask, file name) for each inotify event in ``data``."""
+    result: list[tuple[int, str]] = []
+    offset = 0
+    while offset + _EVENT.size <= len(data):
+        _, mask, _, length = _EVENT.unpack_from(data, offset)
+        raw = data[offset + _EVENT.size:offset + _EVENT.size + length]
+        result.append((mask, os.fsdecode(raw.rstrip(b"\0"))))
+        offset += _EVENT.size + length
+    return result
+
+
+class ConfigWatcher:
+    """Re-applies config.toml whenever it changes on disk.
+
+    ``reload`` can also be called directly (e.g. right after the settings
+    dialog saves); calls are serialized and a reload that finds nothing
+    changed does nothing.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        config: GhostyConfig,
+        path: Path | None = None,
+        *,
+        on_reload: Callable[[GhostyConfig], None] | None = None,
+    ) -> None:
+        self.orchestrator = orchestrator
+        self.config = config
+        self.path = Path(path or config_path())
+        self.on_reload = on_reload
+        self._lock = threading.Lock()  # Serializes reloads
+        self._thread: threading.Thread | None = None
+        self._wakeup_r, self._wakeup_w = -1, -1
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Begin watching; a no-op (with a warning) where inotify is unavailable."""
+        if self.is_running:
+            return
+        try:
+            fd = _inotify_init(self.path.parent)
+        except OSError as e:
+            logger.warning("Config watching unavailable (%s); edits apply on restart", e)
+            return
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, args=(fd,), daemon=True,
+                                        name="ghosty-config")
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        os.write(self._wakeup_w, b"x")
+        self._thread.join(timeout=2)
+        self._thread = None
+        for fd in (self._wakeup_r, self._wakeup_w):
+            os.close(fd)
+        self._wakeup_r, self._wakeup_w = -1, -1
+
+    def _run(self, fd: int) -> None:
+        deadline: float | None = None
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            selector.register(self._wakeup_r, selectors.EVENT_READ)
+            try:
+                while True:
+                    timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    ready = {key.fileobj for key, _ in selector.select(timeout)}
+                    if self._wakeup_r in ready:
+                        return
+                    if fd in ready and self._touched(os.read(fd, 1 << 16)):
+                        # Editors write in several steps; wait for them to settle
+                        deadline = time.monotonic() + _DEBOUNCE
+                    if deadline is not None and time.monotonic() >= deadline:
+                        deadline = None
+                        self.reload()
+            finally:
+                os.close(fd)
+
+    def _touched(self, data: bytes) -> bool:
+        return any(mask & IN_Q_OVERFLOW or name == self.path.name
+                   for mask, name in notifications(data))
+
+    def reload(self) -> tuple[bool, str]:
+        """Parse, validate and apply the config file.
+
+        Returns:
+            (success, message) tuple; on failure the current settings stay.
+        """
+        with self._lock:
+            try:
+                new = GhostyConfig.parse(self.path)
+            except (OSError, ValueError) as e:
+                logger.warning("Config not reloaded, keeping current settings: %s", e)
+                return False, f"Config not reloaded: {e}"
+            changed = changes(self.config, new)
+            if not changed:
+                return True, "Config unchanged"
+            self._apply(new, changed)
+            self.config = new
+
+        logger.info("Config reloaded: %s", ", ".join(changed))
+        if self.on_reload is not None:
+            self.on_reload(new)
+        self.orchestrator.events.publish(ConfigReloaded(tuple(changed)))
+        return True, f"Applied {len(changed)} setting(s)"
+
+    def _apply(self, new: GhostyConfig, changed: list[str]) -> None:
+        sections = {name.split(".", 1)[0] for name in changed}
+
+        if sections & {"vpn", "tor"}:
+            if not self.orchestrator.is_active:
+                self.orchestrator.apply_config(new)
+            else:
+                # The live session's teardown depends on the provider and
+                # backend it was started with; only the rotation interval
+                # is applied now, the rest on the next start
+                if "tor.rotation_interval" in changed:
+                    self.orchestrator.tor.set_rotation_interval(new.tor.rotation_interval)
+                held = [name for name in changed if name.split(".", 1)[0] in ("vpn", "tor")
+                        and name != "tor.rotation_interval"]
+                if held:
+                    logger.info("%s: takes effect on the next start", ", ".join(held))
+
+        log_changes = [name for name in changed if name.startswith("log.")]
+        if log_changes == ["log.level"]:
+            set_level(new.log.level)
+        elif log_changes:
+            log = new.log
+            setup_logging(
+                log.level, log.file,
+                max_bytes=log.max_size, backup_count=log.backup_count,
+                rotate_hours=log.rotate_hours, compress=log.compress, fmt=log.format,
+            )
+
+        if "trace" in sections:
+            disable_tracing()
+            setup_tracing(new.trace.enabled, new.trace.path, new.trace.format)
+
+        for name in changed:
+            if name.split(".", 1)[0] in _RESTART_SECTIONS:
+                logger.warning("%s changed; takes effect after a restart", name)
@@ -0,0 +1,219 @@
+"""Lightweight timing spans exported as Chrome trace events or JSON lines.
+
+Tracing is off unless enabled by config (``[trace]``) or the
+``GHOSTY_TRACE`` environment variable. When off, ``span()`` returns a shared
+no-op context manager, so instrumented code pays one global lookup.
+
+Chrome traces (``format = "chrome"``) open in Perfetto or chrome://tracing;
+JSON lines (``format = "jsonl"``) write one span per line as it finishes.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+_ENV_VAR = "GHOSTY_TRACE"
+_MAX_EVENTS = 500_000  # Cap on buffered Chrome events per session
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _NullSpan:
+    """Shared no-op span used while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def set(self, **args: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed region; use as a context manager."""
+
+    __slots__ = ("_tracer", "name", "args", "start", "parent", "depth")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict[str, Any]) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+        self.parent = ""
+        self.depth = 0
+
+    def set(self, **args: Any) -> None:
+        """Attach extra arguments (e.g. an exit code) to the span."""
+        self.args.update(args)
+
+    def __enter__(self) -> Span:
+        stack = self._tracer._stack()
+        if stack:
+            self.parent = stack[-1].name
+            self.depth = len(stack)
+        stack.append(self)
+        self.start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        end = time.monotonic_ns()
+        self._tracer._stack().pop()
+        if exc is not None:
+            self.args["error"] = repr(exc)
+        self._tracer._record(self, end)
+
+
+class Tracer:
+    """Collects spans and writes them to a trace file."""
+
+    def __init__(self, path: Path, fmt: str = "chrome") -> None:
+        if fmt not in ("chrome", "jsonl"):
+            raise ValueError(f"Unknown trace format: {fmt}")
+        self.path = path
+        self.format = fmt
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._events: list[dict[str, Any]] = []
+        self._threads: dict[int, str] = {}
+        self._pid = os.getpid()
+        self._origin = time.monotonic_ns()
+        self._file = None
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "jsonl":
+            self._file = open(path, "a", buffering=1)  # noqa: SIM115 — closed in close()
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, **args: Any) -> Span:
+        return Span(self, name, args)
+
+    def _record(self, span: Span, end: int) -> None:
+        thread = threading.current_thread()
+        tid = thread.ident or 0
+        if self.format == "jsonl":
+            line = json.dumps({
+                "name": span.name,
+                "start_ms": (span.start - self._origin) / 1e6,
+                "duration_ms": (end - span.start) / 1e6,
+                "thread": thread.name,
+                "parent": span.parent,
+                "depth": span.depth,
+                "args": span.args,
+            }, default=str)
+            with self._lock:
+                if self._file:
+                    self._file.write(line + "\n")
+            return
+
+        event = {
+            "name": span.name,
+            "ph": "X",
+            "ts": (span.start - self._origin) / 1000,
+            "dur": (end - span.start) / 1000,
+            "pid": self._pid,
+            "tid": tid,
+            "args": span.args,
+        }
+        with self._lock:
+            self._threads.setdefault(tid, thread.name)
+            if len(self._events) < _MAX_EVENTS:
+                self._events.append(event)
+
+    def close(self) -> None:
+        """Flush the trace to disk."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+                return
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                 "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            payload = {"traceEvents": metadata + self._events, "displayTimeUnit": "ms"}
+            self.path.write_text(json.dumps(payload, default=str))
+        logger.info("Trace written to %s", self.path)
+
+
+_tracer: Tracer | None = None
+
+
+def span(name: str, **args: Any) -> Span | _NullSpan:
+    """Open a timing span; a no-op when tracing is disabled."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **args)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator that wraps a function call in a span."""
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def enable_tracing(path: str | Path, fmt: str = "chrome") -> Tracer:
+    """Start recording spans to ``path``; flushed on disable or exit."""
+    global _tracer  # noqa: PLW0603
+    disable_tracing()
+    tracer = Tracer(Path(path).expanduser(), fmt)
+    _tracer = tracer
+    atexit.register(disable_tracing)
+    logger.info("Tracing enabled (%s) -> %s", fmt, tracer.path)
+    return tracer
+
+
+def disable_tracing() -> None:
+    """Stop recording and write out the current trace."""
+    global _tracer  # noqa: PLW0603
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+
+
+def setup_tracing(enabled: bool = False, path: str = "", fmt: str = "chrome") -> None:
+    """Enable tracing from config, letting ``GHOSTY_TRACE`` override it.
+
+    ``GHOSTY_TRACE`` holds the output path; a ``.jsonl`` suffix selects the
+    JSON-lines format.
+    """
+    env_path = os.environ.get(_ENV_VAR, "")
+    if env_path:
+        fmt = "jsonl" if env_path.endswith(".jsonl") else "chrome"
+        enable_tracing(env_path, fmt)
+    elif enabled and path:
+        enable_tracing(path, fmt)
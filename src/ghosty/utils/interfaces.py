@@ -0,0 +1,196 @@
+"""Interface snapshots — every interface's state from one collection pass.
+
+``snapshot()`` returns an immutable ``InterfaceSnapshot`` holding name,
+MAC, IPv4 addresses, oper-state, MTU, driver, link speed and counters for
+every interface. It is collected with one rtnetlink link+address dump
+(driver and speed come from sysfs, which netlink does not report), or one
+sysfs pass where netlink is unavailable, and cached: callers within
+``max_age`` share the same snapshot. ``invalidate()`` forces the next call
+to collect again; the MAC changer and the netlink watcher call it when
+they know interfaces changed. Each collection gets a new ``generation`` so
+consumers can cheaply tell whether anything was re-read.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+
+from ghosty.utils import netlink
+
+logger = logging.getLogger(__name__)
+
+_SYS_NET = "/sys/class/net"
+_OPERSTATES = ("unknown", "notpresent", "down", "lowerlayerdown", "testing", "dormant", "up")
+_COUNTERS = ("rx_packets", "tx_packets", "rx_bytes", "tx_bytes", "rx_errors", "tx_errors")
+
+
+@dataclass(frozen=True)
+class Counters:
+    """Cumulative interface counters at collection time."""
+
+    rx_packets: int = 0
+    tx_packets: int = 0
+    rx_bytes: int = 0
+    tx_bytes: int = 0
+    rx_errors: int = 0
+    tx_errors: int = 0
+
+
+@dataclass(frozen=True)
+class InterfaceInfo:
+    """One interface."""
+
+    name: str
+    index: int = 0
+    mac: str = ""
+    addresses: tuple[str, ...] = ()  # IPv4
+    operstate: str = "unknown"
+    up: bool = False
+    loopback: bool = False
+    mtu: int = 0
+    driver: str = ""  # Empty for virtual interfaces
+    speed: int | None = None  # Mbit/s; None when down or not reported
+    counters: Counters = field(default_factory=Counters)
+
+    @property
+    def connected(self) -> bool:
+        return self.up and bool(self.addresses)
+
+
+@dataclass(frozen=True)
+class InterfaceSnapshot:
+    """All interfaces as of one collection."""
+
+    generation: int
+    taken: float  # time.monotonic() at collection
+    interfaces: dict[str, InterfaceInfo]
+
+    def get(self, name: str) -> InterfaceInfo | None:
+        return self.interfaces.get(name)
+
+    def names(self, *, exclude_loopback: bool = True) -> list[str]:
+        return sorted(name for name, info in self.interfaces.items()
+                      if not (exclude_loopback and info.loopback))
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except (OSError, ValueError):
+        return ""
+
+
+def _driver(name: str) -> str:
+    try:
+        return os.path.basename(os.readlink(f"{_SYS_NET}/{name}/device/driver"))
+    except OSError:
+        return ""
+
+
+def _speed(name: str) -> int | None:
+    # Reading speed fails with EINVAL for links that are down or virtual
+    value = _read(f"{_SYS_NET}/{name}/speed")
+    try:
+        speed = int(value)
+    except ValueError:
+        return None
+    return speed if speed > 0 else None
+
+
+def _from_netlink() -> dict[str, InterfaceInfo]:
+    table = netlink.read_links()
+    result: dict[str, InterfaceInfo] = {}
+    for link in table.links.values():
+        result[link.name] = InterfaceInfo(
+            name=link.name,
+            index=link.index,
+            mac=link.mac,
+            addresses=link.addresses,
+            operstate=_OPERSTATES[link.operstate] if link.operstate < len(_OPERSTATES)
+            else "unknown",
+            up=link.up,
+            loopback=link.loopback,
+            mtu=link.mtu,
+            driver=_driver(link.name),
+            speed=_speed(link.name),
+            counters=Counters(*link.stats) if link.stats else Counters(),
+        )
+    return result
+
+
+def _from_sysfs() -> dict[str, InterfaceInfo]:
+    """Fallback: one pass over /sys/class/net plus one address enumeration."""
+    try:
+        import psutil
+
+        addresses = {
+            name: tuple(a.address for a in addrs if a.family == socket.AF_INET)
+            for name, addrs in psutil.net_if_addrs().items()
+        }
+    except Exception:
+        logger.exception("Failed to enumerate interface addresses")
+        addresses = {}
+
+    try:
+        names = os.listdir(_SYS_NET)
+    except OSError:
+        names = list(addresses)
+
+    result: dict[str, InterfaceInfo] = {}
+    for name in names:
+        base = f"{_SYS_NET}/{name}"
+        flags = int(_read(f"{base}/flags") or "0", 16)
+        operstate = _read(f"{base}/operstate") or "unknown"
+        counters = [_read(f"{base}/statistics/{counter}") for counter in _COUNTERS]
+        result[name] = InterfaceInfo(
+            name=name,
+            index=int(_read(f"{base}/ifindex") or 0),
+            mac=_read(f"{base}/address"),
+            addresses=addresses.get(name, ()),
+            operstate=operstate,
+            up=bool(flags & netlink.IFF_UP) and operstate in ("up", "unknown"),
+            loopback=bool(flags & netlink.IFF_LOOPBACK) or name == "lo",
+            mtu=int(_read(f"{base}/mtu") or 0),
+            driver=_driver(name),
+            speed=_speed(name),
+            counters=Counters(*(int(value or 0) for value in counters)),
+        )
+    return result
+
+
+def collect() -> dict[str, InterfaceInfo]:
+    """Read every interface now (uncached)."""
+    try:
+        return _from_netlink()
+    except (AttributeError, OSError) as e:
+        logger.debug("rtnetlink dump failed (%s); reading sysfs", e)
+        return _from_sysfs()
+
+
+_lock = threading.Lock()
+_generations = itertools.count(1)
+_current: InterfaceSnapshot | None = None
+
+
+def snapshot(max_age: float = 1.0) -> InterfaceSnapshot:
+    """The cached snapshot, collected again if older than ``max_age`` seconds."""
+    global _current  # noqa: PLW0603
+    with _lock:
+        current = _current
+        if current is None or time.monotonic() - current.taken >= max_age:
+            current = InterfaceSnapshot(next(_generations), time.monotonic(), collect())
+            _current = current
+        return current
+
+
+def invalidate() -> None:
+    """Drop the cached snapshot (interfaces are known to have changed)."""
+    global _current  # noqa: PLW0603
+    _current = None
@@ -0,0 +1,53 @@
+"""Bounded log entry buffer shared between worker threads and the GUI."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LogBuffer(Generic[T]):
+    """Fixed-capacity queue of log entries with many producers and one consumer.
+
+    Producers call ``push`` from any thread; ``deque.append`` with a
+    ``maxlen`` is atomic in CPython, so the common path takes no lock. The
+    consumer (the Tk thread) calls ``take`` once per frame. If it falls
+    behind by more than ``capacity`` entries the oldest are discarded, so
+    memory stays flat. Each push into a full buffer is counted (under a
+    lock, only on that path) and ``take`` reports the count, so a producer
+    preempted mid-push can never show up as a false drop.
+    """
+
+    def __init__(self, capacity: int = 5000) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._pending: deque[T] = deque(maxlen=capacity)
+        self._dropped = 0  # Overflows since the last take
+        self._lock = threading.Lock()
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def push(self, item: T) -> None:
+        """Queue an entry; safe from any thread."""
+        if len(self._pending) >= self.capacity:
+            with self._lock:
+                self._dropped += 1
+        self._pending.append(item)
+
+    def take(self, max_items: int | None = None) -> tuple[list[T], int]:
+        """Pop queued entries, oldest first (consumer thread only).
+
+        Returns:
+            (entries, number of entries dropped since the previous take).
+        """
+        items: list[T] = []
+        while self._pending and (max_items is None or len(items) < max_items):
+            items.append(self._pending.popleft())
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        return items, dropped
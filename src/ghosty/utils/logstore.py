@@ -0,0 +1,226 @@
+"""Structured in-memory log store with incrementally filtered views.
+
+``LogStore`` keeps the newest ``capacity`` records in parallel fixed-size
+columns: timestamps in an ``array('d')``, levels in an ``array('B')``,
+logger names interned to ``array('H')`` ids, and message strings. A record
+costs 11 bytes of column storage plus a reference to its message. Records
+are addressed by a monotonically increasing id, so views can tell which
+ones were evicted.
+
+``LogView`` is a filtered list of ids (an ``array('q')``) kept up to date
+incrementally: ``refresh`` only examines records appended since the last
+call, and narrowing a filter (longer search text, higher level, fewer
+sources) re-filters the current matches instead of rescanning the store.
+
+Both are owned by one thread (the Tk thread); producers hand records over
+through ``ghosty.utils.logbuffer.LogBuffer``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Iterator, NamedTuple
+
+_OTHER = "(other)"
+_OTHER_ID = 0xFFFF  # Largest id an array('H') holds; reserved for _OTHER
+
+
+class LogRecord(NamedTuple):
+    """One stored record."""
+
+    id: int
+    timestamp: float
+    level: int
+    source: str
+    message: str
+
+
+class LogStore:
+    """Fixed-capacity columnar ring of log records."""
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._levels = array("B", bytes(capacity))
+        self._sources = array("H", bytes(2 * capacity))
+        self._messages: list[str] = [""] * capacity
+        self._source_names: list[str] = []
+        self._source_ids: dict[str, int] = {}
+        self._total = 0  # Records ever appended; the next record's id
+        self._cleared = 0  # Records before this id were dropped by ``clear``
+
+    def __len__(self) -> int:
+        return self._total - self.first_id
+
+    @property
+    def first_id(self) -> int:
+        """Id of the oldest retained record."""
+        return max(self._cleared, self._total - self.capacity)
+
+    @property
+    def end_id(self) -> int:
+        """Id the next appended record will get."""
+        return self._total
+
+    @property
+    def sources(self) -> list[str]:
+        """Every logger name seen, in first-seen order."""
+        return list(self._source_names)
+
+    def _source_id(self, source: str) -> int:
+        source_id = self._source_ids.get(source)
+        if source_id is not None:
+            return source_id
+        if len(self._source_names) >= _OTHER_ID:
+            # Out of ids: every later source shares the last one
+            other_id = self._source_ids.get(_OTHER)
+            if other_id is not None:
+                return other_id
+            source = _OTHER
+        source_id = len(self._source_names)
+        self._source_ids[source] = source_id
+        self._source_names.append(source)
+        return source_id
+
+    def append(self, timestamp: float, level: int, source: str, message: str) -> int:
+        """Store a record, evicting the oldest when full; returns its id."""
+        slot = self._total % self.capacity
+        self._timestamps[slot] = timestamp
+        self._levels[slot] = min(level, 255)
+        self._sources[slot] = self._source_id(source)
+        self._messages[slot] = message
+        self._total += 1
+        return self._total - 1
+
+    def clear(self) -> None:
+        """Drop every record (ids keep increasing)."""
+        self._messages = [""] * self.capacity
+        self._cleared = self._total
+
+    def __contains__(self, record_id: int) -> bool:
+        return self.first_id <= record_id < self._total
+
+    def level(self, record_id: int) -> int:
+        return self._levels[record_id % self.capacity]
+
+    def source(self, record_id: int) -> str:
+        return self._source_names[self._sources[record_id % self.capacity]]
+
+    def message(self, record_id: int) -> str:
+        return self._messages[record_id % self.capacity]
+
+    def get(self, record_id: int) -> LogRecord:
+        """Return a retained record.
+
+        Raises:
+            KeyError: If the record was evicted or never existed.
+        """
+        if record_id not in self:
+            raise KeyError(record_id)
+        slot = record_id % self.capacity
+        return LogRecord(
+            record_id, self._timestamps[slot], self._levels[slot],
+            self._source_names[self._sources[slot]], self._messages[slot],
+        )
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        for record_id in range(self.first_id, self._total):
+            yield self.get(record_id)
+
+
+@dataclass(frozen=True)
+class LogFilter:
+    """What a view shows: case-insensitive text, minimum level and sources."""
+
+    text: str = ""
+    min_level: int = logging.NOTSET
+    sources: frozenset[str] | None = None  # None shows every source
+
+    def narrows(self, other: LogFilter) -> bool:
+        """True if everything this filter matches is also matched by ``other``."""
+        return (
+            other.text.casefold() in self.text.casefold()
+            and self.min_level >= other.min_level
+            and (other.sources is None
+                 or (self.sources is not None and self.sources <= other.sources))
+        )
+
+
+class LogView:
+    """The ids of records in a ``LogStore`` that match a ``LogFilter``."""
+
+    def __init__(self, store: LogStore, log_filter: LogFilter | None = None) -> None:
+        self.store = store
+        self.filter = log_filter or LogFilter()
+        self._ids = array("q")
+        self._scanned = store.first_id  # Records before this id have been examined
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _matcher(self) -> Callable[[int], bool]:
+        store = self.store
+        needle = self.filter.text.casefold()
+        min_level = self.filter.min_level
+        sources = self.filter.sources
+
+        def _matches(record_id: int) -> bool:
+            if store.level(record_id) < min_level:
+                return False
+            if sources is not None and store.source(record_id) not in sources:
+                return False
+            return not needle or needle in store.message(record_id).casefold()
+
+        return _matches
+
+    def set_filter(self, log_filter: LogFilter) -> None:
+        """Apply a new filter, reusing the current matches when it narrows."""
+        previous, self.filter = self.filter, log_filter
+        if log_filter == previous:
+            return
+        if log_filter.narrows(previous):
+            self._evict()
+            matches = self._matcher()
+            self._ids = array("q", (rid for rid in self._ids if matches(rid)))
+        else:
+            self._ids = array("q")
+            self._scanned = self.store.first_id
+        self.refresh()
+
+    def _evict(self) -> None:
+        """Forget ids the store has overwritten."""
+        cut = bisect.bisect_left(self._ids, self.store.first_id)
+        if cut:
+            del self._ids[:cut]
+
+    def refresh(self) -> int:
+        """Catch up with records appended since the last call.
+
+        Returns:
+            Number of new matches.
+        """
+        self._evict()
+        start = max(self._scanned, self.store.first_id)
+        end = self.store.end_id
+        before = len(self._ids)
+        matches = self._matcher()
+        self._ids.extend(rid for rid in range(start, end) if matches(rid))
+        self._scanned = end
+        return len(self._ids) - before
+
+    def index(self, record_id: int) -> int:
+        """Position of the first match with an id >= ``record_id``."""
+        return bisect.bisect_left(self._ids, record_id)
+
+    def ids(self, start: int, count: int) -> list[int]:
+        """Ids of matches ``start`` to ``start + count`` (for the visible rows)."""
+        return self._ids[max(0, start):max(0, start + count)].tolist()
+
+    def records(self, start: int, count: int) -> list[LogRecord]:
+        return [self.store.get(rid) for rid in self.ids(start, count)]
@@ -0,0 +1,361 @@
+"""rtnetlink link/address table and change watcher.
+
+One ``NETLINK_ROUTE`` socket subscribed to ``RTNLGRP_LINK`` and
+``RTNLGRP_IPV4_IFADDR`` gives the kernel's view of every interface: an
+initial ``RTM_GETLINK``/``RTM_GETADDR`` dump, then a message whenever a
+link appears, disappears or changes state, or an IPv4 address is added or
+removed. ``LinkWatcher`` keeps a ``LinkTable`` current from that stream on
+a background thread, so nothing has to poll or re-enumerate interfaces.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import selectors
+import socket
+import struct
+import threading
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator
+
+from ghosty.events import EventBus, InterfacesChanged
+from ghosty.utils import interfaces
+
+logger = logging.getLogger(__name__)
+
+NETLINK_ROUTE = 0
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+IFLA_MTU = 4
+IFLA_OPERSTATE = 16
+IFLA_STATS64 = 23
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+
+IFF_UP = 0x1
+IFF_LOOPBACK = 0x8
+IF_OPER_UP = 6
+
+_RESYNC_ATTEMPTS = 5  # Dumps tried after ENOBUFS before giving up on live updates
+
+_NLMSGHDR = struct.Struct("=IHHII")  # len, type, flags, seq, pid
+_IFINFOMSG = struct.Struct("=BxHiII")  # family, type, index, flags, change
+_IFADDRMSG = struct.Struct("=BBBBI")  # family, prefixlen, flags, scope, index
+_RTATTR = struct.Struct("=HH")  # len, type
+# Leading fields of rtnl_link_stats64
+_STATS64 = struct.Struct("=6Q")  # rx/tx packets, rx/tx bytes, rx/tx errors
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def messages(data: bytes) -> Iterator[tuple[int, bytes]]:
+    """Split a netlink datagram into (message type, payload) pairs."""
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, msg_type, _flags, _seq, _pid = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size:
+            break
+        yield msg_type, data[offset + _NLMSGHDR.size:offset + length]
+        offset += _align(length)
+
+
+def attributes(data: bytes, offset: int) -> dict[int, bytes]:
+    """Parse the rtattr list starting at ``offset``."""
+    attrs: dict[int, bytes] = {}
+    while offset + _RTATTR.size <= len(data):
+        length, attr_type = _RTATTR.unpack_from(data, offset)
+        if length < _RTATTR.size:
+            break
+        attrs[attr_type & 0x3FFF] = data[offset + _RTATTR.size:offset + length]
+        offset += _align(length)
+    return attrs
+
+
+def request(msg_type: int, family: int, seq: int) -> bytes:
+    """A dump request for links (``RTM_GETLINK``) or addresses (``RTM_GETADDR``)."""
+    body = _IFINFOMSG.pack(family, 0, 0, 0, 0) if msg_type == RTM_GETLINK \
+        else _IFADDRMSG.pack(family, 0, 0, 0, 0)
+    header = _NLMSGHDR.pack(_NLMSGHDR.size + len(body), msg_type,
+                            NLM_F_REQUEST | NLM_F_DUMP, seq, 0)
+    return header + body
+
+
+def dump(sock: socket.socket, msg_type: int) -> Iterator[bytes]:
+    """Request a full dump and yield reply datagrams until it is complete.
+
+    Datagrams may also carry notifications if ``sock`` joined groups.
+    """
+    family = socket.AF_INET if msg_type == RTM_GETADDR else socket.AF_UNSPEC
+    sock.send(request(msg_type, family, msg_type))
+    while True:
+        data = sock.recv(1 << 16)
+        yield data
+        if any(t in (NLMSG_DONE, NLMSG_ERROR) for t, _ in messages(data)):
+            return
+
+
+@dataclass(frozen=True)
+class Link:
+    """One interface as the kernel reports it."""
+
+    index: int
+    name: str
+    mac: str = ""
+    up: bool = False  # Administratively up and operationally running
+    loopback: bool = False
+    addresses: tuple[str, ...] = ()  # IPv4
+    operstate: int = 0  # IF_OPER_* (RFC 2863)
+    mtu: int = 0
+    stats: tuple[int, ...] = ()  # rx/tx packets, rx/tx bytes, rx/tx errors
+
+    @property
+    def connected(self) -> bool:
+        return self.up and bool(self.addresses)
+
+
+class LinkTable:
+    """Interfaces by index, updated from rtnetlink messages."""
+
+    def __init__(self) -> None:
+        self.links: dict[int, Link] = {}
+
+    def apply(self, msg_type: int, payload: bytes) -> bool:
+        """Fold one message into the table; returns True if anything changed."""
+        if msg_type in (RTM_NEWLINK, RTM_DELLINK) and len(payload) >= _IFINFOMSG.size:
+            _family, _type, index, flags, _change = _IFINFOMSG.unpack_from(payload)
+            if msg_type == RTM_DELLINK:
+                return self.links.pop(index, None) is not None
+            attrs = attributes(payload, _IFINFOMSG.size)
+            previous = self.links.get(index)
+            name = attrs.get(IFLA_IFNAME, b"").rstrip(b"\0").decode(errors="replace")
+            operstate = attrs.get(IFLA_OPERSTATE, b"\0")[0]
+            mtu = attrs.get(IFLA_MTU, b"")
+            stats = attrs.get(IFLA_STATS64, b"")
+            link = Link(
+                index=index,
+                name=name or (previous.name if previous else str(index)),
+                mac=":".join(f"{b:02x}" for b in attrs.get(IFLA_ADDRESS, b"")),
+                # Virtual links (tun, wg) report IF_OPER_UNKNOWN while working
+                up=bool(flags & IFF_UP) and operstate in (IF_OPER_UP, 0),
+                loopback=bool(flags & IFF_LOOPBACK),
+                addresses=previous.addresses if previous else (),
+                operstate=operstate,
+                mtu=struct.unpack("=I", mtu)[0] if len(mtu) == 4 else 0,
+                stats=_STATS64.unpack_from(stats) if len(stats) >= _STATS64.size else (),
+            )
+            self.links[index] = link
+            return link != previous
+
+        if msg_type in (RTM_NEWADDR, RTM_DELADDR) and len(payload) >= _IFADDRMSG.size:
+            family, _prefix, _flags, _scope, index = _IFADDRMSG.unpack_from(payload)
+            owner = self.links.get(index)
+            if family != socket.AF_INET or owner is None:
+                return False
+            attrs = attributes(payload, _IFADDRMSG.size)
+            raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+            if raw is None or len(raw) != 4:
+                return False
+            address = socket.inet_ntoa(raw)
+            if msg_type == RTM_NEWADDR:
+                if address in owner.addresses:
+                    return False
+                addresses = (*owner.addresses, address)
+            else:
+                if address not in owner.addresses:
+                    return False
+                addresses = tuple(a for a in owner.addresses if a != address)
+            self.links[index] = replace(owner, addresses=addresses)
+            return True
+        return False
+
+    def names(self, *, exclude_loopback: bool = True) -> list[str]:
+        return sorted(link.name for link in self.links.values()
+                      if not (exclude_loopback and link.loopback))
+
+
+def read_links() -> LinkTable:
+    """One-shot dump of every link and IPv4 address.
+
+    Raises:
+        OSError: If rtnetlink is unavailable.
+    """
+    table = LinkTable()
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE) as sock:
+        for msg_type in (RTM_GETLINK, RTM_GETADDR):
+            for data in dump(sock, msg_type):
+                for reply_type, payload in messages(data):
+                    table.apply(reply_type, payload)
+    return table
+
+
+class LinkWatcher:
+    """Keeps a ``LinkTable`` in sync with the kernel on a background thread.
+
+    Each change that alters the set of interfaces or which of them are
+    connected is published as an ``InterfacesChanged`` event and passed
+    to ``on_change``. Without netlink (non-Linux, restricted sandboxes) it
+    enumerates interfaces once through ``ghosty.utils.network`` instead.
+    """
+
+    def __init__(
+        self,
+        events: EventBus | None = None,
+        on_change: Callable[[InterfacesChanged], None] | None = None,
+    ) -> None:
+        self.events = events
+        self.on_change = on_change
+        self.table = LinkTable()
+        self._lock = threading.Lock()  # Guards ``table`` for readers on other threads
+        self._thread: threading.Thread | None = None
+        self._wakeup_r, self._wakeup_w = -1, -1
+        self._last: InterfacesChanged | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Begin watching; the initial dump is published from the watcher thread."""
+        if self.is_running:
+            return
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="ghosty-netlink")
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        os.write(self._wakeup_w, b"x")
+        self._thread.join(timeout=2)
+        self._thread = None
+        for fd in (self._wakeup_r, self._wakeup_w):
+            os.close(fd)
+        self._wakeup_r, self._wakeup_w = -1, -1
+
+    def links(self) -> list[Link]:
+        """Current interfaces (a copy)."""
+        with self._lock:
+            return list(self.table.links.values())
+
+    def _run(self) -> None:
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        except (AttributeError, OSError) as e:
+            logger.warning("rtnetlink unavailable (%s); interface list will not update", e)
+            self._fallback()
+            return
+
+        with sock, selectors.DefaultSelector() as selector:
+            try:
+                sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+                self._dump(sock, RTM_GETLINK)
+                self._dump(sock, RTM_GETADDR)
+            except OSError as e:
+                logger.warning("rtnetlink subscription failed (%s)", e)
+                self._fallback()
+                return
+            self._publish()
+
+            selector.register(sock, selectors.EVENT_READ)
+            selector.register(self._wakeup_r, selectors.EVENT_READ)
+            while True:
+                ready = {key.fileobj for key, _ in selector.select()}
+                if self._wakeup_r in ready:
+                    return
+                try:
+                    data = sock.recv(1 << 16)
+                except OSError as e:
+                    # ENOBUFS: we missed messages; rebuild from a fresh dump
+                    logger.warning("rtnetlink receive failed (%s); resyncing", e)
+                    if not self._resync(sock):
+                        return
+                    continue
+                if self._apply(data):
+                    self._publish()
+
+    def _resync(self, sock: socket.socket) -> bool:
+        """Rebuild the table from fresh dumps, retrying while the socket is flooded.
+
+        Returns:
+            False if stop() was called or every attempt failed; in the
+            latter case the fallback interface list has been published.
+        """
+        for attempt in range(_RESYNC_ATTEMPTS):
+            with self._lock:
+                self.table = LinkTable()
+            try:
+                self._dump(sock, RTM_GETLINK)
+                self._dump(sock, RTM_GETADDR)
+            except OSError as e:
+                logger.debug("rtnetlink resync attempt %d failed: %s", attempt + 1, e)
+                readable, _, _ = select.select([self._wakeup_r], [], [], 0.1 * 2 ** attempt)
+                if readable:
+                    return False
+                continue
+            self._publish()
+            return True
+        logger.warning("rtnetlink resync failed; interface list will not update")
+        self._fallback()
+        return False
+
+    def _dump(self, sock: socket.socket, msg_type: int) -> None:
+        """Apply a full dump (and any notifications interleaved with it)."""
+        for data in dump(sock, msg_type):
+            self._apply(data)
+
+    def _apply(self, data: bytes) -> bool:
+        changed = False
+        with self._lock:
+            for msg_type, payload in messages(data):
+                changed |= self.table.apply(msg_type, payload)
+        if changed:
+            interfaces.invalidate()
+        return changed
+
+    def _publish(self) -> None:
+        """Emit an event if the names or their connectivity changed."""
+        with self._lock:
+            links = sorted((link for link in self.table.links.values() if not link.loopback),
+                           key=lambda link: link.name)
+        event = InterfacesChanged(
+            tuple(link.name for link in links),
+            tuple(link.name for link in links if link.connected),
+        )
+        if self._last is not None and (event.interfaces, event.connected) == (
+            self._last.interfaces, self._last.connected
+        ):
+            return
+        self._last = event
+        self._emit(event)
+
+    def _fallback(self) -> None:
+        from ghosty.utils.network import get_network_interfaces
+
+        self._emit(InterfacesChanged(tuple(get_network_interfaces()), ()))
+
+    def _emit(self, event: InterfacesChanged) -> None:
+        if self.events is not None:
+            self.events.publish(event)
+        if self.on_change is not None:
+            self.on_change(event)
@@ -1,14 +1,15 @@
-"""Network utilities — IP fetching, interface enumeration, MAC reading."""
+"""Network utilities — IP fetching, interface enumeration, MAC reading.
+
+Interface queries are answered from ``ghosty.utils.interfaces.snapshot()``.
+requests is imported on first use so that importing this module (and
+everything that depends on it) stays cheap at startup.
+"""
 
 from __future__ import annotations
 
 import logging
-from pathlib import Path
-
-import psutil
-import requests
 
-from ghosty.utils.process import run_command
+from ghosty.utils.interfaces import snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,8 @@ def get_current_ip(*, proxy: dict[str, str] | None = None, timeout: int = 10) ->
     Returns:
         IP string or "Unknown" on failure.
     """
+    import requests
+
     for service in _IP_SERVICES:
         try:
             resp = requests.get(service, proxies=proxy, timeout=timeout)
@@ -56,54 +59,24 @@ def get_network_interfaces(*, exclude_loopback: bool = True) -> list[str]:
     """Get available network interface names.
 
     Args:
-        exclude_loopback: If True, excludes 'lo'.
+        exclude_loopback: If True, excludes loopback interfaces.
 
     Returns:
         List of interface name strings.
     """
-    interfaces: list[str] = []
-    try:
-        for name in psutil.net_if_addrs().keys():
-            if exclude_loopback and name == "lo":
-                continue
-            interfaces.append(name)
-    except Exception:
-        logger.exception("Failed to enumerate network interfaces")
-    return sorted(interfaces)
+    return snapshot().names(exclude_loopback=exclude_loopback)
 
 
 def get_interface_mac(interface: str) -> str:
-    """Read MAC address from /sys/class/net/{interface}/address.
-
-    Falls back to ip command if sysfs is unavailable.
-    """
-    try:
-        path = Path(f"/sys/class/net/{interface}/address")
-        return path.read_text().strip()
-    except (OSError, FileNotFoundError):
-        pass
-
-    result = run_command(["ip", "link", "show", interface], timeout=5)
-    if result.success:
-        for line in result.stdout.splitlines():
-            line = line.strip()
-            if "link/ether" in line:
-                parts = line.split()
-                if len(parts) >= 2:
-                    return parts[1]
-    return "Unknown"
+    """MAC address of an interface, or "Unknown"."""
+    info = snapshot().get(interface)
+    return info.mac if info is not None and info.mac else "Unknown"
 
 
 def get_ip_for_interface(interface: str) -> str:
     """Get the IPv4 address assigned to an interface."""
-    try:
-        addrs = psutil.net_if_addrs().get(interface, [])
-        for addr in addrs:
-            if addr.family.name == "AF_INET":
-                return addr.address
-    except Exception:
-        logger.exception("Failed to get IP for %s", interface)
-    return "Unknown"
+    info = snapshot().get(interface)
+    return info.addresses[0] if info is not None and info.addresses else "Unknown"
 
 
 # Aliases used by GUI
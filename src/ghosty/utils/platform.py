@@ -102,9 +102,8 @@ def get_install_command(pm: PackageManager, packages: list[str]) -> list[str] |
     Returns:
         Command list or None if package manager is unknown.
     """
-    pkg_str = " ".join(packages)
     commands = {
-        PackageManager.APT: ["sudo", "apt", "install", "-y", *packages],
+        PackageManager.APT: ["sudo", "apt-get", "install", "-y", *packages],
         PackageManager.DNF: ["sudo", "dnf", "install", "-y", *packages],
         PackageManager.YUM: ["sudo", "yum", "install", "-y", *packages],
         PackageManager.PACMAN: ["sudo", "pacman", "-S", "--noconfirm", *packages],
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import shutil
 import subprocess
 from dataclasses import dataclass
 
+from ghosty.tracing import span
+
 
 @dataclass(frozen=True)
 class CommandResult:
@@ -21,6 +24,7 @@ def run_command(
     *,
     timeout: int = 30,
     check: bool = False,
+    input: str | None = None,  # noqa: A002
 ) -> CommandResult:
     """Run a command safely with list arguments (no shell injection).
 
@@ -28,10 +32,21 @@ def run_command(
         cmd: Command and arguments as a list.
         timeout: Maximum seconds to wait.
         check: If True, raise on non-zero exit.
+        input: Optional text fed to the command's stdin.
 
     Returns:
         CommandResult with success flag, output, and return code.
     """
+    with span("run_command", argv=cmd) as sp:
+        result = _run(cmd, timeout=timeout, check=check, input=input)
+        sp.set(returncode=result.returncode)
+        return result
+
+
+def _run(
+    cmd: list[str], *, timeout: int, check: bool, input: str | None  # noqa: A002
+) -> CommandResult:
+    """Execute the command and fold every failure mode into a CommandResult."""
     try:
         result = subprocess.run(
             cmd,
@@ -39,6 +54,7 @@ def run_command(
             text=True,
             timeout=timeout,
             check=check,
+            input=input,
         )
         return CommandResult(
             success=result.returncode == 0,
@@ -71,5 +87,4 @@ def run_command(
 
 def is_available(name: str) -> bool:
     """Check if a command is available on PATH."""
-    result = run_command(["which", name], timeout=5)
-    return result.success
+    return shutil.which(name) is not None
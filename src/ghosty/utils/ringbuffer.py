@@ -0,0 +1,83 @@
+"""Fixed-size ring buffer of floats backed by a flat array."""
+
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+
+
+class RingBuffer:
+    """Constant-memory ring buffer of float samples.
+
+    Storage is a single preallocated ``array('d')``; once full, new samples
+    overwrite the oldest. Reads take a short lock so readers on other
+    threads (GUI, exporters) always see a consistent window.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._data = array("d", bytes(8 * capacity))
+        self._capacity = capacity
+        self._next = 0
+        self._count = 0
+        self._total = 0  # Samples ever appended, used as a change counter
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def total(self) -> int:
+        """Number of samples ever appended (monotonic)."""
+        return self._total
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float) -> None:
+        """Add a sample, overwriting the oldest when full."""
+        with self._lock:
+            self._data[self._next] = value
+            self._next = (self._next + 1) % self._capacity
+            if self._count < self._capacity:
+                self._count += 1
+            self._total += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._next = 0
+            self._count = 0
+
+    def values(self, n: int | None = None) -> list[float]:
+        """Return the newest ``n`` samples (all if None), oldest first."""
+        with self._lock:
+            count = self._count if n is None else min(n, self._count)
+            start = (self._next - count) % self._capacity
+            if start + count <= self._capacity:
+                return self._data[start:start + count].tolist()
+            return (self._data[start:] + self._data[:self._next]).tolist()
+
+    def latest(self) -> float | None:
+        """Return the newest sample or None when empty."""
+        with self._lock:
+            if not self._count:
+                return None
+            return self._data[(self._next - 1) % self._capacity]
+
+    def mean(self, n: int | None = None) -> float | None:
+        """Moving average over the newest ``n`` samples."""
+        window = self.values(n)
+        return sum(window) / len(window) if window else None
+
+    def percentile(self, pct: float, n: int | None = None) -> float | None:
+        """Linear-interpolated percentile (0-100) over the newest ``n`` samples."""
+        window = sorted(self.values(n))
+        if not window:
+            return None
+        rank = (len(window) - 1) * pct / 100
+        low = math.floor(rank)
+        high = math.ceil(rank)
+        return window[low] + (window[high] - window[low]) * (rank - low)
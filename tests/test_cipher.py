@@ -0,0 +1,90 @@
+"""Tests for OpenVPN data-channel tuning."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+from ghosty.core.cipher import (
+    DataChannelPlan,
+    benchmark_ciphers,
+    cpu_crypto_features,
+    order_ciphers,
+    plan_data_channel,
+)
+from ghosty.utils.process import CommandResult
+
+_SPEED_OUTPUT = """\
+The 'numbers' are in 1000s of bytes per second processed.
+type           1408 bytes
+AES-128-GCM    4521876.48k
+"""
+
+
+class TestCipherSelection:
+    """Tests for cipher ordering and CPU feature detection."""
+
+    def test_x86_flags(self) -> None:
+        cpuinfo = "processor : 0\nflags : fpu sse2 aes avx2 pclmulqdq\n"
+        assert cpu_crypto_features(cpuinfo) == {"aes", "avx2", "pclmulqdq"}
+
+    def test_arm_features(self) -> None:
+        cpuinfo = "processor : 0\nFeatures : fp asimd aes pmull sha2\n"
+        assert cpu_crypto_features(cpuinfo) == {"aes", "pmull", "sha2"}
+
+    def test_aes_ni_prefers_gcm(self) -> None:
+        assert order_ciphers({"aes"})[0] == "AES-128-GCM"
+
+    def test_no_aes_prefers_chacha(self) -> None:
+        assert order_ciphers(set())[0] == "CHACHA20-POLY1305"
+
+    def test_measured_throughput_wins(self) -> None:
+        ciphers = order_ciphers({"aes"}, {"CHACHA20-POLY1305": 3e9, "AES-128-GCM": 1e9})
+        assert ciphers[:2] == ["CHACHA20-POLY1305", "AES-128-GCM"]
+        assert "AES-256-GCM" in ciphers
+
+    def test_benchmark_parses_openssl_speed(self) -> None:
+        result = CommandResult(success=True, stdout=_SPEED_OUTPUT, stderr="", returncode=0)
+        with patch("ghosty.core.cipher.run_command", return_value=result):
+            assert benchmark_ciphers(["AES-128-GCM"]) == {"AES-128-GCM": 4521876480.0}
+
+
+class TestDataChannelPlan:
+    """Tests for DataChannelPlan command-line options."""
+
+    def _plan(self, tmp_path: Path, config: str, **kwargs):
+        path = tmp_path / "vpn.ovpn"
+        path.write_text(config)
+        with patch("ghosty.core.cipher.cpu_crypto_features", return_value={"aes"}), \
+                patch("ghosty.core.cipher.openvpn_version", return_value=(2, 6)), \
+                patch("ghosty.core.cipher.dco_available", return_value=False):
+            return plan_data_channel(str(path), **kwargs)
+
+    def test_config_data_ciphers_are_only_reordered(self, tmp_path: Path) -> None:
+        plan = self._plan(tmp_path, "remote vpn.example.com\n"
+                                    "data-ciphers CHACHA20-POLY1305:aes-256-gcm:AES-256-CBC\n")
+        assert plan.data_ciphers == ["AES-256-GCM", "CHACHA20-POLY1305", "AES-256-CBC"]
+
+    def test_legacy_cipher_stays_negotiable(self, tmp_path: Path) -> None:
+        plan = self._plan(tmp_path, "cipher AES-256-CBC\n")
+        assert plan.data_ciphers == ["AES-128-GCM", "AES-256-GCM", "CHACHA20-POLY1305",
+                                     "AES-256-CBC"]
+
+    def test_benchmark_uses_cached_throughput(self, tmp_path: Path) -> None:
+        with patch("ghosty.core.cipher.preflight.measured",
+                   return_value={"CHACHA20-POLY1305": 3e9}) as measured:
+            plan = self._plan(tmp_path, "remote vpn.example.com\n", benchmark=True)
+        assert plan.data_ciphers[0] == "CHACHA20-POLY1305"
+        assert measured.call_args.args[:2] == ("cipher_throughput", ("bin:openssl", "kernel"))
+
+    def test_dco_plan(self) -> None:
+        plan = DataChannelPlan(["AES-128-GCM", "AES-256-GCM"], dco=True, version=(2, 6))
+        assert plan.openvpn_args() == ["--data-ciphers", "AES-128-GCM:AES-256-GCM"]
+
+    def test_userspace_plan_disables_dco_probe(self) -> None:
+        plan = DataChannelPlan(["CHACHA20-POLY1305"], dco=False, version=(2, 6))
+        assert "--disable-dco" in plan.openvpn_args()
+
+    def test_old_openvpn_gets_no_options(self) -> None:
+        plan = DataChannelPlan(["AES-128-GCM"], dco=False, version=(2, 4))
+        assert plan.openvpn_args() == []
@@ -0,0 +1,241 @@
+"""Tests for the headless daemon and its ctl client."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from ghosty import ctl
+from ghosty.config import GhostyConfig, ProfileConfig
+from ghosty.core.orchestrator import AnonymizationMode, Orchestrator
+from ghosty.daemon import Daemon, parse_mode
+from ghosty.events import EventBus, IPRotated
+
+
+def _orchestrator() -> MagicMock:
+    orchestrator = MagicMock()
+    orchestrator.is_active = False
+    orchestrator.current_mode = None
+    orchestrator.vpn_state = "stopped"
+    orchestrator.vpn.get_status.return_value = "Disconnected"
+    orchestrator.tor.is_running = False
+    orchestrator.start.return_value = (True, "Normal mode started")
+    orchestrator.stop.return_value = (True, "Stopped")
+    orchestrator.tor.rotate_ip.return_value = (True, "New TOR identity requested")
+    orchestrator.events = EventBus()
+    return orchestrator
+
+
+@pytest.fixture
+def running_daemon(tmp_path: Path):
+    """Serve a daemon with a mocked orchestrator on a background loop."""
+    daemon = Daemon(_orchestrator(), str(tmp_path / "ghosty.sock"))
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    def _serve() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(daemon.start())
+        ready.set()
+        loop.run_until_complete(daemon.serve())
+
+    thread = threading.Thread(target=_serve, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield daemon
+    loop.call_soon_threadsafe(daemon.request_shutdown)
+    thread.join(5)
+    loop.close()
+
+
+class TestParseMode:
+    def test_accepts_name_or_value(self) -> None:
+        assert parse_mode("enhanced") is AnonymizationMode.ENHANCED
+        assert parse_mode("Standard") is AnonymizationMode.STANDARD
+
+    def test_rejects_unknown(self) -> None:
+        with pytest.raises(ValueError, match="Unknown mode"):
+            parse_mode("stealth")
+
+
+class TestDispatch:
+    """Request decoding and command handling."""
+
+    def _dispatch(self, daemon: Daemon, request: object) -> dict:
+        async def _run() -> dict:
+            daemon._lock = asyncio.Lock()
+            return await daemon.dispatch(json.dumps(request))
+        return asyncio.run(_run())
+
+    def test_invalid_json(self) -> None:
+        daemon = Daemon(_orchestrator(), "/nonexistent.sock")
+        reply = asyncio.run(daemon.dispatch(b"{nope"))
+        assert reply == {"ok": False, "message": "Invalid JSON"}
+
+    def test_unknown_command(self) -> None:
+        daemon = Daemon(_orchestrator(), "/nonexistent.sock")
+        reply = self._dispatch(daemon, {"cmd": "reboot"})
+        assert not reply["ok"]
+        assert "Unknown command" in reply["message"]
+
+    def test_start_uses_config_defaults(self) -> None:
+        config = GhostyConfig()
+        config.general.default_interface = "eth0"
+        config.vpn.config_path = "/etc/vpn/a.ovpn"
+        daemon = Daemon(_orchestrator(), "/nonexistent.sock", config=config)
+
+        reply = self._dispatch(daemon, {"cmd": "start", "mode": "standard"})
+
+        assert reply["ok"]
+        daemon.orchestrator.start.assert_called_once_with(
+            AnonymizationMode.STANDARD, "eth0", vpn_config="/etc/vpn/a.ovpn",
+            vpn_auth=None, vpn_fallbacks=[],
+        )
+
+    def test_start_sets_provider_under_lock(self) -> None:
+        daemon = Daemon(_orchestrator(), "/nonexistent.sock")
+        daemon.orchestrator.vpn.provider = "openvpn"
+        providers: list[str] = []
+        daemon.orchestrator.start.side_effect = lambda *a, **kw: (
+            providers.append(daemon.orchestrator.vpn.provider) or (True, "ok"))
+
+        reply = self._dispatch(daemon, {"cmd": "start", "mode": "standard", "interface": "eth0",
+                                        "vpn_config": "/etc/wg/wg0.conf",
+                                        "provider": "wireguard"})
+
+        assert reply["ok"]
+        assert providers == ["wireguard"]
+
+    def test_start_requires_vpn_config(self) -> None:
+        daemon = Daemon(_orchestrator(), "/nonexistent.sock")
+        reply = self._dispatch(daemon, {"cmd": "start", "mode": "Enhanced", "interface": "eth0"})
+        assert not reply["ok"]
+        daemon.orchestrator.start.assert_not_called()
+
+    def test_start_profile(self, tmp_path: Path) -> None:
+        vpn_config = tmp_path / "work.ovpn"
+        vpn_config.write_text("remote vpn.example.com 443\n")
+        config = GhostyConfig()
+        config.profiles["work"] = ProfileConfig(mode="Standard", interface="eth0",
+                                                vpn_config=str(vpn_config))
+        daemon = Daemon(_orchestrator(), "/nonexistent.sock", config=config)
+
+        reply = self._dispatch(daemon, {"cmd": "start", "profile": "work",
+                                        "interface": "wlan0"})
+
+        assert reply["ok"]
+        args, kwargs = daemon.orchestrator.start.call_args
+        assert args == (AnonymizationMode.STANDARD, "wlan0")
+        assert kwargs["vpn_parsed"].endpoint == ("vpn.example.com", 443)
+
+    def test_plain_start_after_profile_uses_config(self, tmp_path: Path) -> None:
+        wg_config = tmp_path / "wg0.conf"
+        wg_config.write_text("[Interface]\nPrivateKey = a=\n[Peer]\nEndpoint = 192.0.2.1:51820\n")
+        config = GhostyConfig()
+        config.general.default_interface = "eth0"
+        config.vpn.config_path = "/etc/vpn/a.ovpn"
+        config.profiles["wg"] = ProfileConfig(mode="Standard", provider="wireguard",
+                                              wireguard_backend="wg-quick",
+                                              vpn_config=str(wg_config), rotation_interval=30)
+        orchestrator = Orchestrator(mac=MagicMock(), vpn=MagicMock(), tor=MagicMock())
+        orchestrator.apply_config(config)
+        started: list[tuple[str, str]] = []
+        orchestrator.start = MagicMock(side_effect=lambda *a, **kw: (
+            started.append((orchestrator.vpn.provider, orchestrator.vpn.wireguard_backend))
+            or (True, "ok")))
+        orchestrator.stop = MagicMock(return_value=(True, "Stopped"))
+        daemon = Daemon(orchestrator, "/nonexistent.sock", config=config)
+
+        assert self._dispatch(daemon, {"cmd": "start", "profile": "wg"})["ok"]
+        assert self._dispatch(daemon, {"cmd": "stop"})["ok"]
+        assert self._dispatch(daemon, {"cmd": "start", "mode": "standard"})["ok"]
+
+        assert started == [("wireguard", "wg-quick"), ("openvpn", config.vpn.wireguard_backend)]
+        orchestrator.tor.set_rotation_interval.assert_called_with(config.tor.rotation_interval)
+
+    def test_start_unknown_profile(self) -> None:
+        daemon = Daemon(_orchestrator(), "/nonexistent.sock")
+        reply = self._dispatch(daemon, {"cmd": "start", "profile": "work"})
+        assert not reply["ok"]
+        assert "Unknown profile" in reply["message"]
+        daemon.orchestrator.start.assert_not_called()
+
+    def test_rotate_requires_tor(self) -> None:
+        daemon = Daemon(_orchestrator(), "/nonexistent.sock")
+        daemon.orchestrator.is_active = True
+        daemon.orchestrator.current_mode = AnonymizationMode.STANDARD
+        reply = self._dispatch(daemon, {"cmd": "rotate"})
+        assert reply == {"ok": False, "message": "TOR is not active"}
+
+    def test_rotate(self) -> None:
+        daemon = Daemon(_orchestrator(), "/nonexistent.sock")
+        daemon.orchestrator.is_active = True
+        daemon.orchestrator.current_mode = AnonymizationMode.ENHANCED
+        reply = self._dispatch(daemon, {"cmd": "rotate"})
+        assert reply["ok"]
+        daemon.orchestrator.tor.rotate_ip.assert_called_once()
+
+
+class TestSocket:
+    """End-to-end requests over the Unix socket."""
+
+    def test_ctl_status(self, running_daemon: Daemon) -> None:
+        reply = ctl.request({"cmd": "status"}, str(running_daemon.socket_path), timeout=5)
+        assert reply["ok"]
+        assert reply["active"] is False
+        assert reply["vpn"] == "Disconnected"
+
+    def test_ctl_main_exit_codes(self, running_daemon: Daemon, capsys) -> None:
+        socket_path = str(running_daemon.socket_path)
+        assert ctl.main(["--socket", socket_path, "stop"]) == 0
+        running_daemon.orchestrator.stop.return_value = (False, "Not active")
+        assert ctl.main(["--socket", socket_path, "stop"]) == 1
+        assert "Not active" in capsys.readouterr().err
+
+    def test_status_not_blocked_by_slow_start(self, running_daemon: Daemon) -> None:
+        release = threading.Event()
+
+        def _slow_start(*args, **kwargs):
+            release.wait(5)
+            return True, "Normal mode started"
+
+        running_daemon.orchestrator.start.side_effect = _slow_start
+        socket_path = str(running_daemon.socket_path)
+        replies: list[dict] = []
+        starter = threading.Thread(target=lambda: replies.append(ctl.request(
+            {"cmd": "start", "mode": "Normal", "interface": "eth0"}, socket_path, timeout=5
+        )))
+        starter.start()
+
+        begin = time.monotonic()
+        status = ctl.request({"cmd": "status"}, socket_path, timeout=5)
+        assert status["ok"]
+        assert time.monotonic() - begin < 1
+
+        release.set()
+        starter.join(5)
+        assert replies == [{"ok": True, "message": "Normal mode started"}]
+
+    def test_refuses_second_daemon(self, running_daemon: Daemon) -> None:
+        second = Daemon(_orchestrator(), str(running_daemon.socket_path))
+        with pytest.raises(RuntimeError, match="already listening"):
+            second._prepare_socket()
+
+    def test_unreachable_daemon(self, tmp_path: Path, capsys) -> None:
+        assert ctl.main(["--socket", str(tmp_path / "missing.sock"), "status"]) == 1
+        assert "Cannot reach" in capsys.readouterr().err
+
+    def test_watch_streams_events(self, running_daemon: Daemon) -> None:
+        stream = ctl.watch(str(running_daemon.socket_path))
+        assert next(stream)["ok"]
+        running_daemon.orchestrator.events.publish(IPRotated("198.51.100.7"))
+        event = next(stream)
+        assert event["type"] == "IPRotated"
+        assert event["ip"] == "198.51.100.7"
+        stream.close()
@@ -0,0 +1,142 @@
+"""Tests for the event bus."""
+
+from __future__ import annotations
+
+import threading
+
+from ghosty.events import (
+    EventBus,
+    EventsDropped,
+    IPRotated,
+    LogMessage,
+    ModeChanged,
+    VPNStateChanged,
+    to_dict,
+)
+
+
+class TestSubscription:
+    """Queueing, coalescing and bounds."""
+
+    def test_type_filter(self) -> None:
+        bus = EventBus()
+        logs = bus.subscribe(types=(LogMessage,))
+        everything = bus.subscribe()
+
+        bus.publish(LogMessage("hello"))
+        bus.publish(IPRotated("198.51.100.7"))
+
+        assert [e.message for e in logs.drain()] == ["hello"]
+        assert len(everything.drain()) == 2
+
+    def test_state_events_coalesce(self) -> None:
+        bus = EventBus()
+        sub = bus.subscribe()
+        bus.publish(VPNStateChanged("reconnecting"))
+        bus.publish(LogMessage("retrying"))
+        bus.publish(VPNStateChanged("healthy"))
+
+        batch = sub.drain()
+        assert [type(e).__name__ for e in batch] == ["LogMessage", "VPNStateChanged"]
+        assert batch[-1].state == "healthy"
+
+    def test_log_messages_are_not_coalesced(self) -> None:
+        bus = EventBus()
+        sub = bus.subscribe()
+        for i in range(3):
+            bus.publish(LogMessage(f"line {i}"))
+        assert len(sub.drain()) == 3
+
+    def test_overflow_drops_oldest_and_reports(self) -> None:
+        bus = EventBus()
+        sub = bus.subscribe(maxsize=3)
+        for i in range(5):
+            bus.publish(LogMessage(f"line {i}"))
+
+        batch = sub.drain()
+        assert isinstance(batch[0], EventsDropped)
+        assert batch[0].count == 2
+        assert [e.message for e in batch[1:]] == ["line 2", "line 3", "line 4"]
+        assert sub.dropped == 2
+        assert sub.drain() == []
+
+    def test_drain_limit(self) -> None:
+        bus = EventBus()
+        sub = bus.subscribe()
+        for i in range(5):
+            bus.publish(LogMessage(f"line {i}"))
+        assert len(sub.drain(2)) == 2
+        assert len(sub.drain()) == 3
+
+    def test_closed_subscription_stops_receiving(self) -> None:
+        bus = EventBus()
+        sub = bus.subscribe()
+        sub.close()
+        bus.publish(LogMessage("late"))
+        assert sub.drain() == []
+
+
+class TestDelivery:
+    """Handler threads."""
+
+    def test_handler_receives_batches(self) -> None:
+        bus = EventBus()
+        received: list[str] = []
+        done = threading.Event()
+
+        def _handler(batch) -> None:
+            received.extend(e.message for e in batch)
+            if len(received) == 3:
+                done.set()
+
+        sub = bus.subscribe(_handler)
+        for i in range(3):
+            bus.publish(LogMessage(str(i)))
+        assert done.wait(2)
+        sub.close()
+        assert received == ["0", "1", "2"]
+
+    def test_slow_subscriber_does_not_block_publisher(self) -> None:
+        bus = EventBus()
+        release = threading.Event()
+        fast: list[object] = []
+        fast_done = threading.Event()
+
+        def _slow(batch) -> None:
+            release.wait(5)
+
+        def _fast(batch) -> None:
+            fast.extend(batch)
+            if len(fast) >= 100:
+                fast_done.set()
+
+        slow = bus.subscribe(_slow, maxsize=10)
+        quick = bus.subscribe(_fast)
+        for i in range(100):
+            bus.publish(LogMessage(str(i)))
+
+        assert fast_done.wait(2)
+        release.set()
+        slow.close()
+        quick.close()
+        assert slow.dropped > 0
+
+    def test_handler_errors_are_contained(self) -> None:
+        bus = EventBus()
+        calls = threading.Semaphore(0)
+
+        def _broken(batch) -> None:
+            calls.release()
+            raise RuntimeError("boom")
+
+        sub = bus.subscribe(_broken)
+        bus.publish(LogMessage("a"))
+        assert calls.acquire(timeout=2)
+        bus.publish(LogMessage("b"))
+        assert calls.acquire(timeout=2)
+        sub.close()
+
+
+def test_to_dict() -> None:
+    data = to_dict(ModeChanged("Enhanced", active=True, timestamp=1.0))
+    assert data == {"type": "ModeChanged", "mode": "Enhanced", "active": True, "timestamp": 1.0}
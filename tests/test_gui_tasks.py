@@ -0,0 +1,85 @@
+"""Tests for the GUI background task layer."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ghosty.gui.tasks import TaskRunner
+
+
+def _drain_until(runner: TaskRunner, count: int, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    handled = 0
+    while handled < count:
+        assert time.monotonic() < deadline, "task did not finish"
+        handled += runner.drain()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def runner():
+    runner = TaskRunner(max_workers=2)
+    yield runner
+    runner.shutdown()
+
+
+class TestTaskRunner:
+    def test_result_delivered_on_drain(self, runner: TaskRunner) -> None:
+        results: list[tuple[int, str]] = []
+        runner.submit("work", lambda _cancel: 42,
+                      lambda value: results.append((value, threading.current_thread().name)))
+        assert results == []  # Nothing runs until the owner drains
+
+        _drain_until(runner, 1)
+        assert results == [(42, threading.current_thread().name)]
+        assert runner.pending("work") is None
+
+    def test_single_flight_per_key(self, runner: TaskRunner) -> None:
+        release = threading.Event()
+        first = runner.submit("session", lambda _cancel: release.wait(2), name="start")
+        assert first is not None
+        assert runner.submit("session", lambda _cancel: None) is None
+        assert runner.pending("session") is first
+        assert runner.submit("ip", lambda _cancel: None) is not None  # Other keys still run
+
+        release.set()
+        _drain_until(runner, 2)
+        assert runner.pending("session") is None
+        assert runner.submit("session", lambda _cancel: None) is not None
+
+    def test_cancel_reaches_action(self, runner: TaskRunner) -> None:
+        results: list[str] = []
+
+        def _action(cancel: threading.Event) -> str:
+            return "cancelled" if cancel.wait(2) else "timed out"
+
+        task = runner.submit("session", _action, results.append)
+        assert task is not None
+        task.cancel()
+        _drain_until(runner, 1)
+        assert results == ["cancelled"]
+        assert task.cancelled
+
+    def test_errors_go_to_on_error(self, runner: TaskRunner) -> None:
+        errors: list[Exception] = []
+
+        def _fail(_cancel: threading.Event) -> None:
+            raise RuntimeError("boom")
+
+        runner.submit("session", _fail, lambda _value: None, on_error=errors.append)
+        _drain_until(runner, 1)
+        assert [str(e) for e in errors] == ["boom"]
+        assert runner.pending("session") is None
+
+    def test_completions_are_batched(self, runner: TaskRunner) -> None:
+        done = threading.Barrier(3)
+        results: list[int] = []
+        for i in range(2):
+            runner.submit(f"task{i}", lambda _cancel, i=i: (done.wait(2), i)[1], results.append)
+        done.wait(2)
+        time.sleep(0.05)
+        assert runner.drain() == 2
+        assert sorted(results) == [0, 1]
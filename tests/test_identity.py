@@ -0,0 +1,154 @@
+"""Tests for namespace-isolated identities."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ghosty import execute
+from ghosty.config import GhostyConfig, IdentityConfig
+from ghosty.core import identity as ident
+from ghosty.core import netns
+from ghosty.core.identity import IdentityManager, firewall_ruleset, validate_name
+from ghosty.core.netns import Namespace
+from ghosty.core.tor import TORInstance
+from ghosty.utils.process import CommandResult
+
+_OK = CommandResult(True, "", "", 0)
+
+
+class TestNamespace:
+    def test_create_with_uplink(self, tmp_path: Path) -> None:
+        ns = Namespace("ghosty-work", 3, ("9.9.9.9",))
+        with patch.object(netns, "exists", return_value=False), \
+             patch.object(netns, "_ETC_NETNS", tmp_path), \
+             patch.object(netns, "run_command", return_value=_OK) as run:
+            success, _ = ns.create(uplink=True)
+
+        assert success
+        assert (tmp_path / "ghosty-work" / "resolv.conf").read_text() == "nameserver 9.9.9.9\n"
+        commands = [call.args[0] for call in run.call_args_list]
+        assert commands[0] == ["ip", "netns", "add", "ghosty-work"]
+        host_batch = run.call_args_list[2].kwargs["input"]
+        assert "link add ghv3h type veth peer name ghv3n netns ghosty-work" in host_batch
+        ruleset = run.call_args_list[-1].kwargs["input"]
+        assert "ip saddr 10.200.3.0/30" in ruleset
+
+    def test_failed_setup_deletes_namespace(self, tmp_path: Path) -> None:
+        ns = Namespace("ghosty-work", 1)
+        results = iter([_OK, CommandResult(False, "", "RTNETLINK answers", 2)])
+        with patch.object(netns, "exists", return_value=False), \
+             patch.object(netns, "_ETC_NETNS", tmp_path), \
+             patch.object(netns, "run_command", side_effect=lambda *a, **k: next(results, _OK)), \
+             patch.object(Namespace, "delete") as delete:
+            success, message = ns.create(uplink=False)
+        assert not success
+        assert "RTNETLINK" in message
+        delete.assert_called_once()
+
+    def test_usage_sums_processes(self) -> None:
+        ns = Namespace("ghosty-work", 1)
+        with patch.object(Namespace, "pids", return_value=[os.getpid(), 2**22 + 1]):
+            usage = ns.usage()
+        assert usage.processes == 1  # The bogus pid is skipped
+        assert usage.threads >= 1
+        assert usage.rss_bytes > 0
+        assert usage.open_files > 0
+
+
+class TestFirewall:
+    def test_vpn_keeps_workloads_off_uplink(self) -> None:
+        rules = firewall_ruleset(Namespace("ghosty-a", 2), uplink=True, tor=None)
+        assert 'oifname "ghv2n" drop' in rules
+        assert "redirect" not in rules
+
+    def test_tor_redirects_and_drops_the_rest(self) -> None:
+        tor = TORInstance(Path("/tmp/tor"), user=None)
+        rules = firewall_ruleset(Namespace("ghosty-a", 2), uplink=True, tor=tor)
+        assert "meta l4proto tcp redirect to :9040" in rules
+        assert "udp dport 53 redirect to :53" in rules
+        assert "    drop\n" in rules
+
+
+class TestIdentityManager:
+    def test_names_are_validated(self) -> None:
+        assert validate_name("work-1") == "work-1"
+        with pytest.raises(ValueError):
+            validate_name("../etc")
+
+    def test_session_layout(self) -> None:
+        manager = IdentityManager()
+        tor_only = manager.session("anon", IdentityConfig(tor=True), 1)
+        assert tor_only.uplink
+        assert tor_only.namespace.dns == ("127.0.0.1",)
+
+        openvpn = manager.session("work", IdentityConfig(vpn_config="/etc/vpn/a.ovpn"), 2)
+        assert openvpn.uplink
+        assert openvpn.vpn.netns == "ghosty-work"
+
+        with pytest.raises(ValueError, match="neither"):
+            manager.session("empty", IdentityConfig(), 3)
+
+    def test_identities_start_and_stop_independently(self) -> None:
+        manager = IdentityManager()
+        started: list[int] = []
+
+        def _start(session: ident.IdentitySession) -> tuple[bool, str]:
+            started.append(session.namespace.index)
+            return True, "up"
+
+        with patch.object(ident.IdentitySession, "start", _start), \
+             patch.object(ident.IdentitySession, "stop", return_value=(True, "down")):
+            assert manager.start("a", IdentityConfig(tor=True))[0]
+            assert manager.start("b", IdentityConfig(tor=True))[0]
+            assert not manager.start("a", IdentityConfig(tor=True))[0]
+            assert manager.stop("a")[0]
+            assert manager.start("c", IdentityConfig(tor=True))[0]
+
+        assert started == [1, 2, 1]  # "a"'s index is reused after it stops
+        assert set(manager._sessions) == {"b", "c"}
+
+    def test_failed_start_releases_name(self) -> None:
+        manager = IdentityManager()
+        with patch.object(ident.IdentitySession, "start", return_value=(False, "no tor")):
+            assert manager.start("a", IdentityConfig(tor=True)) == (False, "no tor")
+        assert manager._sessions == {}
+
+
+def test_config_round_trip(tmp_path: Path) -> None:
+    config = GhostyConfig()
+    config.identities["work"] = IdentityConfig(provider="wireguard", vpn_config="/etc/wg/w.conf")
+    config.identities["anon"] = IdentityConfig(tor=True, dns=[])
+    config.save(tmp_path / "config.toml")
+
+    loaded = GhostyConfig.load(tmp_path / "config.toml")
+    assert loaded.identities == config.identities
+
+
+def test_exec_drops_privileges() -> None:
+    cmd = execute.command("work", ["curl", "ifconfig.me"], uid=1000, gid=1000)
+    assert cmd[:4] == ["ip", "netns", "exec", "ghosty-work"]
+    assert cmd[4:8] == ["setpriv", "--reuid=1000", "--regid=1000", "--init-groups"]
+    assert cmd[-2:] == ["curl", "ifconfig.me"]
+
+
+def test_exec_unknown_identity(capsys) -> None:
+    with patch.object(execute, "exists", return_value=False), \
+         patch.object(execute.os, "execvp") as execvp:
+        assert execute.main(["--identity", "nope", "--", "true"]) == 1
+    execvp.assert_not_called()
+    assert "not running" in capsys.readouterr().err
+
+
+def test_daemon_rejects_unknown_identity() -> None:
+    import asyncio
+
+    from ghosty.daemon import Daemon
+
+    daemon = Daemon(MagicMock(), "/nonexistent.sock")
+    reply = asyncio.run(daemon.dispatch('{"cmd": "identity", "action": "start", "name": "x"}'))
+    assert not reply["ok"]
+    assert "Unknown identity x" in reply["message"]
@@ -0,0 +1,86 @@
+"""Tests for cached interface snapshots."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ghosty.core.mac import MACChanger
+from ghosty.utils import interfaces, netlink
+from ghosty.utils.interfaces import Counters, InterfaceInfo
+from ghosty.utils.netlink import Link, LinkTable
+from ghosty.utils.network import get_interface_mac, get_ip_for_interface, get_network_interfaces
+
+
+def _table() -> LinkTable:
+    table = LinkTable()
+    table.links = {
+        1: Link(1, "lo", "00:00:00:00:00:00", up=True, loopback=True, addresses=("127.0.0.1",)),
+        2: Link(2, "eth0", "02:11:22:33:44:55", up=True, addresses=("192.168.1.5",),
+                operstate=netlink.IF_OPER_UP, mtu=1500, stats=(1, 2, 300, 400, 0, 0)),
+    }
+    return table
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    interfaces.invalidate()
+    yield
+    interfaces.invalidate()
+
+
+class TestSnapshot:
+    def test_single_dump_serves_every_query(self) -> None:
+        with patch.object(netlink, "read_links", return_value=_table()) as read:
+            assert get_network_interfaces() == ["eth0"]
+            assert get_interface_mac("eth0") == "02:11:22:33:44:55"
+            assert MACChanger().get_current_mac("eth0") == "02:11:22:33:44:55"
+            assert get_ip_for_interface("eth0") == "192.168.1.5"
+            assert get_interface_mac("missing") == "Unknown"
+        read.assert_called_once()
+
+        info = interfaces.snapshot().get("eth0")
+        assert info is not None
+        assert info.operstate == "up"
+        assert info.counters == Counters(1, 2, 300, 400, 0, 0)
+
+    def test_generations_and_invalidation(self) -> None:
+        with patch.object(netlink, "read_links", return_value=_table()) as read:
+            first = interfaces.snapshot()
+            assert interfaces.snapshot() is first
+            interfaces.invalidate()
+            second = interfaces.snapshot()
+            assert second.generation > first.generation
+            assert interfaces.snapshot(max_age=0).generation > second.generation
+        assert read.call_count == 3
+
+    def test_sysfs_fallback(self, tmp_path: Path) -> None:
+        eth = tmp_path / "eth0"
+        (eth / "statistics").mkdir(parents=True)
+        for name, value in {"address": "02:aa:bb:cc:dd:ee", "operstate": "up", "flags": "0x1003",
+                            "ifindex": "2", "mtu": "1500", "speed": "1000"}.items():
+            (eth / name).write_text(value + "\n")
+        (eth / "statistics" / "rx_bytes").write_text("1234\n")
+
+        with patch.object(netlink, "read_links", side_effect=OSError("no netlink")), \
+             patch.object(interfaces, "_SYS_NET", str(tmp_path)):
+            info = interfaces.snapshot().get("eth0")
+
+        assert info == InterfaceInfo(
+            name="eth0", index=2, mac="02:aa:bb:cc:dd:ee", addresses=info.addresses,
+            operstate="up", up=True, mtu=1500, speed=1000, counters=Counters(rx_bytes=1234),
+        )
+
+
+def test_mac_change_invalidates_cache() -> None:
+    changer = MACChanger()
+    with patch.object(netlink, "read_links", return_value=_table()):
+        interfaces.snapshot()
+        with patch.object(changer, "is_available", return_value=True), \
+             patch("ghosty.core.mac.run_command") as run:
+            run.return_value.success = True
+            run.return_value.stdout = "New MAC:       02:de:ad:be:ef:00"
+            assert changer.change_mac("eth0")[0]
+    assert interfaces._current is None
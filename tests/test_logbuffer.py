@@ -0,0 +1,71 @@
+"""Tests for the GUI log line buffer."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from ghosty.utils.logbuffer import LogBuffer
+
+
+class TestLogBuffer:
+    def test_take_in_order(self) -> None:
+        buf = LogBuffer(10)
+        for i in range(3):
+            buf.push(f"line {i}")
+        assert buf.take() == (["line 0", "line 1", "line 2"], 0)
+        assert buf.take() == ([], 0)
+
+    def test_batch_limit(self) -> None:
+        buf = LogBuffer(10)
+        for i in range(5):
+            buf.push(str(i))
+        assert buf.take(2) == (["0", "1"], 0)
+        assert len(buf) == 3
+
+    def test_overflow_reports_dropped(self) -> None:
+        buf = LogBuffer(3)
+        for i in range(10):
+            buf.push(str(i))
+        lines, dropped = buf.take()
+        assert lines == ["7", "8", "9"]
+        assert dropped == 7
+
+    def test_concurrent_producers(self) -> None:
+        buf = LogBuffer(100_000)
+
+        def _produce(tag: int) -> None:
+            for i in range(5000):
+                buf.push(f"{tag}:{i}")
+
+        threads = [threading.Thread(target=_produce, args=(t,)) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        lines, _ = buf.take()
+        assert len(lines) == 20_000
+        assert len(set(lines)) == 20_000
+
+    def test_rejects_zero_capacity(self) -> None:
+        with pytest.raises(ValueError):
+            LogBuffer(0)
+
+    def test_no_drops_reported_below_capacity(self) -> None:
+        buf = LogBuffer(100_000)
+
+        def _produce() -> None:
+            for i in range(5000):
+                buf.push(str(i))
+
+        threads = [threading.Thread(target=_produce) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        dropped = 0
+        while any(thread.is_alive() for thread in threads):
+            dropped += buf.take(10)[1]
+        for thread in threads:
+            thread.join()
+        assert dropped + buf.take()[1] == 0
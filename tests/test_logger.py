@@ -0,0 +1,92 @@
+"""Tests for queued logging, rotation and JSON lines output."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import logging.handlers
+import threading
+from pathlib import Path
+
+from ghosty import logger as ghosty_logger
+from ghosty.logger import RotatingFileHandler, setup_logging, stop_logging
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": message, "levelno": logging.INFO,
+                                  "levelname": "INFO", "name": "ghosty.test"})
+
+
+class TestSetupLogging:
+    def teardown_method(self) -> None:
+        stop_logging()
+
+    def test_records_are_written_off_thread(self, tmp_path: Path) -> None:
+        path = tmp_path / "ghosty.log"
+        setup_logging("INFO", str(path))
+        writers: list[str] = []
+        listener = ghosty_logger._listener
+        assert listener is not None
+        file_handler = listener.handlers[1]
+        original = file_handler.emit
+
+        def _emit(record: logging.LogRecord) -> None:
+            writers.append(threading.current_thread().name)
+            original(record)
+
+        file_handler.emit = _emit  # type: ignore[method-assign]
+        logging.getLogger("ghosty.test").info("hello %s", "world")
+        stop_logging()
+
+        assert "ghosty.test: hello world" in path.read_text()
+        assert writers and threading.current_thread().name not in writers
+
+    def test_jsonl_format_keeps_traceback(self, tmp_path: Path) -> None:
+        path = tmp_path / "ghosty.jsonl"
+        setup_logging("INFO", str(path), fmt="jsonl")
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logging.getLogger("ghosty.test").exception("failed")
+        stop_logging()
+
+        entry = json.loads(path.read_text().splitlines()[-1])
+        assert entry["level"] == "ERROR"
+        assert entry["logger"] == "ghosty.test"
+        assert entry["message"] == "failed"
+        assert "RuntimeError: boom" in entry["exc"]
+
+    def test_setup_replaces_previous_writer(self, tmp_path: Path) -> None:
+        setup_logging("INFO", str(tmp_path / "a.log"))
+        setup_logging("INFO", str(tmp_path / "b.log"))
+        queue_handlers = [h for h in logging.getLogger().handlers
+                          if isinstance(h, logging.handlers.QueueHandler)]
+        assert len(queue_handlers) == 1
+
+
+class TestRotatingFileHandler:
+    def test_size_rotation_with_compression(self, tmp_path: Path) -> None:
+        path = tmp_path / "ghosty.log"
+        handler = RotatingFileHandler(path, max_bytes=100, backup_count=2, compress=True)
+        for i in range(20):
+            handler.emit(_record(f"line {i:02d} " + "x" * 20))
+        handler.close()
+
+        assert path.stat().st_size <= 100
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "ghosty.log", "ghosty.log.1.gz", "ghosty.log.2.gz",
+        ]
+        with gzip.open(tmp_path / "ghosty.log.1.gz", "rt") as f:
+            assert "line" in f.read()
+
+    def test_time_rotation(self, tmp_path: Path) -> None:
+        path = tmp_path / "ghosty.log"
+        handler = RotatingFileHandler(path, backup_count=1, interval=3600)
+        handler.emit(_record("before"))
+        handler._rollover_at = 0.1  # Pretend the interval has elapsed
+        handler.emit(_record("after"))
+        handler.close()
+
+        assert path.read_text().strip() == "after"
+        assert (tmp_path / "ghosty.log.1").read_text().strip() == "before"
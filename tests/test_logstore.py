@@ -0,0 +1,115 @@
+"""Tests for the columnar log store and filtered views."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from ghosty.utils.logstore import LogFilter, LogStore, LogView
+
+
+def _fill(store: LogStore, count: int, start: int = 0) -> None:
+    for i in range(start, start + count):
+        level = logging.WARNING if i % 10 == 0 else logging.INFO
+        source = "ghosty.core.tor" if i % 2 else "ghosty.core.vpn"
+        store.append(float(i), level, source, f"message {i}")
+
+
+class TestLogStore:
+    def test_append_and_get(self) -> None:
+        store = LogStore(4)
+        record_id = store.append(1.5, logging.ERROR, "ghosty.core", "boom")
+        record = store.get(record_id)
+        assert record == (0, 1.5, logging.ERROR, "ghosty.core", "boom")
+        assert store.sources == ["ghosty.core"]
+
+    def test_sources_beyond_id_space_share_other(self) -> None:
+        store = LogStore(4)
+        for i in range(0x10001):
+            store.append(0.0, logging.INFO, f"source.{i}", "")
+        assert store.get(store.end_id - 1).source == "(other)"
+        assert store.get(store.end_id - 2).source == "(other)"
+        assert len(store.sources) == 0x10000
+
+    def test_eviction(self) -> None:
+        store = LogStore(4)
+        _fill(store, 6)
+        assert len(store) == 4
+        assert store.first_id == 2
+        assert [r.message for r in store] == [f"message {i}" for i in range(2, 6)]
+        with pytest.raises(KeyError):
+            store.get(1)
+
+    def test_clear_keeps_ids_increasing(self) -> None:
+        store = LogStore(4)
+        _fill(store, 3)
+        store.clear()
+        assert len(store) == 0
+        assert store.append(0.0, logging.INFO, "x", "after") == 3
+        assert [r.message for r in store] == ["after"]
+
+    def test_invalid_capacity(self) -> None:
+        with pytest.raises(ValueError):
+            LogStore(0)
+
+
+class TestLogFilter:
+    def test_narrows(self) -> None:
+        base = LogFilter(text="vpn")
+        assert LogFilter(text="vpn up").narrows(base)
+        assert LogFilter(text="VPN", min_level=logging.WARNING).narrows(base)
+        assert not LogFilter(text="tor").narrows(base)
+        assert LogFilter(sources=frozenset({"a"})).narrows(LogFilter())
+        assert not LogFilter().narrows(LogFilter(sources=frozenset({"a"})))
+
+
+class TestLogView:
+    def test_filters_by_text_level_and_source(self) -> None:
+        store = LogStore(100)
+        _fill(store, 50)
+        view = LogView(store, LogFilter(min_level=logging.WARNING))
+        assert view.ids(0, 100) == [0, 10, 20, 30, 40]
+
+        view.set_filter(LogFilter(sources=frozenset({"ghosty.core.tor"})))
+        assert len(view) == 25
+
+        view.set_filter(LogFilter(text="MESSAGE 4"))
+        assert view.ids(0, 100) == [4, *range(40, 50)]
+
+    def test_narrowing_reuses_matches(self) -> None:
+        store = LogStore(100)
+        _fill(store, 50)
+        view = LogView(store, LogFilter(text="message 1"))
+        checked: list[int] = []
+        original = store.message
+
+        def _message(record_id: int) -> str:
+            checked.append(record_id)
+            return original(record_id)
+
+        store.message = _message  # type: ignore[method-assign]
+        view.set_filter(LogFilter(text="message 12"))
+        assert view.ids(0, 10) == [12]
+        assert len(checked) == 11  # Only the previous matches were re-examined
+
+    def test_refresh_is_incremental_and_drops_evicted(self) -> None:
+        store = LogStore(10)
+        _fill(store, 5)
+        view = LogView(store)
+        assert len(view) == 5
+
+        _fill(store, 8, start=5)
+        assert view.refresh() == 8
+        assert len(view) == 10
+        assert view.ids(0, 1) == [store.first_id]
+        assert view.records(9, 5)[0].message == "message 12"
+
+    def test_index_and_clear(self) -> None:
+        store = LogStore(100)
+        _fill(store, 30)
+        view = LogView(store, LogFilter(min_level=logging.WARNING))
+        assert view.index(15) == 2  # First match at or after id 15 is id 20
+        store.clear()
+        view.refresh()
+        assert len(view) == 0
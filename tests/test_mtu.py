@@ -0,0 +1,58 @@
+"""Tests for path-MTU discovery and MSS clamping."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+from ghosty.core.mtu import MTUTuner, discover_path_mtu
+from ghosty.utils.process import CommandResult
+
+_OK = CommandResult(success=True, stdout="", stderr="", returncode=0)
+
+
+class TestPathMTU:
+    """Tests for discover_path_mtu."""
+
+    def test_binary_search_finds_limit(self) -> None:
+        probes: list[int] = []
+
+        def _probe(host: str, size: int, mark: int | None) -> bool:
+            probes.append(size)
+            return size <= 1412
+
+        with patch("ghosty.core.mtu._probe", side_effect=_probe):
+            assert discover_path_mtu("198.51.100.7") == 1412
+        assert len(probes) <= 12
+
+    def test_full_mtu(self) -> None:
+        with patch("ghosty.core.mtu._probe", return_value=True):
+            assert discover_path_mtu("198.51.100.7") == 1500
+
+    def test_unreachable(self) -> None:
+        with patch("ghosty.core.mtu._probe", return_value=False):
+            assert discover_path_mtu("198.51.100.7") is None
+
+
+class TestMTUTuner:
+    """Tests for MTUTuner."""
+
+    def test_tune_sets_mtu_and_clamp(self, tmp_config_dir: Path) -> None:
+        tuner = MTUTuner(cache_file=tmp_config_dir / "mtu.json")
+        with patch("ghosty.core.mtu.discover_path_mtu", return_value=1500), \
+                patch("ghosty.core.mtu.run_command", return_value=_OK) as run:
+            success, msg = tuner.tune("wg0", ("198.51.100.7", 51820), "wireguard")
+
+        assert success
+        assert "MTU 1440" in msg
+        assert ["ip", "link", "set", "dev", "wg0", "mtu", "1440"] in [c.args[0] for c in
+                                                                  run.call_args_list]
+        nft_input = run.call_args_list[-1].kwargs["input"]
+        assert "maxseg size set 1400" in nft_input
+
+    def test_cached_endpoint_skips_probe(self, tmp_config_dir: Path) -> None:
+        cache = tmp_config_dir / "mtu.json"
+        with patch("ghosty.core.mtu.discover_path_mtu", return_value=1400) as probe:
+            assert MTUTuner(cache_file=cache).path_mtu("198.51.100.7", 1194) == 1400
+            assert MTUTuner(cache_file=cache).path_mtu("198.51.100.7", 1194) == 1400
+        assert probe.call_count == 1
@@ -0,0 +1,128 @@
+"""Tests for the rtnetlink link table and watcher."""
+
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ghosty.events import EventBus, InterfacesChanged
+from ghosty.utils import netlink
+from ghosty.utils.netlink import LinkTable, LinkWatcher
+
+
+def _attr(attr_type: int, value: bytes) -> bytes:
+    raw = struct.pack("=HH", 4 + len(value), attr_type) + value
+    return raw + b"\0" * (-len(raw) % 4)
+
+
+def _link(index: int, name: str, *, up: bool = True, loopback: bool = False) -> bytes:
+    flags = (netlink.IFF_UP if up else 0) | (netlink.IFF_LOOPBACK if loopback else 0)
+    return (
+        struct.pack("=BxHiII", 0, 1, index, flags, 0)
+        + _attr(netlink.IFLA_IFNAME, name.encode() + b"\0")
+        + _attr(netlink.IFLA_ADDRESS, bytes.fromhex("0211223344" + f"{index:02x}"))
+        + _attr(netlink.IFLA_OPERSTATE, bytes([netlink.IF_OPER_UP if up else 2]))
+    )
+
+
+def _addr(index: int, address: str) -> bytes:
+    return (struct.pack("=BBBBI", socket.AF_INET, 24, 0, 0, index)
+            + _attr(netlink.IFA_LOCAL, socket.inet_aton(address)))
+
+
+def _message(msg_type: int, payload: bytes) -> bytes:
+    return struct.pack("=IHHII", 16 + len(payload), msg_type, 0, 0, 0) + payload
+
+
+class TestLinkTable:
+    def test_links_and_addresses(self) -> None:
+        table = LinkTable()
+        assert table.apply(netlink.RTM_NEWLINK, _link(1, "lo", loopback=True))
+        assert table.apply(netlink.RTM_NEWLINK, _link(2, "eth0"))
+        assert table.apply(netlink.RTM_NEWADDR, _addr(2, "192.168.1.5"))
+        assert not table.apply(netlink.RTM_NEWADDR, _addr(2, "192.168.1.5"))  # Duplicate
+
+        eth0 = table.links[2]
+        assert eth0.mac == "02:11:22:33:44:02"
+        assert eth0.addresses == ("192.168.1.5",)
+        assert eth0.connected
+        assert table.names() == ["eth0"]
+
+    def test_link_update_keeps_addresses(self) -> None:
+        table = LinkTable()
+        table.apply(netlink.RTM_NEWLINK, _link(2, "eth0"))
+        table.apply(netlink.RTM_NEWADDR, _addr(2, "10.0.0.2"))
+        assert table.apply(netlink.RTM_NEWLINK, _link(2, "eth0", up=False))
+        assert table.links[2].addresses == ("10.0.0.2",)
+        assert not table.links[2].connected
+
+    def test_removal(self) -> None:
+        table = LinkTable()
+        table.apply(netlink.RTM_NEWLINK, _link(5, "usb0"))
+        table.apply(netlink.RTM_NEWADDR, _addr(5, "172.20.10.2"))
+        assert table.apply(netlink.RTM_DELADDR, _addr(5, "172.20.10.2"))
+        assert table.links[5].addresses == ()
+        assert table.apply(netlink.RTM_DELLINK, _link(5, "usb0"))
+        assert not table.apply(netlink.RTM_DELLINK, _link(5, "usb0"))
+        assert table.names() == []
+
+    def test_messages_split_datagram(self) -> None:
+        data = _message(netlink.RTM_NEWLINK, _link(2, "eth0")) + _message(netlink.NLMSG_DONE, b"")
+        assert [t for t, _ in netlink.messages(data)] == [netlink.RTM_NEWLINK, netlink.NLMSG_DONE]
+
+
+class TestLinkWatcher:
+    def test_publish_only_on_change(self) -> None:
+        bus = EventBus()
+        sub = bus.subscribe(types=(InterfacesChanged,))
+        watcher = LinkWatcher(bus)
+        watcher._apply(_message(netlink.RTM_NEWLINK, _link(2, "eth0")))
+        watcher._publish()
+        watcher._apply(_message(netlink.RTM_NEWLINK, _link(2, "eth0")))
+        watcher._publish()
+        watcher._apply(_message(netlink.RTM_NEWADDR, _addr(2, "10.0.0.2")))
+        watcher._publish()
+
+        events = sub.drain()
+        # Coalesced to the newest snapshot
+        assert [(e.interfaces, e.connected) for e in events] == [(("eth0",), ("eth0",))]
+
+    def test_live_dump(self) -> None:
+        try:
+            socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, netlink.NETLINK_ROUTE).close()
+        except (AttributeError, OSError):
+            pytest.skip("rtnetlink unavailable")
+        received = threading.Event()
+        watcher = LinkWatcher(on_change=lambda _event: received.set())
+        watcher.start()
+        try:
+            assert received.wait(5)
+            assert any(link.loopback for link in watcher.links())
+        finally:
+            watcher.stop()
+
+    def test_resync_retries_flooded_dump(self) -> None:
+        events: list[InterfacesChanged] = []
+        watcher = LinkWatcher(on_change=events.append)
+        watcher._wakeup_r, watcher._wakeup_w = os.pipe()
+        dumps = iter([OSError(105, "No buffer space available")])
+
+        def _dump(sock: object, msg_type: int) -> None:
+            error = next(dumps, None)
+            if error is not None:
+                raise error
+            if msg_type == netlink.RTM_GETLINK:
+                watcher._apply(_message(netlink.RTM_NEWLINK, _link(2, "eth0")))
+
+        try:
+            with patch.object(watcher, "_dump", side_effect=_dump):
+                assert watcher._resync(MagicMock())
+        finally:
+            os.close(watcher._wakeup_r)
+            os.close(watcher._wakeup_w)
+        assert [event.interfaces for event in events] == [("eth0",)]
@@ -0,0 +1,193 @@
+"""Tests for the orchestrator start/stop flow."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+from ghosty.core.orchestrator import AnonymizationMode, Orchestrator
+from ghosty.events import ModeChanged, StepProgress
+
+
+def _managers() -> Orchestrator:
+    orchestrator = Orchestrator(mac=MagicMock(), vpn=MagicMock(), tor=MagicMock())
+    for manager in (orchestrator.mac, orchestrator.vpn, orchestrator.tor):
+        for name in ("change_mac", "restore_mac", "ensure_installed", "resolve_endpoint",
+                     "connect", "disconnect", "tune_mtu", "start_service", "stop_service",
+                     "start_ip_rotation", "stop_ip_rotation", "stop_full", "set_config"):
+            getattr(manager, name).return_value = (True, "ok")
+    orchestrator._install_handlers = MagicMock()
+    orchestrator._provision = MagicMock(return_value=(True, "ok"))
+    return orchestrator
+
+
+class TestOrchestratorStart:
+    """Tests for Orchestrator.start."""
+
+    def test_plan_orders_layers(self) -> None:
+        orchestrator = _managers()
+        plan = orchestrator._plan_start(AnonymizationMode.ENHANCED.layers, "eth0")
+        steps = {s.name: s for s in plan}
+
+        assert steps["vpn"].requires == ("mac",)
+        assert steps["tor_service"].requires == ("mac",)
+        assert set(steps["tor_rotation"].requires) == {"tor_service", "vpn"}
+        assert set(steps["mac"].requires) == {"provision", "vpn_resolve"}
+
+    def test_normal_mode_has_no_vpn_or_tor(self) -> None:
+        orchestrator = _managers()
+        names = {s.name for s in orchestrator._plan_start(AnonymizationMode.NORMAL.layers, "eth0")}
+        assert names == {"provision", "mac"}
+
+    def test_start_without_vpn_config(self) -> None:
+        orchestrator = _managers()
+        success, msg = orchestrator.start(AnonymizationMode.STANDARD, "eth0")
+        assert not success
+        assert "No VPN config" in msg
+        orchestrator.mac.change_mac.assert_not_called()
+
+    def test_vpn_failure_rolls_back(self) -> None:
+        orchestrator = _managers()
+        orchestrator.vpn.connect.return_value = (False, "auth failed")
+        success, msg = orchestrator.start(
+            AnonymizationMode.ENHANCED, "eth0", vpn_config="/etc/vpn/a.ovpn"
+        )
+
+        assert not success
+        assert msg == "VPN connection failed: auth failed"
+        assert not orchestrator.is_active
+        orchestrator.mac.restore_mac.assert_called_once_with("eth0")
+        orchestrator.tor.start_ip_rotation.assert_not_called()
+
+    def test_cancel_during_start_rolls_back(self) -> None:
+        orchestrator = _managers()
+        cancel = threading.Event()
+
+        def _connect(token: threading.Event) -> tuple[bool, str]:
+            assert token is cancel  # The token reaches the manager
+            cancel.set()
+            return True, "connected"
+
+        orchestrator.vpn.connect.side_effect = _connect
+        success, msg = orchestrator.start(
+            AnonymizationMode.STANDARD, "eth0", vpn_config="/etc/vpn/a.ovpn", cancel=cancel
+        )
+
+        assert (success, msg) == (False, "Cancelled")
+        assert not orchestrator.is_active
+        orchestrator.vpn.disconnect.assert_called_once()
+        orchestrator.mac.restore_mac.assert_called_once_with("eth0")
+
+    def test_already_cancelled_start_does_nothing(self) -> None:
+        orchestrator = _managers()
+        cancel = threading.Event()
+        cancel.set()
+        assert orchestrator.start(AnonymizationMode.NORMAL, "eth0", cancel=cancel) == (
+            False, "Cancelled"
+        )
+        orchestrator.mac.change_mac.assert_not_called()
+
+
+class TestOrchestratorStop:
+    """Tests for Orchestrator.stop."""
+
+    def test_stop_restores_everything(self) -> None:
+        orchestrator = _managers()
+        orchestrator.start(AnonymizationMode.ENHANCED, "eth0", vpn_config="/etc/vpn/a.ovpn")
+        orchestrator.supervisor.stop()
+        orchestrator.tor.is_running = True
+        orchestrator.vpn.is_connected = True
+
+        success, _ = orchestrator.stop()
+        assert success
+        assert not orchestrator.is_active
+        orchestrator.mac.restore_mac.assert_called_once_with("eth0")
+        orchestrator.tor.stop_full.assert_called_once()
+        orchestrator.vpn.disconnect.assert_called_once()
+
+    def test_stop_reports_failed_restore(self) -> None:
+        orchestrator = _managers()
+        orchestrator.start(AnonymizationMode.NORMAL, "eth0")
+        orchestrator.mac.restore_mac.return_value = (False, "device busy")
+
+        success, message = orchestrator.stop()
+        assert not success
+        assert "MAC restore failed: device busy" in message
+        assert not orchestrator.is_active
+
+    def test_plan_stop_puts_mac_first(self) -> None:
+        orchestrator = _managers()
+        orchestrator._current_interface = "eth0"
+        orchestrator.tor.is_running = True
+        orchestrator.vpn.is_connected = True
+        assert [s.name for s in orchestrator._plan_stop()] == ["mac", "tor", "vpn"]
+
+
+class TestOrchestratorTransition:
+    """Tests for Orchestrator.transition."""
+
+    def _active(self, mode: AnonymizationMode) -> Orchestrator:
+        orchestrator = _managers()
+        orchestrator.start(mode, "eth0", vpn_config="/etc/vpn/a.ovpn")
+        for manager in (orchestrator.mac, orchestrator.vpn, orchestrator.tor):
+            manager.reset_mock()
+        return orchestrator
+
+    def test_adding_tor_keeps_mac_and_vpn(self) -> None:
+        orchestrator = self._active(AnonymizationMode.STANDARD)
+        success, _ = orchestrator.transition(AnonymizationMode.ENHANCED)
+        orchestrator._stop_supervisor()
+
+        assert success
+        assert orchestrator.current_mode == AnonymizationMode.ENHANCED
+        orchestrator.tor.start_service.assert_called_once()
+        orchestrator.tor.start_ip_rotation.assert_called_once()
+        orchestrator.mac.change_mac.assert_not_called()
+        orchestrator.vpn.connect.assert_not_called()
+
+    def test_dropping_vpn_keeps_mac(self) -> None:
+        orchestrator = self._active(AnonymizationMode.STANDARD)
+        orchestrator.vpn.is_connected = True
+        orchestrator.tor.is_running = False
+        success, _ = orchestrator.transition(AnonymizationMode.NORMAL)
+
+        assert success
+        assert orchestrator.supervisor is None
+        orchestrator.vpn.disconnect.assert_called_once()
+        orchestrator.mac.restore_mac.assert_not_called()
+
+    def test_adding_vpn_requires_config(self) -> None:
+        orchestrator = self._active(AnonymizationMode.NORMAL)
+        success, msg = orchestrator.transition(AnonymizationMode.STANDARD)
+        assert not success
+        assert "No VPN config" in msg
+        assert orchestrator.current_mode == AnonymizationMode.NORMAL
+
+
+class TestOrchestratorEvents:
+    """Events published while starting and stopping."""
+
+    def test_start_publishes_progress_and_mode(self) -> None:
+        orchestrator = _managers()
+        sub = orchestrator.events.subscribe()
+        orchestrator.start(AnonymizationMode.NORMAL, "eth0")
+        events = sub.drain()
+
+        assert {e.step for e in events if isinstance(e, StepProgress)} == {"provision", "mac"}
+        modes = [e for e in events if isinstance(e, ModeChanged)]
+        assert [(e.mode, e.active) for e in modes] == [("Normal", True)]
+        assert orchestrator.mac.events is orchestrator.events
+
+    def test_set_log_callback_replaces_previous(self) -> None:
+        orchestrator = _managers()
+        first: list[str] = []
+        second: list[str] = []
+        delivered = threading.Event()
+        orchestrator.set_log_callback(first.append)
+        orchestrator.set_log_callback(lambda m: (second.append(m), delivered.set()))
+        orchestrator._log("hello")
+
+        assert delivered.wait(2)
+        orchestrator._log_subscription.close()
+        assert first == []
+        assert second == ["hello"]
@@ -0,0 +1,131 @@
+"""Tests for dependency-driven step execution."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ghosty.core.pipeline import Step, run_pipeline, run_teardown
+
+
+def _ok(message: str = "ok"):
+    return lambda: (True, message)
+
+
+class TestRunPipeline:
+    """Tests for run_pipeline."""
+
+    def test_respects_dependencies(self) -> None:
+        order: list[str] = []
+
+        def _record(name: str):
+            return lambda: (order.append(name) or (True, name))
+
+        steps = [
+            Step("c", _record("c"), requires=("a", "b")),
+            Step("a", _record("a")),
+            Step("b", _record("b"), requires=("a",)),
+        ]
+        result = run_pipeline(steps)
+        assert result.success
+        assert order == ["a", "b", "c"]
+
+    def test_independent_steps_run_concurrently(self) -> None:
+        barrier = threading.Barrier(2, timeout=2)
+
+        def _meet() -> tuple[bool, str]:
+            barrier.wait()
+            return True, "met"
+
+        result = run_pipeline([Step("a", _meet), Step("b", _meet)])
+        assert result.success
+
+    def test_failure_cancels_and_rolls_back(self) -> None:
+        rolled_back: list[str] = []
+        cancel = threading.Event()
+
+        def _slow() -> tuple[bool, str]:
+            cancel.wait(2)
+            return True, "slow done"
+
+        steps = [
+            Step("mac", _ok(), rollback=lambda: rolled_back.append("mac")),
+            Step("vpn", lambda: (False, "handshake timeout"), requires=("mac",),
+                 description="VPN connection"),
+            Step("tor", _slow, requires=("mac",), rollback=lambda: rolled_back.append("tor")),
+            Step("rotation", _ok(), requires=("tor", "vpn")),
+        ]
+        start = time.monotonic()
+        result = run_pipeline(steps, cancel=cancel)
+
+        assert not result.success
+        assert result.failed == "vpn"
+        assert result.message == "VPN connection failed: handshake timeout"
+        assert "rotation" not in result.completed
+        assert rolled_back == ["tor", "mac"]
+        assert time.monotonic() - start < 1.5
+
+    def test_exception_is_a_failure(self) -> None:
+        def _boom() -> tuple[bool, str]:
+            raise RuntimeError("boom")
+
+        result = run_pipeline([Step("a", _boom)])
+        assert not result.success
+        assert "boom" in result.message
+
+    def test_cycle_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            run_pipeline([Step("a", _ok(), requires=("b",)), Step("b", _ok(), requires=("a",))])
+
+    def test_unknown_dependency_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            run_pipeline([Step("a", _ok(), requires=("missing",))])
+
+
+class TestRunTeardown:
+    """Tests for run_teardown."""
+
+    def test_runs_concurrently(self) -> None:
+        barrier = threading.Barrier(3, timeout=2)
+
+        def _meet() -> tuple[bool, str]:
+            barrier.wait()
+            return True, "stopped"
+
+        report = run_teardown([Step(n, _meet) for n in ("mac", "vpn", "tor")], deadline=3)
+        assert report.success
+        assert sorted(report.completed) == ["mac", "tor", "vpn"]
+
+    def test_deadline_bounds_stop_time(self) -> None:
+        release = threading.Event()
+
+        def _hang() -> tuple[bool, str]:
+            release.wait(5)
+            return True, "late"
+
+        start = time.monotonic()
+        report = run_teardown(
+            [Step("mac", _ok()), Step("vpn", _hang, budget=0.1)], deadline=0.3
+        )
+        release.set()
+
+        assert time.monotonic() - start < 1.0
+        assert report.completed == ["mac"]
+        assert report.unfinished == ["vpn"]
+        assert report.overrun == ["vpn"]
+        assert not report.success
+
+    def test_budget_overrun_reported(self) -> None:
+        def _slow() -> tuple[bool, str]:
+            time.sleep(0.2)
+            return True, "done"
+
+        report = run_teardown([Step("tor", _slow, budget=0.05)], deadline=2)
+        assert report.success
+        assert report.overrun == ["tor"]
+
+    def test_failures_collected(self) -> None:
+        report = run_teardown([Step("vpn", lambda: (False, "no such process"))], deadline=1)
+        assert report.failed == {"vpn": "no such process"}
@@ -0,0 +1,120 @@
+"""Tests for the fingerprinted preflight capability cache."""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ghosty.core import preflight
+from ghosty.utils.platform import PackageManager
+
+
+@pytest.fixture
+def host():
+    """Fake host: a mutable fingerprint and counting probes."""
+    prints = {"kernel": "6.8.0", "os_release": "/etc/os-release:400:1",
+              "modules": "/lib/modules/6.8.0/modules.dep:9:1"}
+    prints.update({f"bin:{name}": "" for name in preflight.BINARIES})
+    prints["bin:openvpn"] = "/usr/sbin/openvpn:1000:1"
+    calls: Counter[str] = Counter()
+
+    def _probe(name, value):
+        def _run():
+            calls[name] += 1
+            return value
+        return preflight._Probe(_run, preflight._PROBES[name].depends)
+
+    probes = {
+        "distro": _probe("distro", {"id": "debian", "name": "Debian 12", "version": "12",
+                                    "package_manager": "apt"}),
+        "openvpn_version": _probe("openvpn_version", [2, 6]),
+        "tor_systemd": _probe("tor_systemd", True),
+        "dco_module": _probe("dco_module", False),
+        "wireguard_module": _probe("wireguard_module", True),
+    }
+    with patch.object(preflight, "fingerprint", lambda: dict(prints)), \
+         patch.dict(preflight._PROBES, probes):
+        yield prints, calls
+
+
+class TestPreflight:
+    def test_first_run_probes_everything(self, host, tmp_path: Path) -> None:
+        _, calls = host
+        cache = tmp_path / "preflight.json"
+        caps = preflight.load(cache)
+
+        assert set(caps.reprobed) == set(preflight._PROBES)
+        assert caps.distro.package_manager is PackageManager.APT
+        assert caps.openvpn_version == (2, 6)
+        assert caps.binaries["openvpn"] == "/usr/sbin/openvpn"
+        assert caps.has("openvpn") and not caps.has("tor")
+        assert json.loads(cache.read_text())["facts"]["tor_systemd"] is True
+
+    def test_unchanged_host_skips_probes(self, host, tmp_path: Path) -> None:
+        _, calls = host
+        cache = tmp_path / "preflight.json"
+        preflight.load(cache)
+        caps = preflight.load(cache)
+
+        assert caps.reprobed == []
+        assert all(count == 1 for count in calls.values())
+        assert caps.wireguard_module
+
+    def test_binary_change_reprobes_dependents_only(self, host, tmp_path: Path) -> None:
+        prints, calls = host
+        cache = tmp_path / "preflight.json"
+        preflight.load(cache)
+
+        prints["bin:openvpn"] = "/usr/sbin/openvpn:1200:2"
+        caps = preflight.load(cache)
+
+        assert caps.reprobed == ["openvpn_version"]
+        assert calls["openvpn_version"] == 2
+
+    def test_kernel_upgrade_reprobes_modules(self, host, tmp_path: Path) -> None:
+        prints, _ = host
+        cache = tmp_path / "preflight.json"
+        preflight.load(cache)
+
+        prints["kernel"] = "6.9.1"
+        assert set(preflight.load(cache).reprobed) == {"dco_module", "wireguard_module"}
+
+    def test_corrupt_cache_is_rebuilt(self, host, tmp_path: Path) -> None:
+        cache = tmp_path / "preflight.json"
+        cache.write_text("{not json")
+        assert set(preflight.load(cache).reprobed) == set(preflight._PROBES)
+
+    def test_failed_probe_is_retried(self, host, tmp_path: Path) -> None:
+        cache = tmp_path / "preflight.json"
+
+        def _boom():
+            raise OSError("no systemctl")
+
+        with patch.dict(preflight._PROBES, {
+            "tor_systemd": preflight._Probe(_boom, ("bin:systemctl", "bin:tor")),
+        }):
+            assert not preflight.load(cache).tor_systemd
+        assert preflight.load(cache).reprobed == ["tor_systemd"]
+
+    def test_measurement_runs_once_per_dependency(self, host, tmp_path: Path) -> None:
+        prints, _ = host
+        cache = tmp_path / "preflight.json"
+        runs: list[int] = []
+
+        def _measure() -> dict[str, float]:
+            runs.append(1)
+            return {"AES-128-GCM": 4e9}
+
+        assert preflight.measured("speed", ("bin:openssl",), _measure, cache) == {
+            "AES-128-GCM": 4e9}
+        preflight.load(cache)  # Rewriting the probes keeps the measurement
+        preflight.measured("speed", ("bin:openssl",), _measure, cache)
+        assert len(runs) == 1
+
+        prints["bin:openssl"] = "/usr/bin/openssl:800:2"
+        preflight.measured("speed", ("bin:openssl",), _measure, cache)
+        assert len(runs) == 2
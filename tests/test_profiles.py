@@ -0,0 +1,127 @@
+"""Tests for profile compilation, plan caching and launch."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ghosty.config import GhostyConfig, ProfileConfig
+from ghosty.core import profiles
+from ghosty.core.orchestrator import AnonymizationMode
+from ghosty.core.profiles import PlanCache, compile_profile, launch
+
+_WIREGUARD = """\
+[Interface]
+PrivateKey = aGVsbG8gd29ybGQgaGVsbG8gd29ybGQgaGVsbG8gd28=
+Address = 10.2.0.2/32
+
+[Peer]
+PublicKey = d29ybGQgaGVsbG8gd29ybGQgaGVsbG8gd29ybGQgaGU=
+AllowedIPs = 0.0.0.0/0
+Endpoint = 198.51.100.7:51820
+"""
+
+
+def _config(tmp_path: Path, **fields: object) -> GhostyConfig:
+    config = GhostyConfig()
+    config.general.default_interface = "eth0"
+    config.profiles["work"] = ProfileConfig(**fields)  # type: ignore[arg-type]
+    return config
+
+
+class TestCompile:
+    def test_inherits_top_level_settings(self, tmp_path: Path) -> None:
+        config = _config(tmp_path, mode="normal")
+        config.tor.rotation_interval = 42
+        plan = compile_profile("work", config)
+
+        assert plan.mode is AnonymizationMode.NORMAL
+        assert plan.interface == "eth0"
+        assert plan.provider == "openvpn"
+        assert plan.rotation_interval == 42
+        assert plan.vpn_parsed is None
+
+    def test_wireguard_config_is_parsed_once(self, tmp_path: Path) -> None:
+        path = tmp_path / "wg-work.conf"
+        path.write_text(_WIREGUARD)
+        plan = compile_profile("work", _config(
+            tmp_path, mode="Standard", provider="wireguard", vpn_config=str(path),
+        ))
+
+        assert plan.vpn_config == str(path.resolve())
+        assert plan.vpn_parsed is not None
+        assert plan.vpn_parsed.endpoint == ("198.51.100.7", 51820)
+        assert plan.vpn_parsed.wireguard is not None
+        assert plan.vpn_parsed.wireguard.interface == "wg-work"
+
+    def test_reports_every_problem(self, tmp_path: Path) -> None:
+        config = _config(tmp_path, mode="Enhanced", vpn_config=str(tmp_path / "missing.ovpn"),
+                         vpn_auth=str(tmp_path / "missing.txt"))
+        config.general.default_interface = ""
+        with pytest.raises(ValueError) as info:
+            compile_profile("work", config)
+        message = str(info.value)
+        assert "no interface" in message
+        assert "missing.ovpn" in message
+        assert "missing.txt not found" in message
+
+    def test_unknown_profile(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Unknown profile 'home' \\(work\\)"):
+            compile_profile("home", _config(tmp_path))
+
+
+class TestPlanCache:
+    def test_reuses_plan_until_inputs_change(self, tmp_path: Path) -> None:
+        path = tmp_path / "work.ovpn"
+        path.write_text("remote a.example.com 1194\n")
+        config = _config(tmp_path, mode="Standard", vpn_config=str(path))
+        cache = PlanCache()
+
+        with patch.object(profiles, "compile_profile", wraps=compile_profile) as compiled:
+            first = cache.get("work", config)
+            assert cache.get("work", config) is first
+            assert compiled.call_count == 1
+
+            config.profiles["work"].interface = "wlan0"
+            assert cache.get("work", config).interface == "wlan0"
+            assert compiled.call_count == 2
+
+            path.write_text("remote b.example.com 1194\n")
+            os.utime(path, ns=(0, 0))
+            plan = cache.get("work", config)
+            assert compiled.call_count == 3
+            assert plan.vpn_parsed is not None
+            assert plan.vpn_parsed.endpoint == ("b.example.com", 1194)
+
+    def test_compile_all_drops_removed_profiles(self, tmp_path: Path) -> None:
+        config = _config(tmp_path, mode="Enhanced")
+        cache = PlanCache()
+        assert set(cache.compile_all(config)) == {"work"}  # No VPN config anywhere
+
+        config.profiles = {"home": ProfileConfig(mode="Normal")}
+        assert cache.compile_all(config) == {}
+        assert set(cache._plans) == {"home"}
+
+
+class TestLaunch:
+    def test_sets_backends_then_starts(self, tmp_path: Path) -> None:
+        path = tmp_path / "wg-work.conf"
+        path.write_text(_WIREGUARD)
+        plan = compile_profile("work", _config(
+            tmp_path, mode="Standard", provider="wireguard", wireguard_backend="wg-quick",
+            vpn_config=str(path), rotation_interval=30,
+        ))
+        orchestrator = MagicMock(is_active=False)
+        orchestrator.start.return_value = (True, "Standard mode started")
+
+        assert launch(orchestrator, plan) == (True, "Standard mode started")
+        assert orchestrator.vpn.provider == "wireguard"
+        assert orchestrator.vpn.wireguard_backend == "wg-quick"
+        orchestrator.tor.set_rotation_interval.assert_called_once_with(30)
+        orchestrator.start.assert_called_once_with(
+            AnonymizationMode.STANDARD, "eth0", vpn_config=plan.vpn_config, vpn_auth=None,
+            vpn_fallbacks=[], vpn_parsed=plan.vpn_parsed, cancel=None,
+        )
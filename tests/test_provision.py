@@ -0,0 +1,96 @@
+"""Tests for single-transaction dependency provisioning."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from ghosty.core import provision as prov
+from ghosty.core.provision import REQUIREMENTS, provision, requirements_for
+from ghosty.utils.platform import DistroInfo, PackageManager
+from ghosty.utils.process import CommandResult
+
+_OK = CommandResult(True, "", "", 0)
+_FAIL = CommandResult(False, "", "E: Unable to locate package", 100)
+
+
+def _fedora() -> DistroInfo:
+    return DistroInfo(id="fedora", name="Fedora", version="40",
+                      package_manager=PackageManager.DNF)
+
+
+class TestRequirementsFor:
+    def test_enhanced_openvpn(self) -> None:
+        names = [r.name for r in requirements_for({"mac", "vpn", "tor"})]
+        assert names == ["macchanger", "openvpn", "tor", "stem", "tornet-mp"]
+
+    def test_wireguard_backends(self) -> None:
+        native = requirements_for({"vpn"}, vpn_provider="wireguard")
+        script = requirements_for({"vpn"}, vpn_provider="wireguard", wireguard_backend="wg-quick")
+        assert [r.name for r in native] == ["wg"]
+        assert [r.name for r in script] == ["wg", "wg-quick"]
+
+
+class TestProvision:
+    def test_nothing_missing_runs_nothing(self) -> None:
+        with patch.object(prov.Requirement, "present", return_value=True), \
+             patch.object(prov, "run_command") as run:
+            success, message = provision(requirements_for({"mac", "vpn", "tor"}))
+        assert success
+        assert message == "All dependencies present"
+        run.assert_not_called()
+
+    def test_single_transaction_per_installer(self) -> None:
+        installed: set[str] = set()
+
+        def _present(req: prov.Requirement) -> bool:
+            return req.name in installed
+
+        def _run(cmd: list[str], **kwargs: object) -> CommandResult:
+            installed.update(REQUIREMENTS)
+            return _OK
+
+        progress: list[str] = []
+        with patch.object(prov.Requirement, "present", _present), \
+             patch.object(prov, "distro", _fedora), \
+             patch.object(prov, "run_command", side_effect=_run) as run:
+            success, _ = provision(
+                requirements_for({"mac", "vpn", "tor"}, vpn_provider="wireguard",
+                                 wireguard_backend="wg-quick"),
+                progress=progress.append,
+            )
+
+        assert success
+        system_cmd, pip_cmd = (call.args[0] for call in run.call_args_list)
+        assert system_cmd == ["sudo", "dnf", "install", "-y",
+                              "macchanger", "wireguard-tools", "tor"]
+        assert pip_cmd[-3:] == ["install", "stem", "tornet-mp"]
+        assert any("with dnf" in line for line in progress)
+
+    def test_unknown_package_manager(self) -> None:
+        unknown = DistroInfo(id="x", name="X", version="", package_manager=PackageManager.UNKNOWN)
+        with patch.object(prov.Requirement, "present", return_value=False), \
+             patch.object(prov, "distro", lambda: unknown), \
+             patch.object(prov, "run_command") as run:
+            success, message = provision([REQUIREMENTS["tor"]])
+        assert not success
+        assert "install manually: tor" in message
+        run.assert_not_called()
+
+    def test_apt_refreshes_lists_and_retries(self) -> None:
+        debian = DistroInfo(id="debian", name="Debian", version="12",
+                            package_manager=PackageManager.APT)
+        present = iter([False, True])
+        with patch.object(prov.Requirement, "present", lambda req: next(present)), \
+             patch.object(prov, "distro", lambda: debian), \
+             patch.object(prov, "run_command", side_effect=[_FAIL, _OK, _OK]) as run:
+            success, _ = provision([REQUIREMENTS["openvpn"]])
+        assert success
+        assert run.call_args_list[1].args[0] == ["sudo", "apt-get", "update"]
+
+    def test_reports_still_missing(self) -> None:
+        with patch.object(prov.Requirement, "present", return_value=False), \
+             patch.object(prov, "distro", _fedora), \
+             patch.object(prov, "run_command", return_value=_OK):
+            success, message = provision([REQUIREMENTS["macchanger"]])
+        assert not success
+        assert message == "Still missing after install: macchanger"
@@ -0,0 +1,179 @@
+"""Tests for config validation, diffing and live reload."""
+
+from __future__ import annotations
+
+import logging
+import struct
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ghosty.config import GhostyConfig
+from ghosty.core.orchestrator import Orchestrator
+from ghosty.core.tor import TORManager
+from ghosty.core.vpn import VPNManager
+from ghosty.events import ConfigReloaded, EventBus
+from ghosty.reload import ConfigWatcher, changes, notifications
+
+
+def _watcher(path: Path, config: GhostyConfig | None = None) -> ConfigWatcher:
+    orchestrator = MagicMock()
+    orchestrator.is_active = False
+    orchestrator.events = EventBus()
+    return ConfigWatcher(orchestrator, config or GhostyConfig(), path)
+
+
+class TestValidation:
+    def test_parse_rejects_bad_values(self, tmp_path: Path) -> None:
+        path = tmp_path / "config.toml"
+        path.write_text('[tor]\nrotation_interval = 0\n[log]\nlevel = "LOUD"\n')
+        with pytest.raises(ValueError, match="rotation_interval.*log.level"):
+            GhostyConfig.parse(path)
+
+    def test_parse_rejects_unknown_keys_and_types(self, tmp_path: Path) -> None:
+        path = tmp_path / "config.toml"
+        path.write_text("[tor]\nrotation_speed = 3\n")
+        with pytest.raises(ValueError, match="Invalid config"):
+            GhostyConfig.parse(path)
+        path.write_text('[tor]\nrotation_interval = "often"\n')
+        with pytest.raises(ValueError, match="Invalid config"):
+            GhostyConfig.parse(path)
+
+    def test_defaults_are_valid(self) -> None:
+        assert GhostyConfig().validate() == []
+
+
+class TestChanges:
+    def test_lists_only_differing_settings(self) -> None:
+        old, new = GhostyConfig(), GhostyConfig()
+        new.tor.rotation_interval = 30
+        new.log.level = "DEBUG"
+        assert changes(old, new) == ["tor.rotation_interval", "log.level"]
+
+    def test_identities_are_compared_by_name(self) -> None:
+        old, new = GhostyConfig(), GhostyConfig()
+        new.identities["work"] = GhostyConfig._from_dict(
+            {"identities": {"work": {"tor": True}}}
+        ).identities["work"]
+        assert changes(old, new) == ["identities.work"]
+
+    def test_notifications_parse_names(self) -> None:
+        name = b"config.toml\0\0\0\0\0"
+        data = struct.pack("=iIII", 1, 0x8, 0, len(name)) + name
+        assert notifications(data) == [(0x8, "config.toml")]
+
+
+class TestReload:
+    def test_invalid_file_keeps_current_settings(self, tmp_path: Path) -> None:
+        path = tmp_path / "config.toml"
+        path.write_text("[tor\n")
+        watcher = _watcher(path)
+        ok, message = watcher.reload()
+        assert not ok
+        assert "not reloaded" in message
+        watcher.orchestrator.apply_config.assert_not_called()
+
+    def test_level_change_does_not_restart_anything(self, tmp_path: Path) -> None:
+        path = tmp_path / "config.toml"
+        config = GhostyConfig()
+        config.log.level = "DEBUG"
+        config.save(path)
+        watcher = _watcher(path)
+        events = watcher.orchestrator.events.subscribe(types=(ConfigReloaded,))
+        level = logging.getLogger().level
+
+        try:
+            with patch("ghosty.reload.setup_logging") as setup_logging:
+                ok, _ = watcher.reload()
+            assert logging.getLogger().level == logging.DEBUG
+        finally:
+            logging.getLogger().setLevel(level)
+
+        assert ok
+        setup_logging.assert_not_called()
+        watcher.orchestrator.apply_config.assert_not_called()
+        assert [event.changed for event in events.drain()] == [("log.level",)]
+        assert watcher.reload() == (True, "Config unchanged")
+
+    def test_tor_change_goes_to_orchestrator(self, tmp_path: Path) -> None:
+        path = tmp_path / "config.toml"
+        config = GhostyConfig()
+        config.tor.rotation_interval = 60
+        config.save(path)
+        watcher = _watcher(path)
+        watcher.reload()
+        watcher.orchestrator.apply_config.assert_called_once()
+        assert watcher.config.tor.rotation_interval == 60
+
+    def test_watcher_picks_up_writes(self, tmp_path: Path) -> None:
+        path = tmp_path / "config.toml"
+        GhostyConfig().save(path)
+        reloaded = threading.Event()
+        watcher = _watcher(path)
+        watcher.on_reload = lambda _config: reloaded.set()
+        watcher.start()
+        if not watcher.is_running:
+            pytest.skip("inotify unavailable")
+        try:
+            config = GhostyConfig()
+            config.general.theme = "light"
+            config.save(path)
+            assert reloaded.wait(5)
+            assert watcher.config.general.theme == "light"
+        finally:
+            watcher.stop()
+
+
+class TestRotationRetime:
+    def test_shorter_interval_rotates_sooner(self) -> None:
+        tor = TORManager(rotation_interval=3600)
+        tor.is_running = True
+        rotated_at = time.monotonic()
+        waiter = threading.Thread(target=tor._wait_for_next_rotation, args=(rotated_at,))
+        waiter.start()
+        time.sleep(0.05)
+        tor.set_rotation_interval(1)
+        waiter.join(timeout=3)
+        assert not waiter.is_alive()
+        assert time.monotonic() - rotated_at >= 1
+
+    def test_stop_still_wakes_the_wait(self) -> None:
+        tor = TORManager(rotation_interval=3600)
+        tor.is_running = True
+        waiter = threading.Thread(target=tor._wait_for_next_rotation, args=(time.monotonic(),))
+        waiter.start()
+        tor._stop_rotation = True
+        tor._rotation_wakeup.set()
+        waiter.join(timeout=2)
+        assert not waiter.is_alive()
+
+
+class TestReloadWhileActive:
+    def test_live_tunnel_keeps_its_provider(self, tmp_path: Path) -> None:
+        path = tmp_path / "config.toml"
+        config = GhostyConfig()
+        config.tor.rotation_interval = 30  # Provider stays the default "openvpn"
+        config.save(path)
+
+        vpn = VPNManager(provider="wireguard", config_file="/etc/wireguard/wg0.conf")
+        tunnel = MagicMock()
+        tunnel.down.return_value = (True, "down")
+        vpn._wg_tunnel, vpn._connected = tunnel, True
+        orchestrator = Orchestrator(mac=MagicMock(), vpn=vpn, tor=MagicMock())
+        orchestrator._is_active = True
+        watcher = ConfigWatcher(orchestrator, GhostyConfig(), path)
+
+        assert watcher.reload()[0]
+        orchestrator.tor.set_rotation_interval.assert_called_once_with(30)
+        assert vpn.provider == "wireguard"
+
+        assert vpn.disconnect() == (True, "WireGuard VPN disconnected")
+        tunnel.down.assert_called_once()
+
+        orchestrator._is_active = False
+        watcher.config = GhostyConfig()
+        watcher.reload()
+        assert vpn.provider == "openvpn"  # Applied once nothing is running
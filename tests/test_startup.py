@@ -0,0 +1,65 @@
+"""Startup import-time regression tests.
+
+Each check runs ``python -X importtime`` in a fresh interpreter so results
+do not depend on what this test session has already imported.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+# Cumulative import budget per entry module, in milliseconds. Generous enough
+# for slow CI machines; an accidental eager import of Tk, requests or stem
+# costs far more than the headroom.
+_BUDGET_MS = {
+    "ghosty.__main__": 50,
+    "ghosty.ctl": 150,
+    "ghosty.daemon": 400,
+    "ghosty.execute": 150,
+}
+
+# Dependencies that must only load on first use
+_HEAVY = ("customtkinter", "tkinter", "requests", "psutil", "stem", "tornet_mp")
+
+
+def _import_profile(module: str) -> dict[str, int]:
+    """Return cumulative import time (µs) of every module loaded by ``module``."""
+    env = {**os.environ, "PYTHONPATH": _SRC, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, timeout=60, check=True,
+    )
+    profile: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        profile[name] = int(cumulative)
+    return profile
+
+
+@pytest.mark.parametrize("module", sorted(_BUDGET_MS))
+def test_import_time_budget(module: str) -> None:
+    # Best of three, to keep scheduler noise out of the measurement
+    elapsed_ms = min(_import_profile(module)[module] for _ in range(3)) / 1000
+    assert elapsed_ms < _BUDGET_MS[module], (
+        f"import {module} took {elapsed_ms:.0f} ms (budget {_BUDGET_MS[module]} ms)"
+    )
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["ghosty.__main__", "ghosty.ctl", "ghosty.daemon", "ghosty.execute", "ghosty.gui",
+     "ghosty.utils.network", "ghosty.core.orchestrator"],
+)
+def test_no_heavy_imports(module: str) -> None:
+    loaded = _import_profile(module)
+    eager = [name for name in _HEAVY if name in loaded]
+    assert not eager, f"import {module} eagerly loads {', '.join(eager)}"
@@ -0,0 +1,80 @@
+"""Tests for tunnel telemetry and the ring buffer behind it."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from ghosty.core.telemetry import TelemetrySampler, format_rate
+from ghosty.utils.ringbuffer import RingBuffer
+
+
+class TestRingBuffer:
+    """Tests for RingBuffer."""
+
+    def test_wraps_and_keeps_newest(self) -> None:
+        ring = RingBuffer(3)
+        for value in range(5):
+            ring.append(value)
+        assert len(ring) == 3
+        assert ring.values() == [2.0, 3.0, 4.0]
+        assert ring.values(2) == [3.0, 4.0]
+        assert ring.latest() == 4.0
+        assert ring.total == 5
+
+    def test_statistics(self) -> None:
+        ring = RingBuffer(10)
+        for value in (1, 2, 3, 4):
+            ring.append(value)
+        assert ring.mean() == 2.5
+        assert ring.mean(2) == 3.5
+        assert ring.percentile(50) == 2.5
+        assert ring.percentile(100) == 4.0
+
+    def test_empty(self) -> None:
+        ring = RingBuffer(4)
+        assert ring.latest() is None
+        assert ring.mean() is None
+        assert ring.percentile(95) is None
+
+    def test_invalid_capacity(self) -> None:
+        with pytest.raises(ValueError):
+            RingBuffer(0)
+
+
+class TestTelemetrySampler:
+    """Tests for TelemetrySampler."""
+
+    def test_rates_from_counter_deltas(self) -> None:
+        sampler = TelemetrySampler("tun0", capacity=8)
+        counters = {"rx_bytes": 1000, "tx_bytes": 500, "rx_packets": 10,
+                    "tx_packets": 5, "rx_errors": 0, "tx_errors": 0}
+
+        with patch.object(sampler, "_read_counter", side_effect=lambda n: counters[n]), \
+                patch("ghosty.core.telemetry.time.monotonic", side_effect=[10.0, 12.0]):
+            sampler.sample()
+            counters.update(rx_bytes=3000, tx_bytes=1500, rx_errors=1)
+            sampler.sample()
+
+        snap = sampler.snapshot()
+        assert snap.samples == 1
+        assert snap.rx_rate == 1000.0
+        assert snap.tx_rate == 500.0
+        assert snap.errors == 1.0
+
+    def test_counter_reset_is_not_negative(self) -> None:
+        sampler = TelemetrySampler("tun0", capacity=8)
+        counters = {name: 5000 for name in ("rx_bytes", "tx_bytes", "rx_packets",
+                                             "tx_packets", "rx_errors", "tx_errors")}
+        with patch.object(sampler, "_read_counter", side_effect=lambda n: counters[n]), \
+                patch("ghosty.core.telemetry.time.monotonic", side_effect=[1.0, 2.0]):
+            sampler.sample()
+            counters["rx_bytes"] = 10
+            sampler.sample()
+        assert sampler.values("rx_rate") == [0.0]
+
+    def test_format_rate(self) -> None:
+        assert format_rate(None) == "—"
+        assert format_rate(512) == "512 B/s"
+        assert format_rate(1_500_000) == "1.5 MB/s"
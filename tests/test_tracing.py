@@ -0,0 +1,82 @@
+"""Tests for timing spans and trace export."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+from pathlib import Path
+
+from ghosty import tracing
+from ghosty.utils.process import run_command
+
+
+class TestTracing:
+    """Tests for span recording and trace formats."""
+
+    def teardown_method(self) -> None:
+        tracing.disable_tracing()
+
+    def test_disabled_is_noop(self) -> None:
+        assert not tracing.is_enabled()
+        with tracing.span("anything") as sp:
+            sp.set(ignored=True)
+        assert tracing.span("other") is tracing.span("again")
+
+    def test_chrome_trace(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.json"
+        tracing.enable_tracing(path, "chrome")
+        with tracing.span("outer", mode="Normal"), tracing.span("inner"):
+            pass
+        tracing.disable_tracing()
+
+        events = json.loads(path.read_text())["traceEvents"]
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        assert spans["outer"]["args"] == {"mode": "Normal"}
+        assert spans["inner"]["ts"] >= spans["outer"]["ts"]
+        assert spans["inner"]["dur"] <= spans["outer"]["dur"]
+        assert any(e["ph"] == "M" for e in events)
+
+    def test_jsonl_records_parent(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.jsonl"
+        tracing.enable_tracing(path, "jsonl")
+        with tracing.span("outer"), tracing.span("inner"):
+            pass
+        tracing.disable_tracing()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        inner = next(line for line in lines if line["name"] == "inner")
+        assert inner["parent"] == "outer"
+        assert inner["depth"] == 1
+
+    def test_run_command_span(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.jsonl"
+        tracing.enable_tracing(path, "jsonl")
+        run_command(["true"])
+        tracing.disable_tracing()
+
+        record = json.loads(path.read_text().splitlines()[0])
+        assert record["name"] == "run_command"
+        assert record["args"] == {"argv": ["true"], "returncode": 0}
+
+    def test_env_var_enables(self, tmp_path: Path, monkeypatch) -> None:
+        path = tmp_path / "env.jsonl"
+        monkeypatch.setenv("GHOSTY_TRACE", str(path))
+        tracing.setup_tracing(enabled=False)
+        assert tracing.is_enabled()
+        with tracing.span("x"):
+            pass
+        tracing.disable_tracing()
+        assert path.exists()
+
+    def test_traced_decorator_records_errors(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.jsonl"
+
+        @tracing.traced("boom")
+        def _boom() -> None:
+            raise RuntimeError("bad")
+
+        tracing.enable_tracing(path, "jsonl")
+        with contextlib.suppress(RuntimeError):
+            _boom()
+        tracing.disable_tracing()
+        assert "RuntimeError" in json.loads(path.read_text())["args"]["error"]
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from ghosty.core.vpn import VPNManager
+from unittest.mock import patch
+
+from ghosty.core.telemetry import TelemetrySampler
+from ghosty.core.vpn import VPNManager, VPNSupervisor, parse_endpoint
 
 
 class TestVPNManager:
@@ -38,3 +41,101 @@ class TestVPNManager:
         success, msg = self.vpn.connect()
         assert not success
         assert "No config" in msg
+
+
+class TestParseEndpoint:
+    """Tests for VPN endpoint extraction."""
+
+    def test_openvpn_remote(self, tmp_config_dir) -> None:
+        config = tmp_config_dir / "test.ovpn"
+        config.write_text("client\nport 443\nremote vpn.example.net\n")
+        assert parse_endpoint(str(config)) == ("vpn.example.net", 443)
+
+    def test_openvpn_remote_with_port(self, tmp_config_dir) -> None:
+        config = tmp_config_dir / "test.ovpn"
+        config.write_text("client\nremote 1.2.3.4 1195 udp\n")
+        assert parse_endpoint(str(config)) == ("1.2.3.4", 1195)
+
+    def test_wireguard_endpoint(self, tmp_config_dir) -> None:
+        config = tmp_config_dir / "wg0.conf"
+        config.write_text("[Interface]\nPrivateKey = a=\n[Peer]\nEndpoint = [2001:db8::1]:51820\n")
+        assert parse_endpoint(str(config), "wireguard") == ("2001:db8::1", 51820)
+
+    def test_no_endpoint(self, tmp_config_dir) -> None:
+        config = tmp_config_dir / "test.ovpn"
+        config.write_text("client\n")
+        assert parse_endpoint(str(config)) is None
+
+
+class TestVPNSupervisor:
+    """Tests for VPNSupervisor health checks and reconnects."""
+
+    def test_unhealthy_when_process_dead(self) -> None:
+        supervisor = VPNSupervisor(VPNManager())
+        healthy, reason = supervisor.check_health()
+        assert not healthy
+        assert "not running" in reason
+
+    def test_probe_feeds_latency_series(self) -> None:
+        vpn = VPNManager(provider="wireguard", config_file="/etc/wireguard/wg0.conf")
+        vpn._connected = True
+        vpn.telemetry = TelemetrySampler("wg0")
+        supervisor = VPNSupervisor(vpn)
+        with patch("ghosty.core.vpn._read_carrier", return_value=True), \
+                patch("ghosty.core.vpn.tcp_probe", return_value=42.0):
+            assert supervisor.check_health() == (True, "Tunnel healthy")
+        assert vpn.telemetry.values("latency") == [42.0]
+
+    def test_backoff_is_bounded_and_jittered(self) -> None:
+        supervisor = VPNSupervisor(VPNManager(), backoff_base=1.0, backoff_max=8.0)
+        for attempt in range(10):
+            delay = supervisor._backoff(attempt)
+            cap = min(8.0, 2.0 ** attempt)
+            assert cap / 2 <= delay <= cap
+
+    def test_recover_records_duration(self) -> None:
+        vpn = VPNManager(config_file="/etc/vpn/a.ovpn")
+        supervisor = VPNSupervisor(vpn)
+        with patch.object(vpn, "disconnect"), \
+                patch.object(vpn, "connect", return_value=(True, "ok")), \
+                patch.object(supervisor, "_wait_healthy", return_value=(True, "ok")):
+            supervisor._recover("test")
+        assert supervisor.state == "healthy"
+        assert len(supervisor.recovery_times) == 1
+        assert supervisor.metrics()["recoveries"] == 1
+
+    def test_recover_fails_over_and_gives_up(self) -> None:
+        vpn = VPNManager(config_file="/etc/vpn/a.ovpn")
+        supervisor = VPNSupervisor(
+            vpn, fallback_configs=["/etc/vpn/b.ovpn"],
+            attempts_per_config=1, max_attempts=2, backoff_base=0.0,
+        )
+        tried: list[str] = []
+        with patch.object(vpn, "disconnect"), \
+                patch.object(vpn, "set_config", side_effect=lambda c, a: setattr(
+                    vpn, "config_file", c)), \
+                patch.object(vpn, "connect", side_effect=lambda: (
+                    tried.append(vpn.config_file) or (False, "down"))), \
+                patch("ghosty.core.vpn.rank_configs", side_effect=lambda c, p: c):
+            supervisor._recover("test")
+        assert tried == ["/etc/vpn/a.ovpn", "/etc/vpn/b.ovpn"]
+        assert supervisor.state == "failed"
+        assert supervisor.failed_recoveries == 1
+
+    def test_recover_returns_to_primary_after_failover(self) -> None:
+        vpn = VPNManager(config_file="/etc/vpn/a.ovpn")
+        supervisor = VPNSupervisor(vpn, fallback_configs=["/etc/vpn/b.ovpn"])
+        vpn.config_file = "/etc/vpn/b.ovpn"  # After an earlier failover
+        with patch("ghosty.core.vpn.rank_configs", side_effect=lambda c, p: c):
+            assert supervisor._candidates() == ["/etc/vpn/b.ovpn", "/etc/vpn/a.ovpn"]
+
+    def test_pending_device_is_bounded(self) -> None:
+        vpn = VPNManager(config_file="/etc/vpn/a.ovpn")
+        supervisor = VPNSupervisor(vpn, device_grace=10.0)
+        with patch.object(VPNManager, "is_connected", True), \
+                patch("ghosty.core.vpn.time.monotonic", side_effect=[100.0, 105.0, 111.0]):
+            assert supervisor.check_health() == (True, "Tunnel device pending")
+            assert supervisor.check_health() == (True, "Tunnel device pending")
+            healthy, reason = supervisor.check_health()
+        assert not healthy
+        assert "No tunnel device" in reason
@@ -0,0 +1,101 @@
+"""Tests for the native WireGuard backend."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ghosty.core import wireguard
+from ghosty.core.wireguard import WireGuardTunnel, parse_config
+from ghosty.utils.process import CommandResult
+
+_CONFIG = """\
+[Interface]
+PrivateKey = aGVsbG8gd29ybGQgaGVsbG8gd29ybGQgaGVsbG8gd28=
+Address = 10.2.0.2/32, fd00::2/128
+DNS = 10.2.0.1
+MTU = 1380
+PostUp = echo up  # wg-quick only
+
+[Peer]
+PublicKey = d29ybGQgaGVsbG8gd29ybGQgaGVsbG8gd29ybGQgaGU=
+AllowedIPs = 0.0.0.0/0, ::/0
+Endpoint = 198.51.100.7:51820
+"""
+
+
+class TestWireGuardConfig:
+    """Tests for wg-quick config parsing."""
+
+    def test_parse_config(self, tmp_config_dir: Path) -> None:
+        path = tmp_config_dir / "wg-test.conf"
+        path.write_text(_CONFIG)
+        config = parse_config(path)
+
+        assert config.interface == "wg-test"
+        assert config.addresses == ["10.2.0.2/32", "fd00::2/128"]
+        assert config.dns == ["10.2.0.1"]
+        assert config.mtu == 1380
+        assert config.endpoints == ["198.51.100.7:51820"]
+        assert config.peers[0].allowed_ips == ["0.0.0.0/0", "::/0"]
+
+    def test_setconf_strips_wg_quick_keys(self, tmp_config_dir: Path) -> None:
+        path = tmp_config_dir / "wg0.conf"
+        path.write_text(_CONFIG)
+        setconf = parse_config(path).setconf
+
+        assert "PrivateKey = aGVsbG8gd29ybGQgaGVsbG8gd29ybGQgaGVsbG8gd28=" in setconf
+        assert "Endpoint = 198.51.100.7:51820" in setconf
+        for key in ("Address", "DNS", "MTU", "PostUp"):
+            assert key not in setconf
+
+    def test_missing_interface_section(self, tmp_config_dir: Path) -> None:
+        path = tmp_config_dir / "wg0.conf"
+        path.write_text("[Peer]\nPublicKey = abc=\n")
+        with pytest.raises(ValueError):
+            parse_config(path)
+
+    def test_default_route_uses_policy_table(self, tmp_config_dir: Path) -> None:
+        path = tmp_config_dir / "wg0.conf"
+        path.write_text(_CONFIG)
+        batches = WireGuardTunnel(parse_config(path))._build_batches()
+
+        assert "address add 10.2.0.2/32 dev wg0" in batches["-4"]
+        assert "link set mtu 1380 up dev wg0" in batches["-4"]
+        assert "route add 0.0.0.0/0 dev wg0 table 51820" in batches["-4"]
+        assert "rule add not fwmark 51820 table 51820" in batches["-4"]
+        assert "address add fd00::2/128 dev wg0" in batches["-6"]
+        assert "route add ::/0 dev wg0 table 51820" in batches["-6"]
+
+    def test_split_tunnel_routes_in_main_table(self, tmp_config_dir: Path) -> None:
+        path = tmp_config_dir / "wg0.conf"
+        path.write_text(_CONFIG.replace("0.0.0.0/0, ::/0", "10.0.0.0/8"))
+        batches = WireGuardTunnel(parse_config(path))._build_batches()
+
+        assert "route add 10.0.0.0/8 dev wg0 table main" in batches["-4"]
+        assert not any(line.startswith("rule") for line in batches["-4"])
+
+    def test_namespace_routes_default_in_main_table(self, tmp_config_dir: Path) -> None:
+        path = tmp_config_dir / "wg0.conf"
+        path.write_text(_CONFIG)
+        batches = WireGuardTunnel(parse_config(path), netns="ghosty-work")._build_batches()
+
+        assert "route add 0.0.0.0/0 dev wg0 table main" in batches["-4"]
+        assert not any(line.startswith("rule") for line in batches["-4"])
+
+    def test_namespace_moves_interface(self, tmp_config_dir: Path) -> None:
+        path = tmp_config_dir / "wg0.conf"
+        path.write_text(_CONFIG)
+        tunnel = WireGuardTunnel(parse_config(path), netns="ghosty-work")
+        with patch.object(wireguard, "run_command",
+                          return_value=CommandResult(True, "", "", 0)) as run:
+            assert tunnel.up()[0]
+            tunnel.down()
+
+        commands = [call.args[0] for call in run.call_args_list]
+        assert ["ip", "link", "set", "wg0", "netns", "ghosty-work"] in commands
+        assert ["ip", "-n", "ghosty-work", "-4", "-batch", "-"] in commands
+        assert not any(cmd[0] == "resolvconf" for cmd in commands)
+        assert commands[-1] == ["ip", "-n", "ghosty-work", "link", "del", "wg0"]